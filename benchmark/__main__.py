@@ -0,0 +1,64 @@
+"""
+Microbenchmarks for the library's hot paths.
+
+Usage:
+    python -m benchmark --output results.json
+    python -m benchmark --baseline results.json --tolerance 0.25
+
+When a baseline is given, the run fails if any benchmark is slower than its baseline median by more than the
+tolerance. Baselines are machine-specific, so compare runs from the same machine only.
+"""
+
+import argparse
+import logging
+import sys
+
+from benchmark.cases import all_benchmarks
+from benchmark.runner import compare, measure, read_results, write_results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmark")
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks containing this string"
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument(
+        "--baseline", help="compare against results from a previous run"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed relative slowdown"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="minimum seconds per round"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="number of rounds")
+    args = parser.parse_args()
+
+    # the client logs every request and response, which would dominate the measurements
+    logging.disable(logging.INFO)
+
+    results = []
+    for benchmark in all_benchmarks():
+        if args.filter not in benchmark.name:
+            continue
+        result = measure(benchmark, args.min_time, args.repeat)
+        results.append(result)
+        print(
+            f"{result.name:<60} {result.median * 1e6:>12.1f}µs  ±{result.stdev * 1e6:.1f}µs"
+        )
+
+    if args.output:
+        write_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, read_results(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import Iterator
+
+from benchmark.runner import Benchmark
+from shared.client import Client
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.syntactical_analysis import PartOfSpeech, SyntacticalAnalysis
+from shared.model.token.feature import (
+    Case,
+    Gender,
+    NounFeatureSet,
+    Number,
+    Person,
+    Tense,
+    VerbFeatureSet,
+)
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.rendering import MarkupLanguage, Stringifier
+from shared.universal_features import (
+    _convert_to_legible_tags,
+    convert_to_legible_tags,
+    nominal_features,
+)
+
+SENTENCE = "Der kleine Hund spielt im Garten mit dem roten Ball"
+SENTENCE_LENGTHS = [10, 50, 200]
+RENDERING_LENGTHS = [10, 100, 1000]
+DECODE_LENGTHS = [10, 100]
+
+
+def sentence(words: int) -> str:
+    base = SENTENCE.split()
+    return " ".join(base[i % len(base)] for i in range(words)) + "."
+
+
+def tokens(count: int) -> list[Token]:
+    noun = NounFeatureSet(case=Case.DAT, number=Number.SING, gender=Gender.MASC)
+    verb = VerbFeatureSet(person=Person.THIRD, number=Number.SING, tense=Tense.PRES)
+    result: list[Token] = []
+    for i in range(count):
+        if i % 3 == 0:
+            result.append(
+                Token(
+                    text=f"Hund{i}", lemma=f"Hund{i}", upos=UPOS.NOUN, feature_set=noun
+                )
+            )
+        elif i % 3 == 1:
+            result.append(
+                Token(
+                    text=f"dem{i}",
+                    lemma="der",
+                    upos=UPOS.DET,
+                    feature_set=noun,
+                    ancestor=result[-1],
+                )
+            )
+        else:
+            result.append(
+                Token(
+                    text=f"spielt{i}", lemma="spielen", upos=UPOS.VERB, feature_set=verb
+                )
+            )
+    return result
+
+
+def mapper_benchmarks() -> Iterator[Benchmark]:
+    try:
+        from spacy.tokens import Doc
+
+        from shared.model.token.mapper import from_spacy_doc, from_spacy_token
+        from shared.nlp import get_model
+
+        nlp = get_model("de_core_news_sm")
+    except (ImportError, OSError) as e:
+        logging.warning(f"Skipping mapper benchmarks, spaCy model unavailable: {e}")
+        return
+
+    def map_tokens(doc: Doc) -> list[Token]:
+        return [from_spacy_token(token) for token in doc]
+
+    for length in SENTENCE_LENGTHS:
+        doc = nlp(sentence(length))
+        yield Benchmark(
+            f"mapper.from_spacy_doc[{length}]", partial(from_spacy_doc, doc)
+        )
+        yield Benchmark(
+            f"mapper.from_spacy_token[{length}]",
+            partial(map_tokens, doc),
+        )
+
+
+def model_benchmarks() -> Iterator[Benchmark]:
+    token = tokens(2)[1]
+    payload = token.dict()
+    yield Benchmark("token.validate", lambda: Token(**payload))
+    yield Benchmark("token.dict", token.dict)
+    tags = {"Case": "Dat", "Number": "Plur", "Gender": "Fem"}
+    yield Benchmark(
+        "universal_features.convert_to_legible_tags",
+        lambda: convert_to_legible_tags(tags, nominal_features),
+    )
+
+    def uncached() -> str:
+        _convert_to_legible_tags.cache_clear()
+        return convert_to_legible_tags(tags, nominal_features)
+
+    yield Benchmark("universal_features.convert_to_legible_tags.uncached", uncached)
+
+
+def rendering_benchmarks() -> Iterator[Benchmark]:
+    stringifier = Stringifier(MarkupLanguage.HTML)
+    pos = PartOfSpeech(value="NOUN", explanation="Noun")
+    for length in RENDERING_LENGTHS:
+        token_list = tokens(length)
+        literal_translations = [
+            LiteralTranslation(word=token.text, translation="translation")
+            for token in token_list
+        ]
+        analyses = [
+            SyntacticalAnalysis(
+                word=token.text,
+                pos=pos,
+                lemma=token.lemma,
+                morphology=None,
+                dependency=None,
+            )
+            for token in token_list
+        ]
+        yield Benchmark(
+            f"rendering.coalesce_analyses[{length}]",
+            partial(stringifier.coalesce_analyses, literal_translations, analyses),
+        )
+        yield Benchmark(
+            f"rendering.coalesce_tokens[{length}]",
+            partial(stringifier.coalesce_tokens, literal_translations, token_list),
+        )
+
+
+def client_benchmarks() -> Iterator[Benchmark]:
+    try:
+        from aioresponses import aioresponses
+    except ImportError as e:
+        logging.warning(f"Skipping client benchmarks, aioresponses unavailable: {e}")
+        return
+    client = Client("http://benchmark")
+    loop = asyncio.new_event_loop()
+    for length in DECODE_LENGTHS:
+        body = json.dumps([token.dict() for token in tokens(length)])
+
+        def decode(body: str = body) -> list[Token] | None:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{client.host}/syntactical-analysis", status=200, body=body
+                )
+                return loop.run_until_complete(
+                    client.fetch_syntactical_analysis("sentence")
+                )
+
+        yield Benchmark(f"client.fetch_syntactical_analysis[{length}]", decode)
+
+
+def all_benchmarks() -> Iterator[Benchmark]:
+    yield from mapper_benchmarks()
+    yield from model_benchmarks()
+    yield from rendering_benchmarks()
+    yield from client_benchmarks()
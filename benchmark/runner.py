@@ -0,0 +1,95 @@
+import json
+import statistics
+import timeit
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+
+@dataclass
+class Benchmark:
+    name: str
+    function: Callable[[], object]
+
+
+@dataclass
+class Result:
+    """
+    Timings of a single benchmark in seconds per call.
+    """
+
+    name: str
+    calls: int
+    median: float
+    mean: float
+    min: float
+    stdev: float
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.current / self.baseline - 1
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.current * 1e6:.1f}µs vs. baseline {self.baseline * 1e6:.1f}µs "
+            f"(+{self.slowdown:.0%})"
+        )
+
+
+def measure(benchmark: Benchmark, min_time: float = 0.2, repeat: int = 5) -> Result:
+    """
+    Times a benchmark with timeit: the number of calls per round is chosen so that a round takes at least
+    min_time seconds, and the statistics are taken over `repeat` rounds.
+    """
+    timer = timeit.Timer(benchmark.function)
+    calls, duration = timer.autorange()
+    if duration < min_time:
+        calls = max(1, int(calls * min_time / max(duration, 1e-9)))
+    rounds = [total / calls for total in timer.repeat(repeat=repeat, number=calls)]
+    return Result(
+        name=benchmark.name,
+        calls=calls,
+        median=statistics.median(rounds),
+        mean=statistics.mean(rounds),
+        min=min(rounds),
+        stdev=statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+    )
+
+
+def compare(
+    results: list[Result], baseline: dict[str, dict], tolerance: float
+) -> list[Regression]:
+    """
+    Compares the median of each result against the baseline.
+    Benchmarks without a baseline entry are ignored, so new benchmarks never fail a run.
+    :param results: Results of the current run
+    :param baseline: Results of a previous run as written by write_results(), keyed by benchmark name
+    :param tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+    :return: All benchmarks that are slower than their baseline by more than the tolerance
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+        if result.median > reference["median"] * (1 + tolerance):
+            regressions.append(
+                Regression(result.name, reference["median"], result.median)
+            )
+    return regressions
+
+
+def write_results(results: list[Result], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump({result.name: asdict(result) for result in results}, f, indent=2)
+
+
+def read_results(path: str) -> dict[str, dict]:
+    with open(path) as f:
+        return json.load(f)  # type: ignore
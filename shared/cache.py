@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from pydantic import BaseModel
+
+from shared.exception import ApplicationException
+from shared.model.token.token import Token
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A bounded, thread-safe least-recently-used cache with hit counters.
+    Entries optionally expire after a time-to-live (in seconds).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def peek(self, key: K) -> V | None:
+        """
+        Looks up an entry without updating its recency or the statistics.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                return None
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: K) -> bool:
+        return self.peek(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Converts models into plain JSON-compatible structures so they can be hashed.
+    Token and FeatureSet override dict(), as pydantic cannot serialize the abstract FeatureSet field on its own.
+    """
+    if isinstance(value, Token):
+        return value.dict()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, ApplicationException):
+        return {"exception": type(value).__name__, **value.dict()}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    return value
+
+
+def content_key(*parts: Any) -> str:
+    """
+    Computes a stable hash of arbitrary models and plain values, which is identical across processes and runs.
+    :param parts: pydantic models, lists of models, enums or JSON-serializable values
+    :return: Hex digest identifying the content
+    """
+    serialized = json.dumps(
+        _canonical(list(parts)), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).hexdigest()
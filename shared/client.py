@@ -1,77 +1,188 @@
+import asyncio
+import json
 import logging
+from dataclasses import dataclass
+from typing import Any, Hashable, Mapping, NoReturn, TypeVar
 
-import aiohttp
-from aiohttp.client_reqrep import ClientResponse
+from aiohttp import ClientResponse
+from pydantic import TypeAdapter
 
-from shared.exception import ApplicationException
+from shared.cache import LRUCache
+from shared.exception import ApplicationException, RequestShedException
 from shared.model.inflection import Inflections
 from shared.model.literal_translation import LiteralTranslation
 from shared.model.response_suggestion import ResponseSuggestion
-from shared.model.syntactical_analysis import SyntacticalAnalysis
 from shared.model.token.token import Token
 from shared.model.translation import Translation
+from shared.profiling import span
+from shared.scheduler import Scheduler, Ticket, current_priority
+from shared.snapshot import Snapshot
+from shared.translation_memory import TranslationMemory
+from shared.transport import HttpTransport, Transport
+from shared.word_cache import (
+    WordTranslationCache,
+    WordTranslations,
+    assign,
+    split_words,
+)
+
+T = TypeVar("T")
+
+# Validators are built once per type rather than per request, and parse the raw response bytes directly,
+# skipping the intermediate dicts of response.json()
+TRANSLATION_ADAPTER = TypeAdapter(Translation)
+LITERAL_TRANSLATIONS_ADAPTER = TypeAdapter(list[LiteralTranslation])
+TOKENS_ADAPTER = TypeAdapter(list[Token])
+RESPONSE_SUGGESTIONS_ADAPTER = TypeAdapter(list[ResponseSuggestion])
+INFLECTIONS_ADAPTER = TypeAdapter(Inflections)
+
+
+@dataclass
+class _SharedRequest:
+    """
+    A backend request that concurrent callers with the same payload wait for together.
+    It runs as its own task, so no single caller's cancellation cancels it for the others.
+    Its ticket holds the priority of its most urgent caller.
+    """
+
+    task: asyncio.Task[Any]
+    ticket: Ticket
+    waiters: int = 0
 
 
 class Client:
     """
     Defines common methods to interact with the backend API.
     Includes error handling and parsing to the pydantic models.
+    Successful responses can optionally be cached; cached models are shared between callers
+    and must therefore not be mutated.
+    400 responses are deterministic for a given request, e.g. an unsupported language, and can optionally be
+    cached in a separate cache with a short time-to-live, so retries of the same request don't reach the backend.
     """
 
-    def __init__(self, host):
+    def __init__(
+        self,
+        host,
+        cache: LRUCache[Hashable, Any] | None = None,
+        transport: Transport | None = None,
+        word_cache: WordTranslationCache | None = None,
+        snapshot: Snapshot | None = None,
+        translation_memory: TranslationMemory | None = None,
+        scheduler: Scheduler | None = None,
+        error_cache: LRUCache[Hashable, Any] | None = None,
+    ):
+        """
+        :param host: Base URL of the backend API
+        :param cache: Cache for successful responses; responses are not cached if not provided
+        :param transport: Transport to send requests with, defaults to HTTP requests to host
+        :param word_cache: Cache for literal translations of individual words
+        :param snapshot: Precomputed responses, consulted before any backend request
+        :param translation_memory: Translations of previously seen, similar sentences
+        :param scheduler: Limits concurrent backend requests and serves them by priority, see request_priority()
+        :param error_cache: Cache for 400 errors the backend would repeat for the same request, e.g. an unsupported
+        language, see ApplicationException.deterministic; e.g. LRUCache(maxsize=256, ttl=60). Errors are not cached
+        if not provided
+        """
         logging.basicConfig(
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             level=logging.INFO,
         )
         self.host = host
+        self.cache = cache
+        self.transport = transport or HttpTransport(host)
+        self.word_cache = word_cache
+        self.snapshot = snapshot
+        self.translation_memory = translation_memory
+        self.scheduler = scheduler
+        self.error_cache = error_cache
+        self._in_flight: dict[Hashable, _SharedRequest] = {}
 
     async def fetch_translation(self, sentence: str) -> Translation | None:
         """
         Interacts with the /translation endpoint of the backend API.
+        If a translation memory is configured, translations of equivalent sentences are reused.
         :param sentence: Sentence to translate
         :return: Translation object in case of a 200 status code, ApplicationException otherwise
         """
         logging.info(f"fetching translation for sentence '{sentence}'")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.host}/translation", json={"sentence": sentence}
-            ) as response:
-                data = await response.json()
-                logging.info(
-                    f"received /translation response for sentence '{sentence}': '{data}'"
-                )
-
-                if response.status == 200:
-                    return Translation(**data)
-                else:
-                    await self.handle_failure("translation", response)
-                    return None
+        if self.translation_memory is not None:
+            remembered = self.translation_memory.find_translation(sentence)
+            if remembered is not None:
+                return remembered
+        translation = await self._fetch(
+            "translation", {"sentence": sentence}, TRANSLATION_ADAPTER
+        )
+        if self.translation_memory is not None:
+            self.translation_memory.add(sentence, translation=translation)
+        return translation
 
     async def fetch_literal_translations(
-        self, sentence: str
+        self,
+        sentence: str,
+        language_code: str | None = None,
+        lemmas: Mapping[str, str] | None = None,
     ) -> list[LiteralTranslation] | None:
         """
         Interacts with the /literal-translation endpoint of the backend API.
+        If a word cache or translation memory is configured, only words whose translation isn't known from either
+        are sent to the backend.
         :param sentence: Sentence for which to fetch literal translations
+        :param language_code: ISO-639-1 language code, used to look up cached words
+        :param lemmas: Lemmas by word, used to look up cached words if the word cache is keyed by lemma
         :return: list of LiteralTranslation objects in case of a 200 status code, ApplicationException otherwise
         """
         logging.info(f"fetching literal translations for sentence '{sentence}'")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.host}/literal-translation", json={"sentence": sentence}
-            ) as response:
-                if response.status == 200:
-                    literal_translations = await response.json()
-                    logging.info(
-                        f"Received /literal-translation response for sentence '{sentence}': '{literal_translations}'"
-                    )
-                    return [
-                        LiteralTranslation(**literal_translation)
-                        for literal_translation in literal_translations
-                    ]
-                else:
-                    await self.handle_failure("literal-translation", response)
-                    return None
+        language_code = language_code or (
+            self.word_cache.default_language_code
+            if self.word_cache is not None
+            else None
+        )
+        if (
+            self.word_cache is None or language_code is None
+        ) and self.translation_memory is None:
+            return await self._fetch_literal_translations(sentence)
+
+        words = split_words(sentence)
+        known: list[WordTranslations | None] = [None] * len(words)
+        if self.word_cache is not None and language_code is not None:
+            known = self.word_cache.lookup(words, language_code, lemmas)
+        if self.translation_memory is not None:
+            known = self.translation_memory.fill_literal_translations(
+                sentence, words, known
+            )
+        missing = [word for word, hit in zip(words, known) if hit is None]
+        if not words or len(missing) == len(words):
+            fetched = await self._fetch_literal_translations(sentence)
+        elif missing:
+            logging.info(
+                f"{len(words) - len(missing)}/{len(words)} words known, fetching {missing}"
+            )
+            fetched = await self._fetch_literal_translations(" ".join(missing))
+        else:
+            fetched = []
+        if not words:
+            result = fetched
+        else:
+            assigned = assign(words, known, fetched)
+            if self.word_cache is not None and language_code is not None:
+                self.word_cache.store(assigned, language_code, lemmas)
+            result = [
+                translation
+                for _, translations in assigned
+                for translation in translations
+            ]
+        if self.translation_memory is not None:
+            self.translation_memory.add(sentence, literal_translations=result)
+        return result
+
+    async def _fetch_literal_translations(
+        self, sentence: str
+    ) -> list[LiteralTranslation]:
+        return await self._fetch(
+            "literal-translation",
+            {"sentence": sentence},
+            LITERAL_TRANSLATIONS_ADAPTER,
+        )
 
     async def fetch_syntactical_analysis(
         self, sentence: str, language_code: str | None = None
@@ -85,19 +196,11 @@ class Client:
         logging.info(f"fetching syntactical analysis for sentence '{sentence}'")
         # build event; only add language code if provided
         event = {"sentence": sentence}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.host}/syntactical-analysis", json=event
-            ) as response:
-                if response.status == 200:
-                    tokens = await response.json()
-                    logging.info(
-                        f"Received syntactical analysis for sentence '{sentence}': '{tokens}'"
-                    )
-                    return [Token(**token) for token in tokens]
-                else:
-                    await self.handle_failure("syntactical-analysis", response)
-                    return None
+        return await self._fetch(
+            "syntactical-analysis",
+            event,
+            TOKENS_ADAPTER,
+        )
 
     async def fetch_response_suggestions(
         self, sentence: str
@@ -108,48 +211,185 @@ class Client:
         :return: list of ResponseSuggestion objects in case of a 200 status code, ApplicationException otherwise
         """
         logging.info(f"fetching response suggestions for sentence '{sentence}'")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.host}/response-suggestion", json={"sentence": sentence}
-            ) as response:
-                if response.status == 200:
-                    suggestions = await response.json()
-                    logging.info(
-                        f"Received response suggestions for sentence '{sentence}': '{suggestions}'"
-                    )
-                    return [
-                        ResponseSuggestion(**suggestion) for suggestion in suggestions
-                    ]
-                else:
-                    await self.handle_failure("response-suggestion", response)
-                    return None
+        return await self._fetch(
+            "response-suggestion",
+            {"sentence": sentence},
+            RESPONSE_SUGGESTIONS_ADAPTER,
+        )
 
     async def fetch_inflections(self, word: str) -> Inflections | None:
         logging.info(f"fetching inflections for word '{word}'")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.host}/inflection", json={"word": word}
-            ) as response:
-                if response.status == 200:
-                    inflections = await response.json()
-                    logging.info(
-                        f"Received inflections for word '{word}': '{inflections}'"
-                    )
-                    return Inflections(**inflections)
-                else:
-                    await self.handle_failure("inflection", response)
-                    return None
+        return await self._fetch("inflection", {"word": word}, INFLECTIONS_ADAPTER)
+
+    def is_cached(self, endpoint: str, payload: dict[str, Any]) -> bool:
+        """
+        :return: Whether a response for the request is cached (or currently being fetched), without affecting
+        the cache statistics.
+        """
+        key = self._cache_key(endpoint, payload)
+        return key in self._in_flight or (
+            self.cache is not None and self.cache.peek(key) is not None
+        )
+
+    @staticmethod
+    def _cache_key(endpoint: str, payload: dict[str, Any]) -> Hashable:
+        return endpoint, tuple(sorted(payload.items()))
+
+    async def _fetch(
+        self, endpoint: str, payload: dict[str, Any], adapter: TypeAdapter[T]
+    ) -> T:
+        """
+        Fetches and parses a response, serving it from the cache if possible.
+        Concurrent requests for the same payload share a single backend call while a cache is configured.
+        :raises ApplicationException: if the backend responds with an error, or responded with a deterministic error
+        to the same request recently
+        """
+        key = self._cache_key(endpoint, payload)
+        if self.error_cache is not None:
+            error_data = self.error_cache.get(key)
+            if error_data is not None:
+                logging.info(f"serving /{endpoint} error for {payload} from cache")
+                raise ApplicationException.from_dict(error_data)
+        if self.snapshot is not None:
+            body = self.snapshot.get(endpoint, payload)
+            if body is not None:
+                # not copied into the cache, as the snapshot already keeps it in memory
+                return self._validate(endpoint, payload, body, adapter)
+        if self.cache is None:
+            return await self._request(endpoint, payload, adapter)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logging.info(f"serving /{endpoint} response for {payload} from cache")
+            return cached  # type: ignore
+        priority = current_priority()
+        while True:
+            shared = self._in_flight.get(key)
+            if shared is None or shared.task.done():
+                shared = self._share(key, endpoint, payload, adapter, Ticket(priority))
+            elif self.scheduler is not None:
+                # a user waiting for a prefetch must not wait behind the background queue
+                self.scheduler.promote(shared.ticket, priority)
+            try:
+                return await self._join(shared)
+            except RequestShedException:
+                if shared.ticket.priority <= priority:
+                    raise
+                # shed at a lower priority before we joined; join or start a request at ours
+
+    def _share(
+        self,
+        key: Hashable,
+        endpoint: str,
+        payload: dict[str, Any],
+        adapter: TypeAdapter[T],
+        ticket: Ticket,
+    ) -> _SharedRequest:
+        """
+        Starts a request that later callers with the same key can join, and caches its result.
+        """
+        shared = _SharedRequest(
+            asyncio.create_task(self._request(endpoint, payload, adapter, ticket)),
+            ticket,
+        )
+        self._in_flight[key] = shared
+
+        def done(task: asyncio.Task[Any]) -> None:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+            if (
+                self.cache is not None
+                and not task.cancelled()
+                and task.exception() is None
+            ):
+                self.cache.put(key, task.result())
+
+        shared.task.add_done_callback(done)
+        return shared
+
+    @staticmethod
+    async def _join(shared: _SharedRequest) -> Any:
+        """
+        Waits for a shared request. Cancelling a caller only cancels the request if no other caller waits for it.
+        """
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if shared.waiters == 0 and not shared.task.done():
+                shared.task.cancel()
+
+    async def _request(
+        self,
+        endpoint: str,
+        payload: dict[str, Any],
+        adapter: TypeAdapter[T],
+        ticket: Ticket | None = None,
+    ) -> T:
+        if self.scheduler is not None:
+            async with self.scheduler.slot(ticket=ticket):
+                status, body = await self._post(endpoint, payload)
+        else:
+            status, body = await self._post(endpoint, payload)
+        if status != 200:
+            error_data = self._decode_error(body)
+            if (
+                status == 400
+                and self.error_cache is not None
+                and ApplicationException.from_dict(error_data).deterministic
+            ):
+                self.error_cache.put(self._cache_key(endpoint, payload), error_data)
+            self._raise_failure(endpoint, status, error_data)
+        return self._validate(endpoint, payload, body, adapter)
+
+    @staticmethod
+    def _validate(
+        endpoint: str, payload: dict[str, Any], body: bytes, adapter: TypeAdapter[T]
+    ) -> T:
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(
+                f"Received /{endpoint} response for {payload}: '{body.decode(errors='replace')}'"
+            )
+        with span("client.validate", endpoint=endpoint):
+            return adapter.validate_json(body)
+
+    async def _post(self, endpoint: str, payload: dict[str, Any]) -> tuple[int, bytes]:
+        """
+        Sends a request to the backend API through the configured transport.
+        :param endpoint: Endpoint name without leading slash, e.g. "translation"
+        :param payload: JSON body of the request
+        :return: The status code and the raw JSON body of the response
+        """
+        with span("client.request", endpoint=endpoint):
+            return await self.transport.post(endpoint, payload)
+
+    @staticmethod
+    def _decode_error(body: bytes) -> Any:
+        try:
+            return json.loads(body)
+        except ValueError:
+            return body.decode(errors="replace")
 
     @staticmethod
     async def handle_failure(endpoint: str, response: ClientResponse) -> None:
-        error_data = await response.json()
-        if response.status == 400:
+        """
+        Raises the error of a failed aiohttp response. Kept for callers that send requests themselves;
+        the Client's own requests go through its transport.
+        :raises ApplicationException: always
+        """
+        Client._raise_failure(
+            endpoint, response.status, Client._decode_error(await response.read())
+        )
+
+    @staticmethod
+    def _raise_failure(endpoint: str, status: int, error_data: Any) -> NoReturn:
+        if status == 400:
             logging.error(
                 f"Received 400 status code on {endpoint}. Error: '{error_data}'"
             )
-            raise ApplicationException(**error_data)
+            raise ApplicationException.from_dict(error_data)
         else:
             logging.error(
-                f"Received unexpected error from {endpoint}: {response.status}, {error_data}"
+                f"Received unexpected error from {endpoint}: {status}, {error_data}"
             )
             raise ApplicationException(error_message=error_data)
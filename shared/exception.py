@@ -1,26 +1,92 @@
+from typing import Any
+
+# exception classes by error code, filled in as subclasses are defined
+ERROR_CODES: dict[str, type["ApplicationException"]] = {}
+
+
 class ApplicationException(Exception):
+    # Stable identifier sent along with the error message, so clients can rebuild the exception type.
+    # Subclasses define their own; codes must not change once released.
+    error_code: str = "application_error"
+    # Whether the backend responds with this error every time for the same request, so clients may cache it.
+    deterministic: bool = False
     error_message: str
 
-    def __init__(self, error_message: str):
+    def __init__(self, error_message: str, **_: Any):
+        # further keys of an error payload are accepted, so clients that rebuild exceptions with
+        # ApplicationException(**error_data) keep working when the payload gains fields
         self.error_message = error_message
         super().__init__(self.error_message)
 
-    def dict(self) -> dict[str, str]:
-        return {"error_message": self.error_message}
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "error_code" not in cls.__dict__:
+            return
+        if cls.error_code in ERROR_CODES:
+            raise TypeError(
+                f"Error code '{cls.error_code}' of {cls.__name__} is already used by "
+                f"{ERROR_CODES[cls.error_code].__name__}"
+            )
+        ERROR_CODES[cls.error_code] = cls
+
+    def dict(self, error_code: bool = True) -> dict[str, str]:
+        """
+        :param error_code: Whether to include the error code. Clients that predate it rebuild exceptions with
+        ApplicationException(**error_data), which fails on the additional key unless the client accepts it; backends
+        that still serve such clients must pass False.
+        :return: The error payload sent to clients
+        """
+        if not error_code:
+            return {"error_message": self.error_message}
+        return {"error_code": self.error_code, "error_message": self.error_message}
+
+    @staticmethod
+    def from_dict(error_data: Any) -> "ApplicationException":
+        """
+        Rebuilds an exception from an error payload created with dict().
+        :param error_data: Decoded error response
+        :return: An instance of the class registered for the error code, or an ApplicationException with the
+        received message if the code is missing or unknown, e.g. for responses of an older backend
+        """
+        if not isinstance(error_data, dict):
+            return ApplicationException(error_message=str(error_data))
+        exception_type = ERROR_CODES.get(error_data.get("error_code", ""))
+        if exception_type is not None:
+            # registered subclasses define their own message and take no arguments
+            return exception_type()  # type: ignore[call-arg]
+        return ApplicationException(
+            error_message=str(error_data.get("error_message", error_data))
+        )
 
 
 class LanguageNotAvailableException(ApplicationException):
+    error_code = "language_not_available"
+    deterministic = True
+
     def __init__(self) -> None:
         super().__init__("Analysis for this language is not supported (yet).")
 
 
 class LanguageNotIdentifiedException(ApplicationException):
+    error_code = "language_not_identified"
+    deterministic = True
+
     def __init__(self) -> None:
         super().__init__("Language could not be identified.")
 
 
 class SentenceTooLongException(ApplicationException):
+    error_code = "sentence_too_long"
+    deterministic = True
+
     def __init__(self) -> None:
         super().__init__(
             "This sentence is too long for syntactical analysis and literal translation."
         )
+
+
+class RequestShedException(ApplicationException):
+    error_code = "request_shed"
+
+    def __init__(self) -> None:
+        super().__init__("Too many requests at the moment, please try again later.")
@@ -0,0 +1,119 @@
+"""
+Load tests the client against a local stub backend.
+
+Usage:
+    python -m shared.loadtest --concurrency 32 --duration 30 --latency lognormal:120,0.4 --error-rate 0.01
+    python -m shared.loadtest --rate 200 --requests 5000 --endpoint translation=normal:300,50 --output report.json
+
+The stub runs in a separate process, so the reported CPU time is the client's only.
+Latency specs are documented in shared.loadtest.stub.Latency.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from shared.client import Client
+from shared.loadtest.driver import OPERATIONS, run_load
+from shared.loadtest.stub import (
+    ENDPOINTS,
+    Behaviour,
+    StubBackend,
+    parse_latency,
+    start_in_process,
+)
+
+DEFAULT_SENTENCES = [
+    "Wo ist der Bahnhof?",
+    "Ich habe gestern einen alten Freund in der Stadt getroffen.",
+    "Kannst du mir bitte das Salz geben?",
+    "Die Kinder spielen im Garten, während die Eltern kochen.",
+]
+
+
+def behaviours(args: argparse.Namespace) -> dict[str, Behaviour]:
+    default = Behaviour(parse_latency(args.latency), args.error_rate)
+    result = {endpoint: default for endpoint in ENDPOINTS}
+    for override in args.endpoint:
+        endpoint, _, spec = override.partition("=")
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{endpoint}'")
+        result[endpoint] = Behaviour(parse_latency(spec), args.error_rate)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m shared.loadtest")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="concurrent workers; with --rate, the maximum number of in-flight requests",
+    )
+    parser.add_argument("--rate", type=float, help="target requests per second")
+    parser.add_argument("--requests", type=int, help="total number of requests")
+    parser.add_argument(
+        "--duration", type=float, help="seconds after which no requests are started"
+    )
+    parser.add_argument(
+        "--operations",
+        default="translation,literal-translation,syntactical-analysis",
+        help=f"comma-separated operations to cycle through, out of: {', '.join(OPERATIONS)}",
+    )
+    parser.add_argument("--sentences", help="file with one sentence per line to send")
+    parser.add_argument(
+        "--latency", default="normal:100,20", help="default stub latency in ms"
+    )
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        default=[],
+        metavar="ENDPOINT=LATENCY",
+        help="stub latency for a single endpoint, e.g. translation=lognormal:300,0.5",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of failing requests"
+    )
+    parser.add_argument("--seed", type=int, help="seed for the stub's randomness")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.rate is None and args.concurrency is None:
+        args.concurrency = 8
+    if args.requests is None and args.duration is None:
+        args.duration = 10.0
+    sentences = DEFAULT_SENTENCES
+    if args.sentences:
+        with open(args.sentences, encoding="utf-8") as file:
+            sentences = [line.strip() for line in file if line.strip()]
+
+    # the client logs every request, response and error, which would dominate the measurements;
+    # errors are counted in the report instead
+    logging.disable(logging.ERROR)
+
+    process, url = start_in_process(StubBackend(behaviours(args), args.seed))
+    try:
+        report = asyncio.run(
+            run_load(
+                Client(url),
+                sentences,
+                args.operations.split(","),
+                requests=args.requests,
+                duration=args.duration,
+                concurrency=args.concurrency,
+                rate=args.rate,
+            )
+        )
+    finally:
+        process.terminate()
+
+    print(report.format())
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report.to_dict(), file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
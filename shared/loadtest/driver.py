@@ -0,0 +1,182 @@
+import asyncio
+import itertools
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterator
+
+from shared.client import Client
+from shared.word_cache import split_words
+
+Operation = Callable[[Client, str], Awaitable[Any]]
+
+
+def _first_word(sentence: str) -> str:
+    words = split_words(sentence)
+    return words[0] if words else sentence
+
+
+OPERATIONS: dict[str, Operation] = {
+    "translation": lambda client, sentence: client.fetch_translation(sentence),
+    "literal-translation": lambda client, sentence: client.fetch_literal_translations(
+        sentence
+    ),
+    "syntactical-analysis": lambda client, sentence: client.fetch_syntactical_analysis(
+        sentence
+    ),
+    "response-suggestion": lambda client, sentence: client.fetch_response_suggestions(
+        sentence
+    ),
+    "inflection": lambda client, sentence: client.fetch_inflections(
+        _first_word(sentence)
+    ),
+}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+    :param q: Percentile between 0 and 100
+    """
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class LoadReport:
+    """
+    Outcome of a load test run. Latencies are in seconds and include failed requests.
+    """
+
+    wall_time: float
+    cpu_time: float
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.wall_time if self.wall_time else 0.0
+
+    def percentile(self, q: float) -> float:
+        return percentile(sorted(self.latencies), q)
+
+    def to_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": sum(self.errors.values()),
+            "error_types": dict(self.errors),
+            "wall_time_s": self.wall_time,
+            "throughput_rps": self.throughput,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else math.nan) * 1000,
+            "cpu_time_s": self.cpu_time,
+            "cpu_per_request_ms": (
+                self.cpu_time / self.requests * 1000 if self.requests else math.nan
+            ),
+        }
+
+    def format(self) -> str:
+        summary = self.to_dict()
+        lines = [
+            f"requests      {summary['requests']} in {summary['wall_time_s']:.2f}s "
+            f"({summary['throughput_rps']:.1f} req/s)",
+            f"latency       p50 {summary['p50_ms']:.1f}ms  p95 {summary['p95_ms']:.1f}ms  "
+            f"p99 {summary['p99_ms']:.1f}ms  max {summary['max_ms']:.1f}ms",
+            f"errors        {summary['errors']}",
+            *(f"  {count:>6}  {error}" for error, count in self.errors.most_common()),
+            f"client CPU    {summary['cpu_time_s']:.2f}s "
+            f"({summary['cpu_per_request_ms']:.2f}ms per request)",
+        ]
+        return "\n".join(lines)
+
+
+async def run_load(
+    client: Client,
+    sentences: list[str],
+    operations: list[str],
+    requests: int | None = None,
+    duration: float | None = None,
+    concurrency: int | None = None,
+    rate: float | None = None,
+) -> LoadReport:
+    """
+    Drives the client with requests that cycle through the operations and sentences.
+    Without a rate, `concurrency` workers send requests back to back (closed loop). With a rate, requests are
+    started on a fixed schedule regardless of how long earlier ones take (open loop), optionally capped at
+    `concurrency` in-flight requests; latencies are then measured from the scheduled start, so that queueing
+    behind slow requests is not hidden.
+    :param client: Client to drive, e.g. pointed at the stub backend
+    :param sentences: Sentences to send
+    :param operations: Names of the operations to cycle through, see OPERATIONS
+    :param requests: Number of requests to send
+    :param duration: Time in seconds after which no further requests are started
+    :param concurrency: Number of concurrent workers (closed loop) or maximum in-flight requests (open loop)
+    :param rate: Target requests per second
+    """
+    if requests is None and duration is None:
+        raise ValueError("Either requests or duration must be given")
+    if rate is None and concurrency is None:
+        raise ValueError("Either concurrency or rate must be given")
+    unknown = set(operations) - OPERATIONS.keys()
+    if unknown:
+        raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+    work: Iterator[tuple[Operation, str]] = zip(
+        itertools.cycle([OPERATIONS[name] for name in operations]),
+        itertools.cycle(sentences),
+    )
+    if requests is not None:
+        work = itertools.islice(work, requests)
+    report = LoadReport(wall_time=0.0, cpu_time=0.0)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    deadline = start + duration if duration is not None else math.inf
+
+    async def send(operation: Operation, sentence: str, started: float) -> None:
+        try:
+            await operation(client, sentence)
+        except Exception as e:
+            message = str(e).splitlines()[0] if str(e) else ""
+            report.errors[f"{type(e).__name__}: {message[:80]}"] += 1
+        report.latencies.append(time.perf_counter() - started)
+
+    if rate is None:
+
+        async def worker() -> None:
+            for operation, sentence in work:
+                if time.perf_counter() >= deadline:
+                    return
+                await send(operation, sentence, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency or 1)))
+    else:
+        semaphore = asyncio.Semaphore(concurrency or 2**31)
+
+        async def bounded(
+            operation: Operation, sentence: str, scheduled: float
+        ) -> None:
+            async with semaphore:
+                await send(operation, sentence, scheduled)
+
+        tasks = []
+        for index, (operation, sentence) in enumerate(work):
+            scheduled = start + index / rate
+            if scheduled >= deadline:
+                break
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.create_task(bounded(operation, sentence, scheduled)))
+        await asyncio.gather(*tasks)
+
+    report.wall_time = time.perf_counter() - start
+    report.cpu_time = time.process_time() - cpu_start
+    return report
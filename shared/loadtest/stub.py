@@ -0,0 +1,208 @@
+import asyncio
+import math
+import multiprocessing
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from aiohttp import web
+
+from shared.model.token.feature import Case, Gender, NounFeatureSet, Number
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.word_cache import split_words
+
+ENDPOINTS = (
+    "translation",
+    "literal-translation",
+    "syntactical-analysis",
+    "response-suggestion",
+    "inflection",
+)
+
+
+@dataclass(frozen=True)
+class Latency:
+    """
+    A latency distribution in milliseconds. Specs are parsed by parse_latency(), e.g.:
+    - "50": constant
+    - "uniform:20,80": uniformly distributed between 20 and 80
+    - "normal:50,10": normally distributed with mean 50 and standard deviation 10
+    - "lognormal:50,0.5": log-normally distributed with median 50 and shape 0.5, i.e. with a long tail
+    - "exp:50": exponentially distributed with mean 50
+    Negative samples are clamped to 0.
+    """
+
+    distribution: str = "constant"
+    parameters: tuple[float, ...] = (0.0,)
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        :return: A latency in seconds
+        """
+        p = self.parameters
+        match self.distribution:
+            case "constant":
+                milliseconds = p[0]
+            case "uniform":
+                milliseconds = rng.uniform(p[0], p[1])
+            case "normal":
+                milliseconds = rng.gauss(p[0], p[1])
+            case "lognormal":
+                milliseconds = rng.lognormvariate(math.log(p[0]), p[1])
+            case "exp":
+                milliseconds = rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+            case _:
+                raise ValueError(f"Unknown distribution {self.distribution}")
+        return max(0.0, milliseconds) / 1000
+
+
+_ARITY = {"constant": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+
+
+def parse_latency(spec: str) -> Latency:
+    distribution, _, parameters = spec.rpartition(":")
+    distribution = distribution or "constant"
+    if distribution not in _ARITY:
+        raise ValueError(f"Unknown distribution '{distribution}' in '{spec}'")
+    values = tuple(float(value) for value in parameters.split(","))
+    if len(values) != _ARITY[distribution]:
+        raise ValueError(
+            f"'{distribution}' expects {_ARITY[distribution]} parameter(s), got '{spec}'"
+        )
+    return Latency(distribution, values)
+
+
+@dataclass(frozen=True)
+class Behaviour:
+    """
+    How the stub responds on an endpoint. Failing requests are answered with a 500 after the sampled latency.
+    """
+
+    latency: Latency = Latency()
+    error_rate: float = 0.0
+
+
+def _translation(payload: dict[str, Any]) -> Any:
+    return {
+        "translation": payload["sentence"].upper(),
+        "language_name": "German",
+        "language_code": "de",
+    }
+
+
+def _literal_translation(payload: dict[str, Any]) -> Any:
+    return [
+        {"word": word, "translation": word.upper()}
+        for word in split_words(payload["sentence"])
+    ]
+
+
+def _syntactical_analysis(payload: dict[str, Any]) -> Any:
+    return [
+        Token(
+            text=word,
+            lemma=word.lower(),
+            upos=UPOS.NOUN,
+            feature_set=NounFeatureSet(
+                case=Case.NOM, number=Number.SING, gender=Gender.MASC
+            ),
+        ).dict()
+        for word in split_words(payload["sentence"])
+    ]
+
+
+def _response_suggestion(payload: dict[str, Any]) -> Any:
+    return [{"suggestion": "Ja.", "translation": "Yes."}]
+
+
+def _inflection(payload: dict[str, Any]) -> Any:
+    return {
+        "pos": {"value": "NOUN", "explanation": "noun"},
+        "gender": "Masc",
+        "inflections": [
+            {"word": payload["word"], "morphology": {"Case": case, "Number": number}}
+            for case in ("Nom", "Acc", "Dat", "Gen")
+            for number in ("Sing", "Plur")
+        ],
+    }
+
+
+RESPONSES: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "translation": _translation,
+    "literal-translation": _literal_translation,
+    "syntactical-analysis": _syntactical_analysis,
+    "response-suggestion": _response_suggestion,
+    "inflection": _inflection,
+}
+
+
+@dataclass
+class StubBackend:
+    """
+    Serves plausible, payload-dependent responses for all backend endpoints after simulated latencies.
+    """
+
+    behaviours: dict[str, Behaviour] = field(default_factory=dict)
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+
+    def behaviour(self, endpoint: str) -> Behaviour:
+        return self.behaviours.get(endpoint, Behaviour())
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        for endpoint in ENDPOINTS:
+            app.router.add_post(f"/{endpoint}", self._handler(endpoint))
+        return app
+
+    def _handler(self, endpoint: str) -> Callable[[web.Request], Any]:
+        async def handle(request: web.Request) -> web.Response:
+            payload = await request.json()
+            behaviour = self.behaviour(endpoint)
+            await asyncio.sleep(behaviour.latency.sample(self.rng))
+            if self.rng.random() < behaviour.error_rate:
+                return web.json_response("Simulated backend failure", status=500)
+            return web.json_response(RESPONSES[endpoint](payload))
+
+        return handle
+
+
+async def start(
+    backend: StubBackend, host: str = "127.0.0.1", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """
+    Starts the stub in the current event loop.
+    :return: The runner, to be cleaned up by the caller, and the stub's base URL
+    """
+    runner = web.AppRunner(backend.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def _serve(backend: StubBackend, urls: Any) -> None:
+    async def serve() -> None:
+        runner, url = await start(backend)
+        urls.put(url)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(serve())
+
+
+def start_in_process(backend: StubBackend) -> tuple[multiprocessing.Process, str]:
+    """
+    Starts the stub in a separate process, so that its CPU time doesn't count towards the client's.
+    :return: The process, to be terminated by the caller, and the stub's base URL
+    """
+    urls: Any = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(backend, urls), daemon=True)
+    process.start()
+    return process, urls.get(timeout=10)
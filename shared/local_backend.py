@@ -0,0 +1,171 @@
+"""
+A local stand-in for the /syntactical-analysis endpoint that runs spaCy in a pool of worker processes.
+Requires the optional nlp dependencies.
+
+Example:
+    async with LocalAnalysisBackend() as backend:
+        tokens = await backend.fetch_syntactical_analysis("Wo ist der Bahnhof?")
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from typing import Callable
+
+from spacy.language import Language
+
+from shared.exception import ApplicationException, LanguageNotAvailableException
+from shared.model.token.mapper import from_spacy_doc
+from shared.model.token.token import Token
+from shared.nlp import DEFAULT_MODEL, get_model
+from shared.profiling import record
+
+# the pipeline of the current worker process, loaded once by _initialise_worker()
+_nlp: Language | None = None
+
+
+def load_default_model() -> Language:
+    return get_model(DEFAULT_MODEL)
+
+
+def _initialise_worker(loader: Callable[[], Language]) -> None:
+    global _nlp
+    _nlp = loader()
+
+
+def _analyse_batch(sentences: list[str]) -> list[list[Token]]:
+    """
+    Runs in a worker: analyses a batch of sentences in a single nlp.pipe() call.
+    """
+    if _nlp is None:
+        raise RuntimeError("The worker's spaCy pipeline has not been loaded")
+    return [from_spacy_doc(doc) for doc in _nlp.pipe(sentences)]
+
+
+class LocalAnalysisBackend:
+    """
+    Analyses sentences with a local spaCy pipeline instead of the backend API.
+    fetch_syntactical_analysis() has the same signature as Client.fetch_syntactical_analysis(), so the backend can
+    stand in for it, e.g. in deployments that are co-located with the model or in offline load tests.
+    Each worker loads the pipeline once on start-up. Requests that arrive within max_batch_delay of each other are
+    submitted to the workers as a single batch of up to max_batch_size sentences.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Language] = load_default_model,
+        language_code: str = "de",
+        max_workers: int | None = None,
+        max_batch_size: int = 32,
+        max_batch_delay: float = 0.002,
+        executor_type: Callable[..., Executor] = ProcessPoolExecutor,
+    ):
+        """
+        :param loader: Loads the spaCy pipeline; must be picklable, i.e. a module-level function, for process pools
+        :param language_code: ISO-639-1 code of the pipeline's language
+        :param max_workers: Number of workers, defaults to the executor's default
+        :param max_batch_size: Maximum number of sentences submitted to a worker at once
+        :param max_batch_delay: Time in seconds to wait for further sentences before submitting a batch
+        :param executor_type: ProcessPoolExecutor or ThreadPoolExecutor (e.g. for tests)
+        """
+        self.language_code = language_code
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._executor = executor_type(
+            max_workers=max_workers,
+            initializer=_initialise_worker,
+            initargs=(loader,),
+        )
+        self._pending: list[tuple[str, asyncio.Future[list[Token]]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def fetch_syntactical_analysis(
+        self, sentence: str, language_code: str | None = None
+    ) -> list[Token]:
+        """
+        :param sentence: Sentence to analyse
+        :param language_code: ISO-639-1 language code. If not provided, the pipeline's language is assumed.
+        :return: list of Token objects
+        :raises LanguageNotAvailableException: if the language differs from the pipeline's language
+        :raises ApplicationException: if the analysis fails
+        """
+        if language_code is not None and language_code != self.language_code:
+            raise LanguageNotAvailableException()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[Token]] = loop.create_future()
+        self._pending.append((sentence, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_batch_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        # requests cancelled while waiting for the batch don't need to be analysed
+        batch = [(sentence, future) for sentence, future in batch if not future.done()]
+        if not batch:
+            return
+        start_ns = time.perf_counter_ns()
+        try:
+            submitted: Future[list[list[Token]]] = self._executor.submit(
+                _analyse_batch, [sentence for sentence, _ in batch]
+            )
+        except RuntimeError as e:
+            # the pool is shut down or broken, e.g. because a worker failed to load the pipeline
+            submitted = Future()
+            submitted.set_exception(e)
+        asyncio.wrap_future(submitted).add_done_callback(
+            partial(self._resolve, batch, start_ns)
+        )
+
+    @staticmethod
+    def _resolve(
+        batch: list[tuple[str, asyncio.Future[list[Token]]]],
+        start_ns: int,
+        submitted: asyncio.Future[list[list[Token]]],
+    ) -> None:
+        record(
+            "local_backend.analyse",
+            start_ns,
+            time.perf_counter_ns(),
+            sentences=len(batch),
+        )
+        if submitted.cancelled():
+            for _, future in batch:
+                future.cancel()
+            return
+        error = submitted.exception()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(
+                    ApplicationException(
+                        error_message=f"Local analysis failed: {error}"
+                    )
+                )
+            else:
+                future.set_result(submitted.result()[index])
+
+    def close(self) -> None:
+        """
+        Shuts down the workers; pending requests are cancelled.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "LocalAnalysisBackend":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
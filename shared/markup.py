@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+
+class MarkupLanguage(Enum):
+    MARKDOWN = "markdown"
+    HTML = "html"
+    PLAIN = "plain"
+    MARKDOWN_V2 = "markdown_v2"  # Telegram's MarkdownV2 dialect
+
+
+def _no_escape(text: str) -> str:
+    return text
+
+
+# Reference: https://core.telegram.org/bots/api#markdownv2-style
+_MARKDOWN_V2_ESCAPES = str.maketrans(
+    {char: f"\\{char}" for char in "\\_*[]()~`>#+-=|{}.!"}
+)
+_MARKDOWN_V2_LINK_ESCAPES = str.maketrans({char: f"\\{char}" for char in "\\)"})
+
+
+def escape_markdown_v2(text: str) -> str:
+    return text.translate(_MARKDOWN_V2_ESCAPES)
+
+
+def escape_markdown_v2_link(link: str) -> str:
+    return link.translate(_MARKDOWN_V2_LINK_ESCAPES)
+
+
+@dataclass(frozen=True)
+class MarkupBackend:
+    """
+    Precompiled format templates for a single markup language.
+    Resolving these once per Stringifier avoids re-checking the markup language on every call;
+    adding a new target only requires registering another backend in BACKENDS.
+    """
+
+    bold_template: str
+    italic_template: str
+    headline_template: str
+    linebreak: str
+    hyperlink_template: str
+    escape: Callable[[str], str] = _no_escape
+    escape_link: Callable[[str], str] = _no_escape
+
+    def bold(self, text: str) -> str:
+        return self.bold_template.format(text=self.escape(text))
+
+    def italic(self, text: str) -> str:
+        return self.italic_template.format(text=self.escape(text))
+
+    def headline(self, text: str) -> str:
+        return self.headline_template.format(text=self.escape(text))
+
+    def hyperlink(self, text: str, link: str) -> str:
+        return self.hyperlink_template.format(
+            text=self.escape(text), link=self.escape_link(link)
+        )
+
+
+BACKENDS: dict[MarkupLanguage, MarkupBackend] = {
+    MarkupLanguage.MARKDOWN: MarkupBackend(
+        bold_template="**{text}**",
+        italic_template="*{text}*",
+        headline_template="### {text}\n\n",
+        linebreak="\n\n",
+        hyperlink_template="[{text}]({link})",
+    ),
+    # currently only used for telegram client, which does not support <h3> tags or equivalents
+    MarkupLanguage.HTML: MarkupBackend(
+        bold_template="<b>{text}</b>",
+        italic_template="<i>{text}</i>",
+        headline_template="<b>{text}</b>\n",
+        linebreak="\n",
+        hyperlink_template="<a href='{link}'>{text}</a>",
+    ),
+    MarkupLanguage.PLAIN: MarkupBackend(
+        bold_template="{text}",
+        italic_template="{text}",
+        headline_template="{text}\n\n",
+        linebreak="\n",
+        hyperlink_template="{text} ({link})",
+    ),
+    MarkupLanguage.MARKDOWN_V2: MarkupBackend(
+        bold_template="*{text}*",
+        italic_template="_{text}_",
+        headline_template="*{text}*\n",
+        linebreak="\n",
+        hyperlink_template="[{text}]({link})",
+        escape=escape_markdown_v2,
+        escape_link=escape_markdown_v2_link,
+    ),
+}
+
+
+def get_backend(markup_language: MarkupLanguage) -> MarkupBackend:
+    return BACKENDS[markup_language]
@@ -1,6 +1,6 @@
 from typing import Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from shared.model.syntactical_analysis import PartOfSpeech
 
@@ -20,8 +20,67 @@ class Inflections(BaseModel):
     Represents a list of possible inflections for a given word.
     Additionally contains meta-information on that list of inflections, specifically whether it is a noun or a verb
     and its Gender, if applicable.
+    Lookups by morphology or surface form are served from indices that are built on first use;
+    the list of inflections is therefore not expected to change after the first lookup.
     """
 
     pos: PartOfSpeech
     gender: Union[str, None]  # for nouns only
     inflections: list[Inflection]
+
+    # feature names -> (feature values -> inflections), e.g. ("Case", "Number") -> {("Dat", "Plur"): [...]}
+    _morphology_index: dict[
+        tuple[str, ...], dict[tuple[str, ...], list[Inflection]]
+    ] = PrivateAttr(default_factory=dict)
+    _word_index: dict[str, list[Inflection]] | None = PrivateAttr(default=None)
+
+    def find(self, **morphology: str) -> list[Inflection]:
+        """
+        Finds all inflections that match the given features, e.g. find(Case="Dat", Number="Plur").
+        Features not specified are not taken into account. Each lookup is O(1) once the index for the
+        given combination of feature names has been built.
+        :param morphology: Universal Feature tags to match
+        :return: Matching inflections, in their original order
+        """
+        features = tuple(sorted(morphology))
+        index = self._build_morphology_index(features)
+        return index.get(tuple(morphology[feature] for feature in features), [])
+
+    def get(self, **morphology: str) -> Inflection | None:
+        """
+        :return: The first inflection matching the given features, if any.
+        """
+        matches = self.find(**morphology)
+        return matches[0] if matches else None
+
+    def forms(self, word: str) -> list[Inflection]:
+        """
+        Reverse lookup: finds all inflections with the given surface form,
+        e.g. "Tische" -> Nominative, Genitive and Accusative Plural.
+        """
+        if self._word_index is None:
+            self._word_index = {}
+            for inflection in self.inflections:
+                self._word_index.setdefault(inflection.word, []).append(inflection)
+        return self._word_index.get(word, [])
+
+    def feature_values(self, feature: str) -> list[str]:
+        """
+        :return: All values the given feature takes across the inflections, in order of first appearance.
+        """
+        return [values[0] for values in self._build_morphology_index((feature,))]
+
+    def _build_morphology_index(
+        self, features: tuple[str, ...]
+    ) -> dict[tuple[str, ...], list[Inflection]]:
+        index = self._morphology_index.get(features)
+        if index is not None:
+            return index
+        index = {}
+        for inflection in self.inflections:
+            morphology = inflection.morphology
+            if all(feature in morphology for feature in features):
+                key = tuple(morphology[feature] for feature in features)
+                index.setdefault(key, []).append(inflection)
+        self._morphology_index[features] = index
+        return index
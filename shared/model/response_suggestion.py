@@ -1,21 +1,164 @@
+import re
+
 from pydantic import BaseModel
 
+from shared.model.token.feature import Case, NounFeatureSet
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+
 
 class ResponseSuggestion(BaseModel):
     suggestion: str
     translation: str
 
 
-def should_generate_response_suggestions(sentence: str) -> bool:
+# German interrogative pronouns, determiners and adverbs
+INTERROGATIVES = frozenset(
+    {
+        "wer",
+        "wen",
+        "wem",
+        "wessen",
+        "was",
+        "welcher",
+        "welche",
+        "welches",
+        "welchem",
+        "welchen",
+        "wo",
+        "wohin",
+        "woher",
+        "wann",
+        "warum",
+        "wieso",
+        "weshalb",
+        "weswegen",
+        "wie",
+        "wozu",
+        "womit",
+        "wodurch",
+        "wofür",
+        "worüber",
+        "worauf",
+        "woran",
+        "worin",
+        "wovon",
+    }
+)
+
+# Weights of the individual cues; the confidence is their sum, clamped to [0, 1]
+QUESTION_MARK_WEIGHT = 0.5
+STATEMENT_PUNCTUATION_WEIGHT = -0.3
+INTERROGATIVE_WEIGHT = 0.45
+INTERROGATIVE_FOLLOWED_BY_VERB_WEIGHT = 0.2
+FINITE_VERB_FIRST_WEIGHT = 0.35
+NON_FINITE_VERB_FIRST_WEIGHT = 0.1
+SUBJECT_AFTER_VERB_WEIGHT = 0.2
+
+DEFAULT_QUESTION_THRESHOLD = 0.5
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def question_confidence(tokens: list[Token]) -> float:
+    """
+    Estimates how likely a sentence is a question, based on its syntactical analysis:
+    - sentence-final punctuation: a final "?" counts towards a question, a final "." or "!" against it.
+      A "?" that is followed by other tokens, e.g. in quoted speech, is ignored.
+    - an interrogative word at the start of the sentence (optionally preceded by a preposition, as in "Mit wem"),
+      particularly if it is immediately followed by a verb ("Wo ist ...").
+    - verb-first word order, particularly with a finite verb followed by a subject pronoun ("Kommst du ...").
+      Imperatives are verb-first as well, but their verbs carry no person and therefore no feature set.
+    :param tokens: Tokens of the sentence, as returned by the /syntactical-analysis endpoint
+    :return: Confidence between 0 and 1
+    """
+    if not tokens:
+        return 0.0
+    confidence = 0.0
+
+    final = tokens[-1]
+    if final.upos == UPOS.PUNCT:
+        if final.text == "?":
+            confidence += QUESTION_MARK_WEIGHT
+        elif final.text in (".", "!"):
+            confidence += STATEMENT_PUNCTUATION_WEIGHT
+
+    words = [token for token in tokens if token.upos != UPOS.PUNCT]
+    if not words:
+        return max(0.0, min(1.0, confidence))
+    first = words[0]
+    offset = 1 if first.upos == UPOS.ADP and len(words) > 1 else 0
+    lead = words[offset]
+    following = words[offset + 1] if len(words) > offset + 1 else None
+
+    if lead.text.lower() in INTERROGATIVES:
+        confidence += INTERROGATIVE_WEIGHT
+        if following is not None and following.upos.is_verb_like():
+            confidence += INTERROGATIVE_FOLLOWED_BY_VERB_WEIGHT
+    elif first.upos.is_verb_like():
+        if first.feature_set is not None:
+            confidence += FINITE_VERB_FIRST_WEIGHT
+            second = words[1] if len(words) > 1 else None
+            if (
+                second is not None
+                and second.upos == UPOS.PRON
+                and isinstance(second.feature_set, NounFeatureSet)
+                and second.feature_set.case == Case.NOM
+            ):
+                confidence += SUBJECT_AFTER_VERB_WEIGHT
+        else:
+            confidence += NON_FINITE_VERB_FIRST_WEIGHT
+
+    return max(0.0, min(1.0, confidence))
+
+
+def question_confidence_bounds(sentence: str) -> tuple[float, float]:
+    """
+    Bounds the result of question_confidence() from the raw sentence, before its syntactical analysis is available.
+    Final punctuation is known if the sentence ends in a word, or in a single ".", "!" or "?" after a word; whether the
+    sentence starts with an interrogative is known from its first word. Cues that depend on parts of speech,
+    e.g. verb-first order, are unknown and only widen the bounds.
+    :param sentence: The original sentence
+    :return: Lower and upper bound of the confidence
+    """
+    stripped = sentence.rstrip()
+    known_final = len(stripped) == 1 or (
+        len(stripped) > 1 and (stripped[-2].isalnum() or stripped[-2].isspace())
+    )
+    if not stripped or stripped[-1].isalnum():
+        low = high = 0.0
+    elif known_final and stripped.endswith("?"):
+        low = high = QUESTION_MARK_WEIGHT
+    elif known_final and stripped[-1:] in (".", "!"):
+        low = high = STATEMENT_PUNCTUATION_WEIGHT
+    else:
+        low, high = STATEMENT_PUNCTUATION_WEIGHT, QUESTION_MARK_WEIGHT
+
+    words = WORD_PATTERN.findall(sentence)
+    interrogative = INTERROGATIVE_WEIGHT + INTERROGATIVE_FOLLOWED_BY_VERB_WEIGHT
+    if words and words[0].lower() in INTERROGATIVES:
+        low += INTERROGATIVE_WEIGHT
+        high += interrogative
+    elif words:
+        high += max(interrogative, FINITE_VERB_FIRST_WEIGHT + SUBJECT_AFTER_VERB_WEIGHT)
+    return max(0.0, min(1.0, low)), max(0.0, min(1.0, high))
+
+
+def should_generate_response_suggestions(
+    sentence: str,
+    tokens: list[Token] | None = None,
+    threshold: float = DEFAULT_QUESTION_THRESHOLD,
+) -> bool:
     """
     Response suggestions should generally only be created for questions.
     Interestingly, there isn't a clear-cut way to figure this out – even spaCy doesn't have a straightforward way
-    of doing this. This could be solved via an LLM, but for now I want to try approximating this as best as possible.
+    of doing this. This could be solved via an LLM, but every false positive costs a model call, so this is
+    approximated through the grammatical cues in question_confidence().
     :param sentence: The original sentence
-    We're looking at both the original sentence and the translation to maximize the amount of hints we can use
-    to identify questions.
-    # todo a more comprehensive way of doing this could be to search for interrogative phrases,
-       potentially using the syntactical analysis of the sentence
+    :param tokens: The syntactical analysis of the sentence. If not available, only the question mark is considered.
+    :param threshold: Minimum confidence for a sentence to be treated as a question
     :return: is_question
     """
-    return "?" in sentence
+    if tokens is None:
+        return "?" in sentence
+    return question_confidence(tokens) >= threshold
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum
+from functools import lru_cache
 
 from pydantic import BaseModel
 
@@ -20,7 +21,7 @@ class FeatureSet(ABC, BaseModel):
 
     def dict(self, **kwargs):
         # iterate over the fields of the FeatureSet and return them as a dictionary
-        return {field: getattr(self, field).value for field in self.model_fields}
+        return {field: getattr(self, field).value for field in type(self).model_fields}
 
 
 class NounFeatureSet(FeatureSet):
@@ -34,7 +35,7 @@ class NounFeatureSet(FeatureSet):
     gender: Gender
 
     def __str__(self) -> str:
-        return f"{self.case.value.capitalize()} {self.number.value.capitalize()} {self.gender.value.capitalize()}"
+        return describe_features(self.case, self.number, self.gender)
 
 
 class VerbFeatureSet(FeatureSet):
@@ -48,13 +49,26 @@ class VerbFeatureSet(FeatureSet):
     tense: Tense
 
     def __str__(self) -> str:
-        return f"{self.person.value.capitalize()} {self.number.value.capitalize()} {self.tense.value.capitalize()}"
+        return describe_features(self.person, self.number, self.tense)
+
+
+# Concrete feature sets, used wherever a FeatureSet needs to be deserialized
+AnyFeatureSet = NounFeatureSet | VerbFeatureSet
 
 
 class Feature(str, Enum):
     pass
 
 
+@lru_cache(maxsize=256)
+def describe_features(*features: Feature) -> str:
+    """
+    Renders features legibly, e.g. "Nominative Singular Masculine".
+    There are only a few hundred combinations of features, so the descriptions are computed once and reused.
+    """
+    return " ".join(feature.value.capitalize() for feature in features)
+
+
 class Case(Feature):
     NOM = "nominative"
     ACC = "accusative"
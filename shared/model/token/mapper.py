@@ -5,8 +5,8 @@ from spacy.tokens import Doc
 from spacy.tokens.token import Token as SpacyToken
 
 from shared.model.token.feature import (
+    AnyFeatureSet,
     Case,
-    FeatureSet,
     Gender,
     NounFeatureSet,
     Number,
@@ -16,6 +16,7 @@ from shared.model.token.feature import (
 )
 from shared.model.token.token import Token as LLToken
 from shared.model.token.upos import UPOS
+from shared.profiling import span
 
 # Relevant to the parse() function
 T = TypeVar("T", bound=Enum)
@@ -26,8 +27,10 @@ def from_spacy_doc(doc: Doc) -> list[LLToken]:
     Converts a list of spaCy tokens to a list of more structured Token objects.
     """
     spacy_tokens = list(doc)
-    ll_tokens = [from_spacy_token(token) for token in spacy_tokens]
-    return enrich_ll_tokens_with_ancestors(ll_tokens, spacy_tokens)
+    with span("mapper.map_tokens", tokens=len(spacy_tokens)):
+        ll_tokens = [from_spacy_token(token) for token in spacy_tokens]
+    with span("mapper.enrich_ancestors", tokens=len(spacy_tokens)):
+        return enrich_ll_tokens_with_ancestors(ll_tokens, spacy_tokens)
 
 
 def enrich_ll_tokens_with_ancestors(
@@ -73,7 +76,7 @@ def map_upos(token: SpacyToken) -> UPOS:
     return parse(token.pos_, UPOS)
 
 
-def map_feature_set(token: SpacyToken) -> FeatureSet | None:
+def map_feature_set(token: SpacyToken) -> AnyFeatureSet | None:
     """
     Extracts a FeatureSet from a spaCy token.
     """
@@ -82,7 +85,7 @@ def map_feature_set(token: SpacyToken) -> FeatureSet | None:
     return feature_set_from_dict(tags, upos)
 
 
-def feature_set_from_dict(tags: dict[str, str], upos: UPOS) -> FeatureSet | None:
+def feature_set_from_dict(tags: dict[str, str], upos: UPOS) -> AnyFeatureSet | None:
     """
     Maps a dictionary of features to a FeatureSet object.
     """
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel
 
-from shared.model.token.feature import FeatureSet
+from shared.model.token.feature import AnyFeatureSet
 from shared.model.token.upos import UPOS
 
 
@@ -15,7 +15,7 @@ class Token(BaseModel):
     text: str
     lemma: str
     upos: UPOS
-    feature_set: FeatureSet | None = None
+    feature_set: AnyFeatureSet | None = None
     ancestor: Token | None = (
         None  # object reference; ids could arguably used in the same way spaCy does
     )
@@ -0,0 +1,111 @@
+"""
+Loads spaCy models once per process, trimmed to the components that shared.model.token.mapper reads.
+Requires the optional nlp dependencies.
+
+Example:
+    nlp = get_model()
+    tokens = from_spacy_doc(nlp("Wo ist der Bahnhof?"))
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+
+import spacy
+from spacy.language import Language
+
+DEFAULT_MODEL = "de_core_news_sm"
+
+# Components the mapper depends on: POS tags and morphology (tagger, morphologizer, attribute_ruler),
+# lemmas (lemmatizer) and the dependency tree (parser), plus the shared embedding layer they listen to (tok2vec).
+# Everything else, e.g. named entity recognition, is excluded from loading.
+MAPPER_COMPONENTS = frozenset(
+    {
+        "tok2vec",
+        "tagger",
+        "morphologizer",
+        "attribute_ruler",
+        "lemmatizer",
+        "trainable_lemmatizer",
+        "parser",
+    }
+)
+
+WARM_UP_TEXTS = {
+    "de": "Der kleine Hund hat gestern im Garten mit den Kindern gespielt.",
+}
+
+
+def unused_components(name: str | Path, required: frozenset[str]) -> list[str]:
+    """
+    Reads the components of a model from its meta.json without loading it.
+    :param name: Name of an installed model package or path to a model directory
+    :return: The components that aren't required
+    """
+    try:
+        path = Path(name)
+        if not path.exists():
+            path = spacy.util.get_package_path(str(name))
+        meta = spacy.util.get_model_meta(path)
+    except (OSError, ValueError, ModuleNotFoundError) as e:
+        logging.warning(f"Could not read the components of {name}, loading all: {e}")
+        return []
+    components = meta.get("components") or meta.get("pipeline") or []
+    return [component for component in components if component not in required]
+
+
+class ModelManager:
+    """
+    Loads each model once and hands out the same instance afterwards. Models are loaded while holding a lock, so
+    concurrent first requests from several threads load a model only once.
+    """
+
+    def __init__(
+        self, components: frozenset[str] = MAPPER_COMPONENTS, warm_up: bool = True
+    ):
+        """
+        :param components: Components to load if the model has them
+        :param warm_up: Whether to process a short text right after loading, so the first real request doesn't
+        pay for lazy initialisation
+        """
+        self.components = components
+        self.warm_up = warm_up
+        self._models: dict[str, Language] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str | Path = DEFAULT_MODEL) -> Language:
+        key = str(name)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(name)
+                self._models[key] = model
+            return model
+
+    def _load(self, name: str | Path) -> Language:
+        start = time.perf_counter()
+        model = spacy.load(name, exclude=unused_components(name, self.components))
+        if self.warm_up:
+            model(WARM_UP_TEXTS.get(model.lang or "", "warm-up"))
+        logging.info(
+            f"Loaded {name} with {model.pipe_names} in {time.perf_counter() - start:.2f}s"
+        )
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+_manager = ModelManager()
+
+
+def get_model(name: str | Path = DEFAULT_MODEL) -> Language:
+    """
+    :return: The process-wide instance of the model, trimmed to the components the mapper needs
+    """
+    return _manager.get(name)
@@ -0,0 +1,131 @@
+import asyncio
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from shared.client import Client
+from shared.exception import ApplicationException
+from shared.model.response_suggestion import (
+    DEFAULT_QUESTION_THRESHOLD,
+    question_confidence_bounds,
+    should_generate_response_suggestions,
+)
+from shared.rendering import Stringifier
+from shared.transport import BACKEND_UNREACHABLE_MESSAGE, TRANSPORT_ERRORS, unreachable
+
+
+class Section(Enum):
+    TRANSLATION = "translation"
+    BREAKDOWN = "breakdown"
+    SUGGESTIONS = "suggestions"
+
+
+@dataclass
+class RenderedSection:
+    """
+    A rendered part of the response. If the backend call(s) for the section failed,
+    error is set and text contains the error message.
+    """
+
+    section: Section
+    text: str
+    error: ApplicationException | None = None
+
+
+async def _result_or_error(task: Awaitable[Any]) -> Any:
+    """
+    Awaits a backend call, returning expected backend errors instead of raising them,
+    which is what Stringifier.coalesce_tokens() expects. Transport errors are returned as ApplicationException.
+    """
+    try:
+        return await task
+    except ApplicationException as e:
+        return e
+    except TRANSPORT_ERRORS as e:
+        return unreachable(e)
+
+
+async def render_progressively(
+    client: Client,
+    stringifier: Stringifier,
+    sentence: str,
+    ordered: bool = False,
+    question_threshold: float = DEFAULT_QUESTION_THRESHOLD,
+) -> AsyncIterator[RenderedSection]:
+    """
+    Fires all backend calls for a sentence concurrently and yields each section as soon as the calls it depends on
+    have finished, so clients can post or edit messages incrementally instead of waiting for the slowest endpoint.
+    The translation section depends on /translation only, the breakdown on /literal-translation and
+    /syntactical-analysis, and suggestions on /response-suggestion. Suggestions are requested right away if the
+    raw sentence is clearly a question, skipped if it clearly isn't, and otherwise only requested once the
+    syntactical analysis indicates that the sentence is a question.
+    Failed backend calls, including connection errors and timeouts, only fail the sections that depend on them.
+    Pending backend calls are cancelled if the consumer stops iterating early.
+    :param client: Client to fetch the data with
+    :param stringifier: Stringifier to render the sections with
+    :param sentence: The sentence sent by the user
+    :param ordered: If True, sections are yielded in the order translation, breakdown, suggestions.
+    Otherwise, they are yielded in the order in which they are ready.
+    :param question_threshold: Minimum question confidence for response suggestions to be requested
+    :return: RenderedSection objects
+    """
+    translation = asyncio.create_task(client.fetch_translation(sentence))
+    literal_translations = asyncio.create_task(
+        client.fetch_literal_translations(sentence)
+    )
+    syntactical_analysis = asyncio.create_task(
+        client.fetch_syntactical_analysis(sentence)
+    )
+    fetches = [translation, literal_translations, syntactical_analysis]
+
+    async def render(
+        section: Section, produce: Callable[[], Awaitable[str | None]]
+    ) -> RenderedSection | None:
+        try:
+            text = await produce()
+        except ApplicationException as e:
+            return RenderedSection(section, e.error_message, e)
+        except TRANSPORT_ERRORS as e:
+            error = unreachable(e)
+            return RenderedSection(section, error.error_message, error)
+        return RenderedSection(section, text) if text is not None else None
+
+    async def render_translation() -> str:
+        return stringifier.stringify_translation(sentence, await translation)  # type: ignore
+
+    async def render_breakdown() -> str:
+        return stringifier.coalesce_tokens(
+            await _result_or_error(literal_translations),
+            await _result_or_error(syntactical_analysis),
+        )
+
+    async def render_suggestions() -> str | None:
+        low, high = question_confidence_bounds(sentence)
+        if high < question_threshold:
+            return None
+        if low < question_threshold:
+            # only the analysis can decide; waiting for it is cheaper than a false positive's model call
+            tokens = await _result_or_error(syntactical_analysis)
+            if not should_generate_response_suggestions(
+                sentence,
+                None if isinstance(tokens, ApplicationException) else tokens,
+                question_threshold,
+            ):
+                return None
+        suggestions = await client.fetch_response_suggestions(sentence)
+        return stringifier.stringify_suggestions(suggestions)  # type: ignore
+
+    sections = [
+        asyncio.create_task(render(Section.TRANSLATION, render_translation)),
+        asyncio.create_task(render(Section.BREAKDOWN, render_breakdown)),
+        asyncio.create_task(render(Section.SUGGESTIONS, render_suggestions)),
+    ]
+
+    try:
+        for section in sections if ordered else asyncio.as_completed(sections):
+            rendered = await section
+            if rendered is not None:
+                yield rendered
+    finally:
+        for task in [*sections, *fetches]:
+            task.cancel()
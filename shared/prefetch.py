@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from shared.client import Client
+from shared.exception import ApplicationException
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.scheduler import Priority, request_priority
+
+DEFAULT_PREFETCH_UPOS = frozenset({UPOS.NOUN, UPOS.VERB})
+
+
+class InflectionPrefetcher:
+    """
+    Speculatively fetches the inflections of the nouns and verbs of an analysed sentence in the background,
+    so that the paradigm view can be served from the client's cache once the user selects a word.
+    Prefetching is best-effort: requests are sent with background priority, so a client scheduler serves user
+    requests first and sheds prefetches under load. Failures are logged and otherwise ignored, and pending
+    requests are cancelled once the prefetcher is cancelled or its context is left, e.g. when the user moves on.
+
+    Example:
+        async with InflectionPrefetcher(client) as prefetcher:
+            prefetcher.prefetch(tokens)
+            ...
+            inflections = await client.fetch_inflections(lemma)  # usually a cache hit
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        max_concurrency: int = 2,
+        upos: Iterable[UPOS] = DEFAULT_PREFETCH_UPOS,
+    ):
+        """
+        :param client: Client to prefetch with; it needs a cache to store the results in
+        :param max_concurrency: Maximum number of concurrent prefetch requests, to leave room for user requests
+        :param upos: Parts of speech whose lemmas are prefetched
+        """
+        if client.cache is None:
+            raise ValueError("Prefetching requires a client with a cache")
+        self.client = client
+        self.upos = frozenset(upos)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def prefetch(self, tokens: list[Token]) -> list[str]:
+        """
+        Queues inflection requests for the lemmas of the relevant tokens that are neither cached nor being fetched.
+        Returns immediately; must be called from within a running event loop.
+        :param tokens: Tokens of the analysed sentence
+        :return: The lemmas for which requests were queued
+        """
+        lemmas = []
+        for token in tokens:
+            if token.upos not in self.upos or token.lemma in lemmas:
+                continue
+            if self.client.is_cached("inflection", {"word": token.lemma}):
+                continue
+            lemmas.append(token.lemma)
+        for lemma in lemmas:
+            task = asyncio.create_task(self._fetch(lemma))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return lemmas
+
+    async def _fetch(self, lemma: str) -> None:
+        async with self._semaphore:
+            # the user may have requested the word while this request was queued
+            if self.client.is_cached("inflection", {"word": lemma}):
+                return
+            try:
+                with request_priority(Priority.BACKGROUND):
+                    await self.client.fetch_inflections(lemma)
+            except ApplicationException as e:
+                logging.info(f"Prefetching inflections for '{lemma}' failed: {e}")
+            except Exception as e:
+                logging.warning(f"Prefetching inflections for '{lemma}' failed: {e}")
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def cancel(self) -> None:
+        """
+        Cancels all pending prefetch requests. Results that were already fetched stay cached.
+        """
+        for task in self._tasks:
+            task.cancel()
+
+    async def wait(self) -> None:
+        """
+        Waits for all pending prefetch requests to finish.
+        """
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> "InflectionPrefetcher":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.cancel()
+        await self.wait()
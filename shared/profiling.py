@@ -0,0 +1,301 @@
+"""
+Opt-in profiling spans for the library's hot paths.
+
+Spans are disabled until at least one sink is registered via add_sink(); until then, span() returns a shared no-op
+context manager, so instrumented code pays only for a function call and an emptiness check.
+Nesting is tracked through contextvars, so concurrent asyncio tasks each see their own parent span.
+
+Example:
+    sink = InMemorySink()
+    add_sink(sink)
+    await client.fetch_translation("Wie geht's?")
+    print(sink.summary())
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Protocol
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start_ns: int  # time.perf_counter_ns() at the start of the span
+    duration_ns: int
+    parent: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: int | None = None  # unique within the process
+    parent_id: int | None = None
+
+
+class SpanSink(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+_sinks: list[SpanSink] = []
+_current_span: ContextVar[str | None] = ContextVar("current_span", default=None)
+_current_span_id: ContextVar[int | None] = ContextVar("current_span_id", default=None)
+_span_ids = itertools.count(1)
+
+
+def add_sink(sink: SpanSink) -> None:
+    """
+    Registers a sink; profiling is enabled while at least one sink is registered.
+    """
+    _sinks.append(sink)
+
+
+def remove_sink(sink: SpanSink) -> None:
+    _sinks.remove(sink)
+
+
+def is_enabled() -> bool:
+    return bool(_sinks)
+
+
+def _export(span: Span) -> None:
+    for sink in _sinks:
+        try:
+            sink.export(span)
+        except Exception as e:
+            logging.warning(f"Failed to export span {span.name}: {e}")
+
+
+class _NullSpan:
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+class _ActiveSpan:
+    def __init__(self, name: str, attributes: dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> "_ActiveSpan":
+        self.parent = _current_span.get()
+        self.parent_id = _current_span_id.get()
+        self.span_id = next(_span_ids)
+        self.token = _current_span.set(self.name)
+        self.id_token = _current_span_id.set(self.span_id)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        _current_span.reset(self.token)
+        _current_span_id.reset(self.id_token)
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        _export(
+            Span(
+                self.name,
+                self.start_ns,
+                duration_ns,
+                self.parent,
+                self.attributes,
+                self.span_id,
+                self.parent_id,
+            )
+        )
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attributes: Any) -> _ActiveSpan | _NullSpan:
+    """
+    Measures the duration of a block of code:
+        with span("client.decode", endpoint="translation"):
+            ...
+    :param name: Name of the span, conventionally "<area>.<phase>"
+    :param attributes: Additional information exported with the span
+    """
+    if not _sinks:
+        return _NULL_SPAN
+    return _ActiveSpan(name, attributes)
+
+
+def record(name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+    """
+    Exports a span that was measured externally, e.g. through aiohttp's tracing hooks.
+    Timestamps are expected to be time.perf_counter_ns() values.
+    """
+    if _sinks:
+        _export(
+            Span(
+                name,
+                start_ns,
+                end_ns - start_ns,
+                _current_span.get(),
+                attributes,
+                next(_span_ids),
+                _current_span_id.get(),
+            )
+        )
+
+
+@dataclass
+class SpanStats:
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int | None = None
+    max_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class InMemorySink:
+    """
+    Aggregates spans by name. Useful for tests, benchmarks and ad-hoc inspection.
+    """
+
+    def __init__(self) -> None:
+        self.stats: dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(span.name, SpanStats())
+            stats.count += 1
+            stats.total_ns += span.duration_ns
+            stats.max_ns = max(stats.max_ns, span.duration_ns)
+            stats.min_ns = (
+                span.duration_ns
+                if stats.min_ns is None
+                else min(stats.min_ns, span.duration_ns)
+            )
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        :return: Count, total and mean duration (in milliseconds) per span name
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "total_ms": stats.total_ns / 1e6,
+                    "mean_ms": stats.mean_ns / 1e6,
+                    "max_ms": stats.max_ns / 1e6,
+                }
+                for name, stats in self.stats.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+
+class LoggingSink:
+    """
+    Logs every span, by default at DEBUG level.
+    """
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.DEBUG
+    ):
+        self.logger = logger or logging.getLogger("shared.profiling")
+        self.level = level
+
+    def export(self, span: Span) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(
+                self.level,
+                f"span {span.name} took {span.duration_ns / 1e6:.3f}ms "
+                f"(parent: {span.parent}) {span.attributes}",
+            )
+
+
+class OpenTelemetrySink:
+    """
+    Forwards spans to an OpenTelemetry tracer, keeping their nesting.
+    Requires the optional opentelemetry-api package unless a tracer and set_span_in_context are passed explicitly.
+    Spans are exported once they end, i.e. children before their parents, so children are held back until their
+    parent has been started; the name of the parent span is also kept as the attribute "parent".
+    Children whose parent is never exported, e.g. because it was recorded while no sink was registered, are held
+    back up to MAX_PENDING_SPANS and then forwarded without their parent, oldest first.
+    """
+
+    # started spans that later children may still refer to, e.g. those of tasks that outlive their parent span
+    MAX_STARTED_SPANS = 1024
+    # finished children waiting for their parent
+    MAX_PENDING_SPANS = 1024
+
+    def __init__(
+        self,
+        tracer: Any = None,
+        set_span_in_context: Callable[[Any], Any] | None = None,
+    ):
+        """
+        :param tracer: OpenTelemetry tracer, defaults to the tracer "shared" of the global tracer provider
+        :param set_span_in_context: Creates the context of child spans from their parent, defaults to
+        opentelemetry.trace.set_span_in_context
+        """
+        if tracer is None or set_span_in_context is None:
+            try:
+                from opentelemetry import trace  # type: ignore[import-not-found]
+            except ImportError as e:
+                raise ImportError(
+                    "OpenTelemetrySink requires the opentelemetry-api package"
+                ) from e
+            tracer = tracer or trace.get_tracer("shared")
+            set_span_in_context = set_span_in_context or trace.set_span_in_context
+        self.tracer = tracer
+        self.set_span_in_context = set_span_in_context
+        # OpenTelemetry expects epoch timestamps, whereas spans are measured with a monotonic clock
+        self._offset_ns = time.time_ns() - time.perf_counter_ns()
+        self._pending: OrderedDict[int, list[Span]] = OrderedDict()  # by parent id
+        self._pending_count = 0
+        self._started: OrderedDict[int, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if span.parent_id is None:
+                self._forward(span, None)
+            elif span.parent_id in self._started:
+                self._forward(
+                    span, self.set_span_in_context(self._started[span.parent_id])
+                )
+            else:
+                self._pending.setdefault(span.parent_id, []).append(span)
+                self._pending_count += 1
+                while self._pending_count > self.MAX_PENDING_SPANS:
+                    _, orphans = self._pending.popitem(last=False)
+                    self._pending_count -= len(orphans)
+                    for orphan in orphans:
+                        self._forward(orphan, None)
+
+    def _forward(self, span: Span, context: Any) -> None:
+        attributes = {key: str(value) for key, value in span.attributes.items()}
+        if span.parent:
+            attributes["parent"] = span.parent
+        start_ns = span.start_ns + self._offset_ns
+        otel_span = self.tracer.start_span(
+            span.name, context=context, start_time=start_ns, attributes=attributes
+        )
+        if span.span_id is not None:
+            self._started[span.span_id] = otel_span
+            while len(self._started) > self.MAX_STARTED_SPANS:
+                self._started.popitem(last=False)
+            children = self._pending.pop(span.span_id, [])
+            self._pending_count -= len(children)
+            child_context = self.set_span_in_context(otel_span) if children else None
+            for child in children:
+                self._forward(child, child_context)
+        otel_span.end(end_time=start_ns + span.duration_ns)
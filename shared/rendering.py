@@ -1,40 +1,294 @@
+import logging
+import re
 from enum import Enum
-from typing import Optional, Union
+from functools import cache
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import emoji
 
+from shared.cache import LRUCache, content_key
 from shared.exception import ApplicationException
+from shared.markup import MarkupBackend, MarkupLanguage, get_backend
+from shared.model.inflection import Inflections
 from shared.model.literal_translation import LiteralTranslation
 from shared.model.response_suggestion import ResponseSuggestion
 from shared.model.syntactical_analysis import SyntacticalAnalysis
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
 from shared.model.translation import Translation
+from shared.profiling import span
+from shared.universal_features import convert_to_legible_tags
 
+# Telegram rejects messages longer than 4096 characters
+TELEGRAM_MESSAGE_LIMIT = 4096
 
-class MarkupLanguage(Enum):
-    MARKDOWN = "markdown"
-    HTML = "html"
 
+class SizeUnit(Enum):
+    CHARACTERS = "characters"
+    BYTES = "bytes"
 
-class Stringifier:
-    def __init__(self, markup_language: MarkupLanguage):
-        self.markup_language = markup_language
 
-    @staticmethod
-    def introductory_text() -> str:
-        return emoji.emojize(  # type: ignore
-            f"""
+def measure(text: str, unit: SizeUnit) -> int:
+    if unit == SizeUnit.BYTES:
+        return len(text.encode("utf-8"))
+    return len(text)
+
+
+def chunk(
+    pieces: Iterable[str],
+    max_size: int = TELEGRAM_MESSAGE_LIMIT,
+    unit: SizeUnit = SizeUnit.CHARACTERS,
+    markup_language: MarkupLanguage = MarkupLanguage.PLAIN,
+) -> Iterator[str]:
+    """
+    Greedily groups rendered pieces into chunks of at most max_size, splitting only pieces that exceed the budget
+    on their own. Because the Stringifier only yields self-contained pieces and _split() closes markup at each
+    split, no chunk contains an unclosed tag.
+    :param pieces: Rendered pieces, e.g. from Stringifier.iter_analyses()
+    :param max_size: Maximum size of a chunk
+    :param unit: Whether max_size refers to characters or UTF-8 encoded bytes
+    :param markup_language: Markup of the pieces, so that oversized pieces are split without breaking it
+    :return: Chunks, in order; each is yielded as soon as it is complete
+    """
+    if max_size <= 0:
+        raise ValueError(f"max_size must be positive, got {max_size}")
+    buffer: list[str] = []
+    size = 0
+    for piece in pieces:
+        piece_size = measure(piece, unit)
+        if buffer and size + piece_size > max_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+        if piece_size > max_size:
+            logging.warning(
+                f"Splitting rendered piece of size {piece_size} to fit chunk size {max_size}"
+            )
+            *parts, piece = _split(piece, max_size, unit, markup_language)
+            yield from parts
+            piece_size = measure(piece, unit)
+        buffer.append(piece)
+        size += piece_size
+    if buffer:
+        yield "".join(buffer)
+
+
+# Units of markup that a split must not cut: tags and entities, escapes, links and formatting markers.
+# Anything else is split character by character.
+_MARKUP_TOKENS = {
+    MarkupLanguage.HTML: re.compile(r"<[^<>]*>|&#?\w+;|.", re.DOTALL),
+    MarkupLanguage.MARKDOWN: re.compile(r"\[[^\]]*\]\([^)]*\)|\*\*|\*|.", re.DOTALL),
+    MarkupLanguage.MARKDOWN_V2: re.compile(
+        r"\\.|\[(?:\\.|[^\]\\])*\]\((?:\\.|[^)\\])*\)|\|\||__|[*_~]|.", re.DOTALL
+    ),
+}
+_CHARACTERS = re.compile(".", re.DOTALL)
+_HTML_TAG = re.compile(r"<(/?)([a-zA-Z][\w-]*)[^<>]*>")
+# formatting markers that open and close an entity alike
+_MARKERS = {
+    MarkupLanguage.MARKDOWN: frozenset({"**", "*"}),
+    MarkupLanguage.MARKDOWN_V2: frozenset({"*", "_", "__", "~", "||"}),
+}
+
+# markup that is open at a position, as (opening, closing) pairs from the outermost
+OpenMarkup = tuple[tuple[str, str], ...]
+
+
+def _track(
+    token: str, open_markup: OpenMarkup, markup_language: MarkupLanguage
+) -> OpenMarkup:
+    """
+    :return: The markup that is open after token
+    """
+    if markup_language == MarkupLanguage.HTML:
+        match = _HTML_TAG.fullmatch(token)
+        if match is None or token.endswith("/>"):
+            return open_markup
+        closing = f"</{match.group(2)}>"
+        if not match.group(1):
+            return open_markup + ((token, closing),)
+    elif token in _MARKERS.get(markup_language, ()):
+        closing = token
+        if all(marker != token for _, marker in open_markup):
+            return open_markup + ((token, closing),)
+    else:
+        return open_markup
+    for i in reversed(range(len(open_markup))):
+        if open_markup[i][1] == closing:
+            return open_markup[:i] + open_markup[i + 1 :]
+    return open_markup
+
+
+def _split(
+    piece: str,
+    max_size: int,
+    unit: SizeUnit,
+    markup_language: MarkupLanguage = MarkupLanguage.PLAIN,
+) -> list[str]:
+    """
+    Splits a piece into parts of at most max_size, preferably after a line break or space, and mid-word only if
+    a part contains neither. Tags, entities, escapes and links are never cut, so a part may exceed max_size if one
+    of them does on its own. Markup that is open at a split is closed at the end of the part and reopened at the
+    start of the next one.
+    """
+    tokens = _MARKUP_TOKENS.get(markup_language, _CHARACTERS).findall(piece)
+    sizes = [measure(token, unit) for token in tokens]
+    open_markup: list[OpenMarkup] = [()]
+    for token in tokens:
+        open_markup.append(_track(token, open_markup[-1], markup_language))
+
+    def opens(i: int) -> bool:
+        return len(open_markup[i]) > len(open_markup[i - 1])
+
+    def closes(i: int) -> bool:
+        return i < len(open_markup) and len(open_markup[i]) < len(open_markup[i - 1])
+
+    def close(i: int) -> str:
+        return "".join(closing for _, closing in reversed(open_markup[i]))
+
+    parts = []
+    start, reopened, remaining = 0, "", sum(sizes)
+    while start < len(tokens) and measure(reopened, unit) + remaining > max_size:
+        size = measure(reopened, unit)
+        # if nothing fits, the part takes at least the first character after any opening markup
+        end, cut, fallback = start, 0, start + 1
+        while fallback < len(tokens) and opens(fallback):
+            fallback += 1
+        while end < len(tokens) and size + sizes[end] <= max_size:
+            size += sizes[end]
+            end += 1
+            if opens(end):
+                continue  # don't leave markup empty
+            if size + measure(close(end), unit) > max_size:
+                continue
+            fallback = end
+            if tokens[end - 1] in ("\n", " "):
+                cut = end
+        cut = cut or fallback
+        # markup that closes right after the cut replaces the closing tags of the part, at the same size
+        while closes(cut + 1):
+            cut += 1
+        parts.append(reopened + "".join(tokens[start:cut]) + close(cut))
+        reopened = "".join(opening for opening, _ in open_markup[cut])
+        remaining -= sum(sizes[start:cut])
+        start = cut
+    if start < len(tokens):
+        parts.append(reopened + "".join(tokens[start:]))
+    return parts
+
+
+def legible_tag(feature: str, value: str) -> str:
+    """
+    :return: The legible description of a Universal Feature value, e.g. "Dative" for Case=Dat,
+    or the value itself if there is none.
+    """
+    return convert_to_legible_tags({feature: value}, (feature,)) or value
+
+
+UPOS_LABELS = {upos: upos.value.capitalize() for upos in UPOS}
+
+T = TypeVar("T")
+
+
+def align(
+    literal_translations: list[LiteralTranslation],
+    items: list[T],
+    key: Callable[[T], str],
+) -> list[Optional[T]]:
+    """
+    Pairs every word of the literal translation with the item (analysis or token) for the same word.
+    Builds a word index once, so alignment is linear in the length of the sentence.
+    Repeated words are matched by position, i.e. the second occurrence of a word in the literal translation
+    gets the second item for that word. If a word occurs more often in the literal translation than in
+    the items, the last matching item is reused.
+    """
+    index: dict[str, list[T]] = {}
+    for item in items:
+        index.setdefault(key(item), []).append(item)
+    occurrences: dict[str, int] = {}
+    aligned: list[Optional[T]] = []
+    for literal_translation in literal_translations:
+        candidates = index.get(literal_translation.word)
+        if not candidates:
+            aligned.append(None)
+            continue
+        occurrence = occurrences.get(literal_translation.word, 0)
+        occurrences[literal_translation.word] = occurrence + 1
+        aligned.append(candidates[min(occurrence, len(candidates) - 1)])
+    return aligned
+
+
+class RenderedConstants(NamedTuple):
+    """
+    Blocks of text that do not depend on user input and therefore only need to be rendered once per backend.
+    """
+
+    introductory_text: str
+    disclaimer: str
+    translation_headline: str
+    translation_suffix: str
+    breakdown_headline: str
+    suggestions_headline: str
+    inflections_headline: str
+
+
+def _introductory_text() -> str:
+    return emoji.emojize(  # type: ignore
+        f"""
         Hi! I'm the Grammr Bot. I will support you in learning German :Germany:.
         Send me a German sentence, and I will translate it for you and explain the Grammar.
 
         Let's get started! Text me something – for example, 'Wie viel kostet ein Bier?' :beer:
         """
+    )
+
+
+@cache
+def render_constants(backend: MarkupBackend) -> RenderedConstants:
+    escape = backend.escape
+    disclaimer = (
+        escape("I'm currently under active development. You can\n        ")
+        + backend.hyperlink(
+            "view my source code on GitHub",
+            "https://github.com/TobiasWaslowski/lingolift/",
         )
+        + escape(" if you want,\n        or ")
+        + backend.hyperlink(
+            "contact my creator", "https://www.linkedin.com/in/twaslowski/"
+        )
+        + escape("\n        if you have any questions or remarks.")
+    )
+    return RenderedConstants(
+        introductory_text=escape(_introductory_text()),
+        disclaimer=disclaimer,
+        translation_headline=backend.headline("Translation"),
+        translation_suffix=escape(" in English.") + "\n",
+        breakdown_headline=backend.headline("Vocabulary and Grammar breakdown"),
+        suggestions_headline=backend.headline("Response suggestions"),
+        inflections_headline=backend.headline("Inflections"),
+    )
+
+
+class Stringifier:
+    def __init__(self, markup_language: MarkupLanguage):
+        self.markup_language = markup_language
+        self.backend = get_backend(markup_language)
+        self.constants = render_constants(self.backend)
+
+    def introductory_text(self) -> str:
+        return self.constants.introductory_text
 
     def disclaimer(self) -> str:
-        return f"""I'm currently under active development. You can
-        {self.hyperlink('view my source code on GitHub', 'https://github.com/TobiasWaslowski/lingolift/')} if you want,
-        or {self.hyperlink('contact my creator', 'https://www.linkedin.com/in/twaslowski/')}
-        if you have any questions or remarks."""
+        return self.constants.disclaimer
 
     def coalesce_analyses(
         self,
@@ -55,15 +309,165 @@ class Stringifier:
             raise ApplicationException(
                 error_message="An error occurred while fetching the literal translation."
             )
-        response_string = self.headline("Vocabulary and Grammar breakdown")
-        for word in literal_translations:
-            analysis = self.find_analysis(word.word, syntactical_analysis)
-            response_string += f"{self.bold(word.word)}: {word.translation}"
+        with span("rendering.coalesce_analyses"):
+            return "".join(
+                self.iter_analyses(literal_translations, syntactical_analysis)
+            )
+
+    def iter_analyses(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        syntactical_analysis: list[SyntacticalAnalysis],
+    ) -> Iterator[str]:
+        """
+        Lazily renders the vocabulary and grammar breakdown, yielding the headline and then one entry per word.
+        Every yielded piece is self-contained markup, so pieces can be grouped into messages freely.
+        Raises the same ApplicationException as coalesce_analyses() if no literal translation is available.
+        """
+        if isinstance(literal_translations, ApplicationException):
+            raise ApplicationException(
+                error_message="An error occurred while fetching the literal translation."
+            )
+        return self._analysis_entries(literal_translations, syntactical_analysis)
+
+    def _analysis_entries(
+        self,
+        literal_translations: list[LiteralTranslation],
+        syntactical_analysis: list[SyntacticalAnalysis],
+    ) -> Iterator[str]:
+        analyses = self.align_analyses(literal_translations, syntactical_analysis)
+        escape = self.backend.escape
+        linebreak = self.backend.linebreak
+        yield self.constants.breakdown_headline
+        for word, analysis in zip(literal_translations, analyses):
             if analysis:
-                response_string += f"; {analysis.stringify()}{self.linebreak()}"
+                yield f"{self.bold(word.word)}: {escape(word.translation)}; {escape(analysis.stringify())}{linebreak}"
             else:
-                response_string += self.linebreak()
-        return response_string
+                yield f"{self.bold(word.word)}: {escape(word.translation)}{linebreak}"
+
+    def stream_analyses(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        syntactical_analysis: list[SyntacticalAnalysis],
+        max_size: int = TELEGRAM_MESSAGE_LIMIT,
+        unit: SizeUnit = SizeUnit.CHARACTERS,
+    ) -> Iterator[str]:
+        """
+        Renders the vocabulary and grammar breakdown as a sequence of messages that each fit into max_size.
+        Word entries are never split across messages.
+        """
+        return chunk(
+            self.iter_analyses(literal_translations, syntactical_analysis),
+            max_size,
+            unit,
+            self.markup_language,
+        )
+
+    @staticmethod
+    def align_analyses(
+        literal_translations: list[LiteralTranslation],
+        syntactical_analyses: list[SyntacticalAnalysis],
+    ) -> list[Optional[SyntacticalAnalysis]]:
+        """
+        Pairs every word of the literal translation with its syntactical analysis in a single pass; see align().
+        :param literal_translations: Words of the sentence alongside their translations
+        :param syntactical_analyses: Set of syntactical analyses for words in the sentence
+        :return: One analysis (or None) per literal translation, in the same order
+        """
+        if isinstance(syntactical_analyses, ApplicationException):
+            return [None] * len(literal_translations)
+        return align(literal_translations, syntactical_analyses, attrgetter("word"))
+
+    def coalesce_tokens(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        tokens: Union[list[Token], ApplicationException],
+    ) -> str:
+        """
+        Equivalent of coalesce_analyses() for the Token lists returned by Client.fetch_syntactical_analysis().
+        Each word gets displayed alongside its translation and the description of its token, as per Token.__str__().
+        :param literal_translations: Words of the sentence alongside their translations
+        :param tokens: Tokens of the sentence, or an ApplicationException if the analysis failed
+        :return: The rendered vocabulary and grammar breakdown
+        """
+        with span("rendering.coalesce_tokens"):
+            return "".join(self.iter_tokens(literal_translations, tokens))
+
+    def iter_tokens(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        tokens: Union[list[Token], ApplicationException],
+    ) -> Iterator[str]:
+        """
+        Lazily renders the vocabulary and grammar breakdown from Tokens, yielding the headline and then one entry
+        per word. Raises an ApplicationException if no literal translation is available.
+        """
+        if isinstance(literal_translations, ApplicationException):
+            raise ApplicationException(
+                error_message="An error occurred while fetching the literal translation."
+            )
+        return self._token_entries(literal_translations, tokens)
+
+    def _token_entries(
+        self,
+        literal_translations: list[LiteralTranslation],
+        tokens: Union[list[Token], ApplicationException],
+    ) -> Iterator[str]:
+        aligned = self.align_tokens(literal_translations, tokens)
+        escape = self.backend.escape
+        bold = self.backend.bold
+        linebreak = self.backend.linebreak
+        describe = self.describe_token
+        yield self.constants.breakdown_headline
+        for word, token in zip(literal_translations, aligned):
+            if token:
+                yield f"{bold(word.word)}: {escape(word.translation)}; {escape(describe(token))}{linebreak}"
+            else:
+                yield f"{bold(word.word)}: {escape(word.translation)}{linebreak}"
+
+    def stream_tokens(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        tokens: Union[list[Token], ApplicationException],
+        max_size: int = TELEGRAM_MESSAGE_LIMIT,
+        unit: SizeUnit = SizeUnit.CHARACTERS,
+    ) -> Iterator[str]:
+        """
+        Renders the vocabulary and grammar breakdown from Tokens as a sequence of messages that each fit into
+        max_size. Word entries are never split across messages.
+        """
+        return chunk(
+            self.iter_tokens(literal_translations, tokens),
+            max_size,
+            unit,
+            self.markup_language,
+        )
+
+    @staticmethod
+    def align_tokens(
+        literal_translations: list[LiteralTranslation],
+        tokens: Union[list[Token], ApplicationException],
+    ) -> list[Optional[Token]]:
+        """
+        Pairs every word of the literal translation with its token; see align_analyses().
+        """
+        if isinstance(tokens, ApplicationException):
+            return [None] * len(literal_translations)
+        return align(literal_translations, tokens, attrgetter("text"))
+
+    @staticmethod
+    def describe_token(token: Token) -> str:
+        """
+        Produces the same description as Token.__str__(), without building an intermediate list.
+        """
+        description = UPOS_LABELS[token.upos]
+        if token.feature_set:
+            description = f"{description}; {token.feature_set}"
+        if token.ancestor:
+            description = f" refers to: {token.ancestor.text}; {description}"
+        if token.text != token.lemma:
+            description = f"(from: {token.lemma}); {description}"
+        return description
 
     @staticmethod
     def find_analysis(
@@ -83,44 +487,174 @@ class Stringifier:
 
     def stringify_translation(self, sentence: str, translation: Translation) -> str:
         return (
-            f"{self.headline('Translation')}"
-            f"'{self.italic(sentence)}' translates to '{self.italic(translation.translation)}' in English.\n"
+            f"{self.constants.translation_headline}"
+            f"'{self.italic(sentence)}' translates to '{self.italic(translation.translation)}'"
+            f"{self.constants.translation_suffix}"
         )
 
     def stringify_suggestions(self, suggestions: list[ResponseSuggestion]) -> str:
-        response_string = self.headline("Response suggestions")
+        with span("rendering.stringify_suggestions"):
+            return "".join(self.iter_suggestions(suggestions))
+
+    def iter_suggestions(self, suggestions: list[ResponseSuggestion]) -> Iterator[str]:
+        """
+        Lazily renders response suggestions, yielding the headline and then one entry per suggestion.
+        """
+        yield self.constants.suggestions_headline
         for suggestion in suggestions:
-            response_string += f"'{self.italic(suggestion.suggestion)}'\n"
-            response_string += f"{suggestion.translation}\n\n"
-        return response_string
+            yield f"'{self.italic(suggestion.suggestion)}'\n{self.escape(suggestion.translation)}\n\n"
+
+    def stream_suggestions(
+        self,
+        suggestions: list[ResponseSuggestion],
+        max_size: int = TELEGRAM_MESSAGE_LIMIT,
+        unit: SizeUnit = SizeUnit.CHARACTERS,
+    ) -> Iterator[str]:
+        """
+        Renders response suggestions as a sequence of messages that each fit into max_size.
+        """
+        return chunk(
+            self.iter_suggestions(suggestions), max_size, unit, self.markup_language
+        )
+
+    def stringify_paradigm(
+        self,
+        inflections: Inflections,
+        rows: str = "Case",
+        columns: str = "Number",
+        **fixed: str,
+    ) -> str:
+        """
+        Renders a paradigm table of inflections, with one line per value of the row feature and one cell per value
+        of the column feature, e.g. Case x Number for nouns or Person x Number for verbs.
+        Every cell is an O(1) lookup in the index of the Inflections object.
+        :param inflections: Inflections of a word
+        :param rows: Universal Feature to use for rows, e.g. "Case"
+        :param columns: Universal Feature to use for columns, e.g. "Number"
+        :param fixed: Additional features every cell must match, e.g. Tense="Pres"
+        :return: The rendered table; missing forms are rendered as "–"
+        :raises ValueError: if rows and columns are the same feature, or a fixed feature is also used for either
+        """
+        if rows == columns:
+            raise ValueError(f"rows and columns must be different features, got {rows}")
+        overlap = sorted({rows, columns} & fixed.keys())
+        if overlap:
+            raise ValueError(
+                f"{', '.join(overlap)} can't be fixed, as it is used for the rows or columns"
+            )
+        column_values = inflections.feature_values(columns)
+        linebreak = self.backend.linebreak
+        parts = [
+            self.constants.inflections_headline,
+            " | ".join(
+                self.italic(legible_tag(columns, value)) for value in column_values
+            ),
+            linebreak,
+        ]
+        for row_value in inflections.feature_values(rows):
+            cells = []
+            for column_value in column_values:
+                matches = inflections.find(
+                    **fixed, **{rows: row_value, columns: column_value}
+                )
+                forms = dict.fromkeys(inflection.word for inflection in matches)
+                cells.append(self.escape("/".join(forms)) if forms else "–")
+            parts.append(
+                f"{self.bold(legible_tag(rows, row_value))}: {' | '.join(cells)}{linebreak}"
+            )
+        return "".join(parts)
+
+    def escape(self, text: str) -> str:
+        """
+        Escapes plain text for the target markup language; a no-op for all targets except MarkdownV2.
+        """
+        return self.backend.escape(text)
 
     def bold(self, text: str) -> str:
-        if self.markup_language == MarkupLanguage.MARKDOWN:
-            return f"**{text}**"
-        elif self.markup_language == MarkupLanguage.HTML:
-            return f"<b>{text}</b>"
+        return self.backend.bold(text)
 
     def italic(self, text: str) -> str:
-        if self.markup_language == MarkupLanguage.MARKDOWN:
-            return f"*{text}*"
-        elif self.markup_language == MarkupLanguage.HTML:
-            return f"<i>{text}</i>"
+        return self.backend.italic(text)
 
     def headline(self, text: str) -> str:
-        if self.markup_language == MarkupLanguage.MARKDOWN:
-            return f"### {text}\n\n"
-        elif self.markup_language == MarkupLanguage.HTML:
-            # currently only used for telegram client, which does not support <h3> tags or equivalents
-            return f"{self.bold(text)}\n"
+        return self.backend.headline(text)
 
     def linebreak(self) -> str:
-        if self.markup_language == MarkupLanguage.MARKDOWN:
-            return "\n\n"
-        elif self.markup_language == MarkupLanguage.HTML:
-            return "\n"
+        return self.backend.linebreak
 
     def hyperlink(self, text: str, link: str) -> str:
-        if self.markup_language == MarkupLanguage.MARKDOWN:
-            return f"[{text}]({link})"
-        elif self.markup_language == MarkupLanguage.HTML:
-            return f"<a href='{link}'>{text}</a>"
+        return self.backend.hyperlink(text, link)
+
+
+class CachingStringifier(Stringifier):
+    """
+    A Stringifier that memoises rendered output, keyed by a stable hash of the input models and the markup language.
+    Useful when the same sentence is rendered for many users. The cache may be shared between instances.
+    """
+
+    def __init__(
+        self,
+        markup_language: MarkupLanguage,
+        cache: LRUCache[str, str] | None = None,
+    ):
+        super().__init__(markup_language)
+        self.cache: LRUCache[str, str] = cache if cache is not None else LRUCache()
+
+    def _cached(self, method: str, render: Callable[[], str], *inputs: Any) -> str:
+        key = content_key(method, self.markup_language, *inputs)
+        rendered = self.cache.get(key)
+        if rendered is None:
+            rendered = render()
+            self.cache.put(key, rendered)
+        return rendered
+
+    def coalesce_analyses(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        syntactical_analysis: list[SyntacticalAnalysis],
+    ) -> str:
+        if isinstance(literal_translations, ApplicationException):
+            # errors are not cached; this raises
+            return super().coalesce_analyses(literal_translations, syntactical_analysis)
+        return self._cached(
+            "coalesce_analyses",
+            lambda: super(CachingStringifier, self).coalesce_analyses(
+                literal_translations, syntactical_analysis
+            ),
+            literal_translations,
+            syntactical_analysis,
+        )
+
+    def coalesce_tokens(
+        self,
+        literal_translations: Union[list[LiteralTranslation], ApplicationException],
+        tokens: Union[list[Token], ApplicationException],
+    ) -> str:
+        if isinstance(literal_translations, ApplicationException):
+            # errors are not cached; this raises
+            return super().coalesce_tokens(literal_translations, tokens)
+        return self._cached(
+            "coalesce_tokens",
+            lambda: super(CachingStringifier, self).coalesce_tokens(
+                literal_translations, tokens
+            ),
+            literal_translations,
+            tokens,
+        )
+
+    def stringify_translation(self, sentence: str, translation: Translation) -> str:
+        return self._cached(
+            "stringify_translation",
+            lambda: super(CachingStringifier, self).stringify_translation(
+                sentence, translation
+            ),
+            sentence,
+            translation,
+        )
+
+    def stringify_suggestions(self, suggestions: list[ResponseSuggestion]) -> str:
+        return self._cached(
+            "stringify_suggestions",
+            lambda: super(CachingStringifier, self).stringify_suggestions(suggestions),
+            suggestions,
+        )
@@ -0,0 +1,241 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import AsyncIterator, Iterator, Mapping
+
+from shared.exception import RequestShedException
+from shared.profiling import record
+
+
+class Priority(IntEnum):
+    """
+    Lower values are served first.
+    """
+
+    INTERACTIVE = 0  # a user is waiting for the response
+    BACKGROUND = 1  # speculative work, e.g. prefetching
+    BULK = 2  # batch jobs, e.g. re-analysing stored sentences
+
+
+# queued requests per class; low-priority queues are short, so that their requests are shed first under load
+DEFAULT_QUEUE_LIMITS = {
+    Priority.INTERACTIVE: 256,
+    Priority.BACKGROUND: 32,
+    Priority.BULK: 16,
+}
+
+_priority: ContextVar[Priority] = ContextVar(
+    "request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """
+    Sets the priority of all client requests made within the block, including those of tasks created in it:
+        with request_priority(Priority.BULK):
+            await client.fetch_syntactical_analysis(sentence)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+@dataclass
+class PriorityStats:
+    submitted: int = 0
+    started: int = 0
+    shed: int = 0
+    promoted: int = 0  # queued requests that moved to a higher priority
+    total_queue_time: float = 0.0  # seconds
+    max_queue_time: float = 0.0
+
+    @property
+    def mean_queue_time(self) -> float:
+        return self.total_queue_time / self.started if self.started else 0.0
+
+
+class Ticket:
+    """
+    A request's place in the scheduler. Its priority can be raised while it is queued, see Scheduler.promote().
+    """
+
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self._future: asyncio.Future[None] | None = None
+        self._queued_at = 0.0  # event loop time
+        self._timer: asyncio.TimerHandle | None = None
+
+
+class Scheduler:
+    """
+    Limits the number of concurrent backend requests and decides which queued request goes next.
+    Requests are served strictly by priority, and in order of arrival within a priority.
+    A request is shed with RequestShedException if the queue of its priority is full, or if it was queued for
+    longer than the maximum queue time of its priority.
+    Queued requests can be promoted to a higher priority, e.g. once a user waits for the result of a prefetch.
+    Queue times are exported as "scheduler.queue" spans while profiling is enabled.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        queue_limits: Mapping[Priority, int] = DEFAULT_QUEUE_LIMITS,
+        max_queue_times: Mapping[Priority, float] | None = None,
+    ):
+        """
+        :param max_in_flight: Maximum number of concurrent requests across all priorities
+        :param queue_limits: Maximum number of queued requests per priority, overriding DEFAULT_QUEUE_LIMITS
+        :param max_queue_times: Maximum time in seconds a request of a priority may be queued, if limited
+        """
+        if max_in_flight <= 0:
+            raise ValueError(f"max_in_flight must be positive, got {max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self.queue_limits = {**DEFAULT_QUEUE_LIMITS, **queue_limits}
+        self.max_queue_times = dict(max_queue_times or {})
+        self.stats = {priority: PriorityStats() for priority in Priority}
+        self._queues: dict[Priority, deque[asyncio.Future[None]]] = {
+            priority: deque() for priority in Priority
+        }
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def queued(self, priority: Priority | None = None) -> int:
+        """
+        :return: The number of waiting requests, of the given priority or in total
+        """
+        queues = (
+            [self._queues[priority]] if priority is not None else self._queues.values()
+        )
+        return sum(1 for queue in queues for future in queue if not future.done())
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority | None = None, ticket: Ticket | None = None
+    ) -> AsyncIterator[None]:
+        """
+        Waits until the request may be sent.
+        :param priority: Priority of the request, defaults to the one set with request_priority()
+        :param ticket: Ticket to queue the request with, so that it can be promoted; takes precedence over priority
+        :raises RequestShedException: if the request is shed
+        """
+        if ticket is None:
+            ticket = Ticket(priority if priority is not None else current_priority())
+        await self.acquire(ticket)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, ticket: Ticket | Priority) -> None:
+        if not isinstance(ticket, Ticket):
+            ticket = Ticket(ticket)
+        stats = self.stats[ticket.priority]
+        stats.submitted += 1
+        start_ns = time.perf_counter_ns()
+        ahead = any(self.queued(p) for p in Priority if p <= ticket.priority)
+        if self._in_flight < self.max_in_flight and not ahead:
+            self._in_flight += 1
+            stats.started += 1
+            return
+
+        if self.queued(ticket.priority) >= self.queue_limits.get(ticket.priority, 0):
+            stats.shed += 1
+            raise RequestShedException()
+        loop = asyncio.get_running_loop()
+        future = ticket._future = loop.create_future()
+        ticket._queued_at = loop.time()
+        self._queues[ticket.priority].append(future)
+        self._schedule_expiry(ticket)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # the slot was granted, but the caller is gone
+                self.release()
+            self._discard(self._queues[ticket.priority], future)
+            raise
+        finally:
+            if ticket._timer is not None:
+                ticket._timer.cancel()
+            ticket._future = ticket._timer = None
+        end_ns = time.perf_counter_ns()
+        queue_time = (end_ns - start_ns) / 1e9
+        stats = self.stats[ticket.priority]
+        stats.started += 1
+        stats.total_queue_time += queue_time
+        stats.max_queue_time = max(stats.max_queue_time, queue_time)
+        record("scheduler.queue", start_ns, end_ns, priority=ticket.priority.name)
+
+    def promote(self, ticket: Ticket, priority: Priority) -> None:
+        """
+        Raises the priority of a request. A queued request moves to the end of the queue of the new priority, and the
+        maximum queue time of the new priority applies from when it was first queued. Lower priorities are ignored.
+        """
+        if priority >= ticket.priority:
+            return
+        future = ticket._future
+        if future is not None and not future.done():
+            self._discard(self._queues[ticket.priority], future)
+            self._queues[priority].append(future)
+            self.stats[ticket.priority].promoted += 1
+            ticket.priority = priority
+            self._schedule_expiry(ticket)
+        else:
+            ticket.priority = priority
+
+    def _schedule_expiry(self, ticket: Ticket) -> None:
+        if ticket._timer is not None:
+            ticket._timer.cancel()
+            ticket._timer = None
+        max_queue_time = self.max_queue_times.get(ticket.priority)
+        if max_queue_time is not None:
+            ticket._timer = asyncio.get_running_loop().call_at(
+                ticket._queued_at + max_queue_time, self._expire, ticket
+            )
+
+    def _expire(self, ticket: Ticket) -> None:
+        future = ticket._future
+        if future is None or future.done():
+            return
+        self._discard(self._queues[ticket.priority], future)
+        self.stats[ticket.priority].shed += 1
+        future.set_exception(RequestShedException())
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue and self._in_flight < self.max_in_flight:
+                future = queue.popleft()
+                if future.done():
+                    continue  # cancelled or shed while queued
+                self._in_flight += 1
+                future.set_result(None)
+            if self._in_flight >= self.max_in_flight:
+                return
+
+    @staticmethod
+    def _discard(
+        queue: deque[asyncio.Future[None]], future: asyncio.Future[None]
+    ) -> None:
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
@@ -0,0 +1,250 @@
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, TypeVar, Union
+
+from shared.client import Client
+from shared.exception import ApplicationException, SentenceTooLongException
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.token.token import Token
+from shared.model.translation import Translation
+from shared.transport import TRANSPORT_ERRORS, unreachable
+
+T = TypeVar("T")
+
+# sentences end with terminal punctuation, optionally followed by closing quotes or brackets
+SENTENCE_PATTERN = re.compile(r"[^.!?…]+(?:[.!?…]+[\"'»“”)\]]*|$)")
+# clause boundaries: the separator stays with the preceding clause
+CLAUSE_PATTERN = re.compile(r"[^,;:–]+(?:[,;:–]+|$)")
+WORD_PATTERN = re.compile(r"\S+")
+
+
+@dataclass(frozen=True)
+class SegmentBudget:
+    """
+    Size limits of a single backend request. The defaults are conservative;
+    align them with the backend's configuration if it differs.
+    """
+
+    max_words: int = 30
+    max_characters: int = 250
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    A part of the original text; text == original[start:end].
+    """
+
+    text: str
+    start: int
+    end: int
+
+
+def fits(text: str, budget: SegmentBudget) -> bool:
+    """
+    Cheap local pre-check of whether the backend can process a text in a single request.
+    """
+    return len(text) <= budget.max_characters and len(text.split()) <= budget.max_words
+
+
+def check_length(sentence: str, budget: SegmentBudget = SegmentBudget()) -> None:
+    """
+    Raises the same exception the backend would, without the round trip.
+    """
+    if not fits(sentence, budget):
+        raise SentenceTooLongException()
+
+
+def _spans(pattern: re.Pattern, text: str, offset: int) -> list[Segment]:
+    segments = []
+    for match in pattern.finditer(text):
+        # strip surrounding whitespace, keeping offsets intact
+        stripped = match.group().strip()
+        if not stripped:
+            continue
+        start = (
+            offset + match.start() + (len(match.group()) - len(match.group().lstrip()))
+        )
+        segments.append(Segment(stripped, start, start + len(stripped)))
+    return segments
+
+
+def _split_words(segment: Segment, budget: SegmentBudget) -> list[Segment]:
+    words = _spans(WORD_PATTERN, segment.text, segment.start)
+    segments: list[Segment] = []
+    group: list[Segment] = []
+    for word in words:
+        candidate = group + [word]
+        if group and not (
+            len(candidate) <= budget.max_words
+            and word.end - group[0].start <= budget.max_characters
+        ):
+            segments.append(_merge(group, segment))
+            candidate = [word]
+        group = candidate
+    if group:
+        segments.append(_merge(group, segment))
+    return segments
+
+
+def _merge(parts: list[Segment], parent: Segment) -> Segment:
+    start, end = parts[0].start, parts[-1].end
+    return Segment(parent.text[start - parent.start : end - parent.start], start, end)
+
+
+def _pack(
+    parts: list[Segment], parent: Segment, budget: SegmentBudget
+) -> list[Segment]:
+    """
+    Greedily merges adjacent parts as long as the result stays within budget.
+    """
+    segments: list[Segment] = []
+    group: list[Segment] = []
+    for part in parts:
+        if group and fits(_merge(group + [part], parent).text, budget):
+            group.append(part)
+            continue
+        if group:
+            segments.append(_merge(group, parent))
+        group = [part]
+    if group:
+        segments.append(_merge(group, parent))
+    return segments
+
+
+def segment(text: str, budget: SegmentBudget = SegmentBudget()) -> list[Segment]:
+    """
+    Splits a text into segments that each fit into the budget, preferring sentence boundaries,
+    then clause boundaries and finally word boundaries. Adjacent short sentences are kept together.
+    :param text: Text of arbitrary length
+    :param budget: Size limits of a single backend request
+    :return: Segments in order, with offsets into text
+    """
+    whole = Segment(text, 0, len(text))
+    parts: list[Segment] = []
+    for sentence in _spans(SENTENCE_PATTERN, text, 0):
+        if fits(sentence.text, budget):
+            parts.append(sentence)
+            continue
+        for clause in _spans(CLAUSE_PATTERN, sentence.text, sentence.start):
+            if fits(clause.text, budget):
+                parts.append(clause)
+            else:
+                parts.extend(_split_words(clause, budget))
+    return _pack(parts, whole, budget)
+
+
+@dataclass
+class SegmentResult:
+    segment: Segment
+    translation: Union[Translation, ApplicationException]
+    literal_translations: Union[list[LiteralTranslation], ApplicationException]
+    tokens: Union[list[Token], ApplicationException]
+
+
+@dataclass
+class SegmentedAnalysis:
+    """
+    Results for all segments of a text, stitched back together in order.
+    Offsets refer to the position of each word in the original text, or are None if it could not be located.
+    """
+
+    text: str
+    results: list[SegmentResult]
+    literal_translations: list[LiteralTranslation] = field(default_factory=list)
+    literal_translation_offsets: list[int | None] = field(default_factory=list)
+    tokens: list[Token] = field(default_factory=list)
+    token_offsets: list[int | None] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        for result in self.results:
+            if not isinstance(result.literal_translations, ApplicationException):
+                self.literal_translations.extend(result.literal_translations)
+                self.literal_translation_offsets.extend(
+                    _locate(
+                        [lt.word for lt in result.literal_translations],
+                        self.text,
+                        result.segment,
+                    )
+                )
+            if not isinstance(result.tokens, ApplicationException):
+                self.tokens.extend(result.tokens)
+                self.token_offsets.extend(
+                    _locate(
+                        [token.text for token in result.tokens],
+                        self.text,
+                        result.segment,
+                    )
+                )
+
+    @property
+    def translation(self) -> Union[Translation, ApplicationException]:
+        """
+        :return: The translations of all segments joined together, or the first error if any segment failed,
+        as a partial translation would be misleading.
+        """
+        translations = []
+        for result in self.results:
+            if isinstance(result.translation, ApplicationException):
+                return result.translation
+            translations.append(result.translation)
+        if not translations:
+            return ApplicationException(error_message="Nothing to translate.")
+        return Translation(
+            translation=" ".join(t.translation for t in translations),
+            language_name=translations[0].language_name,
+            language_code=translations[0].language_code,
+        )
+
+
+def _locate(words: list[str], text: str, segment: Segment) -> list[int | None]:
+    offsets: list[int | None] = []
+    cursor = segment.start
+    for word in words:
+        position = text.find(word, cursor, segment.end)
+        if position == -1:
+            offsets.append(None)
+        else:
+            offsets.append(position)
+            cursor = position + len(word)
+    return offsets
+
+
+async def analyse_text(
+    client: Client,
+    text: str,
+    budget: SegmentBudget = SegmentBudget(),
+    max_concurrency: int = 8,
+) -> SegmentedAnalysis:
+    """
+    Fetches translation, literal translations and syntactical analysis for a text of arbitrary length by
+    splitting it into segments the backend accepts and processing them in parallel.
+    The result can be rendered in one go, e.g. with
+    stringifier.coalesce_tokens(analysis.literal_translations, analysis.tokens).
+    :param client: Client to fetch the data with
+    :param text: Text of arbitrary length
+    :param budget: Size limits of a single backend request
+    :param max_concurrency: Maximum number of concurrent backend requests
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(call: Awaitable[T]) -> Union[T, ApplicationException]:
+        async with semaphore:
+            try:
+                return await call
+            except ApplicationException as e:
+                return e
+            except TRANSPORT_ERRORS as e:
+                return unreachable(e)
+
+    async def process(segment: Segment) -> SegmentResult:
+        translation, literal_translations, tokens = await asyncio.gather(
+            bounded(client.fetch_translation(segment.text)),
+            bounded(client.fetch_literal_translations(segment.text)),
+            bounded(client.fetch_syntactical_analysis(segment.text)),
+        )
+        return SegmentResult(segment, translation, literal_translations, tokens)  # type: ignore
+
+    results = await asyncio.gather(*(process(s) for s in segment(text, budget)))
+    return SegmentedAnalysis(text, list(results))
@@ -0,0 +1,218 @@
+"""
+Read-only snapshots of precomputed backend responses, e.g. for the most frequent sentences and words.
+
+A snapshot is a single file that is memory-mapped rather than loaded, so lookups only touch the pages they need,
+and processes on the same host share those pages through the OS page cache.
+Responses are stored as the raw JSON bodies the backend returned, so the Client validates them like any other
+response.
+
+Layout (little-endian):
+    header:  magic (8 bytes), bucket count (u64), entry count (u64)
+    index:   one bucket per slot: key hash (u64), record offset (u64), record length (u64); offset 0 marks an empty
+             bucket. Collisions are resolved by linear probing.
+    records: key length (u32), key, response body
+
+Usage:
+    python -m shared.snapshot --host https://... --sentences sentences.txt --words words.txt --output lexicon.snap
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Iterable
+
+from shared.transport import TRANSPORT_ERRORS, HttpTransport, Transport
+
+logger = logging.getLogger("shared.snapshot")
+
+MAGIC = b"LLSNAP01"
+HEADER = struct.Struct("<8sQQ")
+BUCKET = struct.Struct("<QQQ")
+KEY_LENGTH = struct.Struct("<I")
+# share of occupied buckets; lower values mean shorter probe sequences at the cost of a larger index
+LOAD_FACTOR = 0.5
+# snapshots are shared between processes, possibly of different users
+FILE_MODE = 0o644
+
+
+def snapshot_key(endpoint: str, payload: dict[str, Any]) -> bytes:
+    return (
+        endpoint
+        + "\0"
+        + json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    ).encode()
+
+
+def _hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def write_snapshot(
+    path: str, entries: Iterable[tuple[str, dict[str, Any], bytes]]
+) -> int:
+    """
+    Writes a snapshot atomically, replacing any existing file at path.
+    :param path: Path of the snapshot file
+    :param entries: (endpoint, payload, response body) tuples; later entries replace earlier ones with the same key
+    :return: Number of entries written
+    """
+    records = {
+        snapshot_key(endpoint, payload): body for endpoint, payload, body in entries
+    }
+    bucket_count = max(1, int(len(records) / LOAD_FACTOR) + 1)
+    buckets = [(0, 0, 0)] * bucket_count
+    data = bytearray()
+    data_start = HEADER.size + bucket_count * BUCKET.size
+    for key, body in records.items():
+        key_hash = _hash(key)
+        offset = data_start + len(data)
+        data += KEY_LENGTH.pack(len(key)) + key + body
+        slot = key_hash % bucket_count
+        while buckets[slot][1] != 0:
+            slot = (slot + 1) % bucket_count
+        buckets[slot] = (key_hash, offset, KEY_LENGTH.size + len(key) + len(body))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        file.write(HEADER.pack(MAGIC, bucket_count, len(records)))
+        for bucket in buckets:
+            file.write(BUCKET.pack(*bucket))
+        file.write(data)
+    # temporary files are only readable by their owner
+    os.chmod(file.name, FILE_MODE)
+    os.replace(file.name, path)
+    return len(records)
+
+
+class Snapshot:
+    """
+    Looks up precomputed responses in a memory-mapped snapshot file.
+    """
+
+    def __init__(self, path: str):
+        """
+        :raises ValueError: if the file is not a snapshot file or is truncated
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size or header[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a snapshot file")
+            _, self._bucket_count, self._entry_count = HEADER.unpack(header)
+            size = os.fstat(file.fileno()).st_size
+            index_end = HEADER.size + self._bucket_count * BUCKET.size
+            if self._bucket_count == 0 or size < index_end:
+                raise ValueError(
+                    f"{path} is truncated: its index needs {index_end} bytes, but the file has {size}"
+                )
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, endpoint: str, payload: dict[str, Any]) -> bytes | None:
+        """
+        :return: The stored response body, or None if the request isn't part of the snapshot
+        """
+        key = snapshot_key(endpoint, payload)
+        key_hash = _hash(key)
+        slot = key_hash % self._bucket_count
+        for _ in range(self._bucket_count):
+            stored_hash, offset, length = BUCKET.unpack_from(
+                self._map, HEADER.size + slot * BUCKET.size
+            )
+            if offset == 0:
+                return None
+            if stored_hash == key_hash:
+                (key_length,) = KEY_LENGTH.unpack_from(self._map, offset)
+                key_start = offset + KEY_LENGTH.size
+                if self._map[key_start : key_start + key_length] == key:
+                    return self._map[key_start + key_length : offset + length]
+            slot = (slot + 1) % self._bucket_count
+        return None
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+async def collect(
+    transport: Transport,
+    sentences: list[str],
+    words: list[str],
+    max_concurrency: int = 8,
+) -> list[tuple[str, dict[str, Any], bytes]]:
+    """
+    Fetches literal translations and syntactical analyses for the sentences and inflections for the words.
+    Requests that fail are left out of the snapshot.
+    :return: Entries for write_snapshot()
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    requests = [
+        (endpoint, {"sentence": sentence})
+        for sentence in sentences
+        for endpoint in ("literal-translation", "syntactical-analysis")
+    ] + [("inflection", {"word": word}) for word in words]
+
+    async def fetch(
+        endpoint: str, payload: dict[str, Any]
+    ) -> tuple[str, dict[str, Any], bytes] | None:
+        async with semaphore:
+            try:
+                status, body = await transport.post(endpoint, payload)
+            except TRANSPORT_ERRORS as e:
+                logger.warning(f"Skipping /{endpoint} {payload}: {e!r}")
+                return None
+        if status != 200:
+            logger.warning(f"Skipping /{endpoint} {payload}: {status}")
+            return None
+        return endpoint, payload, body
+
+    results = await asyncio.gather(*(fetch(*request) for request in requests))
+    return [result for result in results if result is not None]
+
+
+def _read_lines(path: str | None) -> list[str]:
+    if path is None:
+        return []
+    with open(path, encoding="utf-8") as file:
+        return list(dict.fromkeys(line.strip() for line in file if line.strip()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m shared.snapshot")
+    parser.add_argument("--host", required=True, help="base URL of the backend API")
+    parser.add_argument("--sentences", help="file with one sentence per line")
+    parser.add_argument("--words", help="file with one word per line")
+    parser.add_argument("--output", required=True, help="path of the snapshot file")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="concurrent backend requests"
+    )
+    args = parser.parse_args()
+
+    entries = asyncio.run(
+        collect(
+            HttpTransport(args.host),
+            _read_lines(args.sentences),
+            _read_lines(args.words),
+            args.concurrency,
+        )
+    )
+    count = write_snapshot(args.output, entries)
+    print(f"Wrote {count} entries to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import hashlib
+import random
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from shared.cache import LRUCache
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.translation import Translation
+from shared.word_cache import WordTranslations
+
+# question marks are kept, as they change the translation ("Du kommst." / "Du kommst?")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s?]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# MinHash signatures are split into bands of rows; sentences that agree on all rows of any band become candidates.
+# With 16 bands of 4 rows, sentences with a Jaccard similarity of 0.7 are found with a probability of ~99%.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+_PRIME = (1 << 61) - 1
+_random = random.Random(42)
+_PERMUTATIONS = [
+    (_random.randrange(1, _PRIME), _random.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+# MinHash signatures of recently seen sentences; a sentence is usually looked up and then added right after
+FINGERPRINT_CACHE_SIZE = 256
+
+Fingerprint = tuple[frozenset[str], list[tuple[int, ...]]]  # shingles and bands
+
+
+def normalise(sentence: str) -> str:
+    """
+    Removes differences that don't affect the translation: Unicode representation, casing, punctuation
+    other than question marks, and whitespace.
+    Unlike the word cache, sentences are compared regardless of case: within a sentence, the context disambiguates
+    words like "Essen" / "essen", and chat messages are often typed in lower case. Literal translations are still
+    reused per word case-sensitively, see TranslationMemory.fill_literal_translations().
+    """
+    sentence = unicodedata.normalize("NFKC", sentence).casefold()
+    sentence = PUNCTUATION_PATTERN.sub(" ", sentence).replace("?", " ?")
+    return WHITESPACE_PATTERN.sub(" ", sentence).strip()
+
+
+def shingles(normalised: str) -> frozenset[str]:
+    """
+    Character n-grams of a normalised sentence, padded so that short words are represented as well.
+    """
+    padded = f" {normalised} "
+    if len(padded) <= SHINGLE_SIZE:
+        return frozenset({padded})
+    return frozenset(
+        padded[i : i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)
+    )
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash(shingle_set: frozenset[str]) -> tuple[int, ...]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+        for s in shingle_set
+    ]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+@dataclass
+class TranslationMemoryStats:
+    lookups: int = 0
+    exact_hits: int = 0  # identical after normalisation
+    fuzzy_hits: int = 0  # similar enough to reuse
+    words_reused: int = 0
+    words_missing: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return (
+            (self.exact_hits + self.fuzzy_hits) / self.lookups if self.lookups else 0.0
+        )
+
+    @property
+    def word_reuse_rate(self) -> float:
+        words = self.words_reused + self.words_missing
+        return self.words_reused / words if words else 0.0
+
+
+@dataclass
+class _Entry:
+    normalised: str
+    shingles: frozenset[str]
+    bands: list[tuple[int, ...]]
+    translation: Translation | None = None
+    literal_translations: list[LiteralTranslation] | None = None
+
+
+@dataclass
+class Match:
+    sentence: str  # the normalised sentence that was matched
+    similarity: float
+    translation: Translation | None
+    literal_translations: list[LiteralTranslation] | None
+
+
+@dataclass
+class TranslationMemory:
+    """
+    Remembers the translations of previously seen sentences and finds them again for near-duplicates,
+    i.e. sentences that differ in casing, punctuation or a few words.
+    Sentences are indexed with MinHash locality-sensitive hashing over character n-grams, so lookups only compare
+    against a few candidates; the similarity of candidates is then computed exactly as the Jaccard similarity of
+    their n-grams.
+    Full translations are only reused for sentences at least as similar as translation_threshold, which defaults
+    to identical sentences after normalisation, as a single changed word changes the translation.
+    Literal translations are word-level, so the words that a sufficiently similar sentence has in common
+    are reused, and only the others need to be fetched.
+    """
+
+    maxsize: int = 10_000
+    translation_threshold: float = 1.0
+    literal_translation_threshold: float = 0.6
+    stats: TranslationMemoryStats = field(default_factory=TranslationMemoryStats)
+
+    def __post_init__(self) -> None:
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._fingerprints = LRUCache[str, Fingerprint](maxsize=FINGERPRINT_CACHE_SIZE)
+        self._buckets: list[dict[tuple[int, ...], set[str]]] = [
+            {} for _ in range(BANDS)
+        ]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, sentence: str, threshold: float, attribute: str) -> Match | None:
+        """
+        :param sentence: The sentence to look up
+        :param threshold: Minimum similarity between 0 and 1
+        :param attribute: "translation" or "literal_translations"; only entries that store it are considered
+        :return: The most similar stored sentence with a similarity of at least threshold, if any
+        """
+        normalised = normalise(sentence)
+        with self._lock:
+            self.stats.lookups += 1
+            entry = self._entries.get(normalised)
+            if entry is not None and getattr(entry, attribute) is not None:
+                self._entries.move_to_end(normalised)
+                self.stats.exact_hits += 1
+                return self._match(entry, 1.0)
+            if threshold >= 1.0:
+                return None
+        # MinHash takes milliseconds, so it is computed outside the lock
+        query, bands = self._fingerprint(normalised)
+        with self._lock:
+            best, best_similarity = None, threshold
+            for candidate in self._candidates(bands):
+                entry = self._entries[candidate]
+                if getattr(entry, attribute) is None:
+                    continue
+                similarity = jaccard(query, entry.shingles)
+                if similarity >= best_similarity:
+                    best, best_similarity = entry, similarity
+            if best is None:
+                return None
+            self._entries.move_to_end(best.normalised)
+            self.stats.fuzzy_hits += 1
+            return self._match(best, best_similarity)
+
+    def find_translation(self, sentence: str) -> Translation | None:
+        match = self.find(sentence, self.translation_threshold, "translation")
+        return match.translation if match is not None else None
+
+    def fill_literal_translations(
+        self, sentence: str, words: list[str], known: list[WordTranslations | None]
+    ) -> list[WordTranslations | None]:
+        """
+        Fills in the literal translations of words that are not yet known from the most similar stored sentence.
+        :param sentence: The sentence
+        :param words: Words of the sentence, see shared.word_cache.split_words()
+        :param known: Literal translations that are already known, e.g. from a word cache, or None per word
+        :return: known, with the words the similar sentence has in common filled in
+        """
+        if all(translation is not None for translation in known):
+            return known
+        match = self.find(
+            sentence, self.literal_translation_threshold, "literal_translations"
+        )
+        reusable = {
+            translation.word: (translation,)
+            for translation in (match.literal_translations or [] if match else [])
+        }
+        filled = [
+            translations if translations is not None else reusable.get(word)
+            for word, translations in zip(words, known)
+        ]
+        reused = sum(
+            1 for before, after in zip(known, filled) if before is None and after
+        )
+        with self._lock:
+            self.stats.words_reused += reused
+            self.stats.words_missing += sum(1 for t in filled if t is None)
+        return filled
+
+    def add(
+        self,
+        sentence: str,
+        translation: Translation | None = None,
+        literal_translations: list[LiteralTranslation] | None = None,
+    ) -> None:
+        """
+        Stores the translation and/or literal translations of a sentence, keeping previously stored results.
+        """
+        normalised = normalise(sentence)
+        fingerprint = (
+            None if normalised in self._entries else self._fingerprint(normalised)
+        )
+        with self._lock:
+            entry = self._entries.get(normalised)
+            if entry is None:
+                shingle_set, bands = fingerprint or self._fingerprint(normalised)
+                entry = _Entry(normalised, shingle_set, bands)
+                self._entries[normalised] = entry
+                for band, bucket in zip(entry.bands, self._buckets):
+                    bucket.setdefault(band, set()).add(normalised)
+                while len(self._entries) > self.maxsize:
+                    self._evict()
+            self._entries.move_to_end(normalised)
+            if translation is not None:
+                entry.translation = translation
+            if literal_translations is not None:
+                entry.literal_translations = literal_translations
+
+    def _evict(self) -> None:
+        _, entry = self._entries.popitem(last=False)
+        for band, bucket in zip(entry.bands, self._buckets):
+            members = bucket[band]
+            members.discard(entry.normalised)
+            if not members:
+                del bucket[band]
+
+    def _fingerprint(self, normalised: str) -> Fingerprint:
+        fingerprint = self._fingerprints.get(normalised)
+        if fingerprint is None:
+            shingle_set = shingles(normalised)
+            signature = minhash(shingle_set)
+            bands = [signature[i * ROWS : (i + 1) * ROWS] for i in range(BANDS)]
+            fingerprint = shingle_set, bands
+            self._fingerprints.put(normalised, fingerprint)
+        return fingerprint
+
+    def _candidates(self, bands: list[tuple[int, ...]]) -> set[str]:
+        candidates: set[str] = set()
+        for band, bucket in zip(bands, self._buckets):
+            candidates |= bucket.get(band, set())
+        return candidates
+
+    @staticmethod
+    def _match(entry: _Entry, similarity: float) -> Match:
+        return Match(
+            entry.normalised,
+            similarity,
+            entry.translation,
+            entry.literal_translations,
+        )
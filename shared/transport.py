@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Mapping, Protocol
+
+import aiohttp
+import boto3  # type: ignore[import-untyped]
+from botocore.config import Config  # type: ignore[import-untyped]
+from botocore.exceptions import BotoCoreError  # type: ignore[import-untyped]
+from botocore.exceptions import ClientError as BotoClientError
+
+from shared.exception import ApplicationException
+from shared.profiling import is_enabled, record, span
+
+# raised when the backend can't be reached or doesn't respond in time, as opposed to error responses of the backend
+TRANSPORT_ERRORS: tuple[type[Exception], ...] = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    BotoCoreError,
+    BotoClientError,
+)
+BACKEND_UNREACHABLE_MESSAGE = (
+    "The service is not reachable at the moment, please try again later."
+)
+
+
+def unreachable(error: Exception) -> ApplicationException:
+    """
+    :param error: One of TRANSPORT_ERRORS
+    :return: The error to show users instead, so a failed request can be handled like an error response
+    """
+    logging.warning(f"Backend request failed: {error!r}")
+    return ApplicationException(error_message=BACKEND_UNREACHABLE_MESSAGE)
+
+
+class Transport(Protocol):
+    """
+    Sends a request to a backend endpoint on behalf of the Client.
+    """
+
+    async def post(self, endpoint: str, payload: dict[str, Any]) -> tuple[int, bytes]:
+        """
+        :param endpoint: Endpoint name without leading slash, e.g. "translation"
+        :param payload: JSON body of the request
+        :return: The status code and the raw JSON body of the response
+        """
+        ...
+
+
+async def _on_request_start(_: Any, context: SimpleNamespace, __: Any) -> None:
+    context.request_start = context.connected = context.sent = time.perf_counter_ns()
+
+
+async def _on_connection_ready(_: Any, context: SimpleNamespace, __: Any) -> None:
+    context.connected = context.sent = time.perf_counter_ns()
+
+
+async def _on_request_sent(_: Any, context: SimpleNamespace, __: Any) -> None:
+    context.sent = time.perf_counter_ns()
+
+
+async def _on_request_end(_: Any, context: SimpleNamespace, __: Any) -> None:
+    now = time.perf_counter_ns()
+    record("client.connect", context.request_start, context.connected)
+    record("client.send", context.connected, context.sent)
+    record("client.wait", context.sent, now)
+
+
+def _profiling_trace_config() -> aiohttp.TraceConfig:
+    """
+    Splits requests into the connect, send and wait phases through aiohttp's tracing hooks.
+    Only attached to sessions while profiling is enabled.
+    """
+    trace_config = aiohttp.TraceConfig()
+    hooks: list[tuple[Any, Any]] = [
+        (trace_config.on_request_start, _on_request_start),
+        (trace_config.on_connection_create_end, _on_connection_ready),
+        (trace_config.on_connection_reuseconn, _on_connection_ready),
+        (trace_config.on_request_headers_sent, _on_request_sent),
+        (trace_config.on_request_chunk_sent, _on_request_sent),
+        (trace_config.on_request_end, _on_request_end),
+    ]
+    for signal, hook in hooks:
+        signal.append(hook)
+    return trace_config
+
+
+class HttpTransport:
+    """
+    Posts requests to the backend API, e.g. through API Gateway.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+
+    async def post(self, endpoint: str, payload: dict[str, Any]) -> tuple[int, bytes]:
+        trace_configs = [_profiling_trace_config()] if is_enabled() else None
+        async with aiohttp.ClientSession(trace_configs=trace_configs) as session:
+            async with session.post(
+                f"{self.host}/{endpoint}", json=payload
+            ) as response:
+                with span("client.decode", endpoint=endpoint):
+                    return response.status, await response.read()
+
+
+class LambdaTransport:
+    """
+    Invokes the backend's Lambda functions directly, skipping API Gateway.
+    Events and responses follow the API Gateway proxy integration format, so the functions can serve both.
+    boto3 is blocking, so invocations run in a bounded thread pool that shares a single, thread-safe boto3 client;
+    its connection pool is sized to match the number of threads.
+    """
+
+    def __init__(
+        self,
+        functions: Mapping[str, str],
+        lambda_client: Any = None,
+        max_workers: int = 8,
+        region_name: str | None = None,
+    ):
+        """
+        :param functions: Maps endpoint names to function names or ARNs, e.g. {"translation": "lingolift-translation"}
+        :param lambda_client: boto3 Lambda client to use, e.g. a stubbed one; created if not provided
+        :param max_workers: Maximum number of concurrent invocations
+        :param region_name: AWS region of the functions, if a client is created
+        """
+        self.functions = dict(functions)
+        self.lambda_client = lambda_client or boto3.client(
+            "lambda",
+            region_name=region_name,
+            config=Config(max_pool_connections=max_workers),
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lambda-transport"
+        )
+
+    async def post(self, endpoint: str, payload: dict[str, Any]) -> tuple[int, bytes]:
+        if endpoint not in self.functions:
+            raise ValueError(f"No Lambda function configured for /{endpoint}")
+        loop = asyncio.get_running_loop()
+        # unlike asyncio.to_thread(), run_in_executor() doesn't propagate context variables, e.g. the current span
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, context.run, self._invoke, endpoint, payload
+        )
+
+    def _invoke(self, endpoint: str, payload: dict[str, Any]) -> tuple[int, bytes]:
+        event = {
+            "httpMethod": "POST",
+            "path": f"/{endpoint}",
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps(payload),
+            "isBase64Encoded": False,
+        }
+        response = self.lambda_client.invoke(
+            FunctionName=self.functions[endpoint],
+            InvocationType="RequestResponse",
+            Payload=json.dumps(event).encode(),
+        )
+        with span("client.decode", endpoint=endpoint):
+            return parse_lambda_response(response, response["Payload"].read())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_lambda_response(response: dict[str, Any], raw: bytes) -> tuple[int, bytes]:
+    """
+    Extracts status code and body from a Lambda invocation.
+    :param response: The response of lambda_client.invoke()
+    :param raw: The raw payload returned by the function
+    :return: The status code and the raw JSON body of the response
+    """
+    result = json.loads(raw or b"null")
+    if "FunctionError" in response:
+        # unhandled errors, e.g. timeouts, are reported as {"errorMessage": ..., "errorType": ...}
+        message = result.get("errorMessage") if isinstance(result, dict) else result
+        return 502, json.dumps(message).encode()
+    if not isinstance(result, dict) or "statusCode" not in result:
+        # functions that return their result directly instead of a proxy response
+        return response.get("StatusCode", 200), raw
+    body = result.get("body")
+    if isinstance(body, str):
+        # proxy responses carry the body as a JSON string; it's validated as is, without parsing it twice
+        return result["statusCode"], body.encode()
+    return result["statusCode"], json.dumps(body).encode()
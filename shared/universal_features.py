@@ -1,43 +1,116 @@
 import json
 import os
+import re
+from functools import cache, lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Sequence
 
+from shared.exception import LanguageNotAvailableException
 
-def load_feature_set() -> dict[str, dict[str, str]]:
+DEFAULT_LANGUAGE = "de"
+FEATURES_DIR = os.path.join(os.path.dirname(__file__), "features")
+FEATURE_FILE_PATTERN = re.compile(r"features_([a-z]{2,3})\.json")
+
+nominal_features = ["Case", "Number", "Gender"]
+verbal_features = ["Person", "Number", "Tense"]
+
+
+@cache
+def available_languages() -> frozenset[str]:
+    """
+    :return: Language codes for which a features/features_<lang>.json file exists
+    """
+    return frozenset(
+        match.group(1)
+        for name in os.listdir(FEATURES_DIR)
+        if (match := FEATURE_FILE_PATTERN.fullmatch(name))
+    )
+
+
+def load_feature_set(
+    language_code: str = DEFAULT_LANGUAGE,
+) -> Mapping[str, Mapping[str, str]]:
     """
-    Loads the feature set for a given language.
+    Loads the feature set for a given language. Feature sets are read from features/features_<lang>.json
+    on first use and kept for the lifetime of the process, so all callers share the same instance.
+    :param language_code: ISO-639-1 language code, e.g. "de"
     :return: The feature set with mappings of Universal Feature tags to legible descriptions.
+    :raises LanguageNotAvailableException: if there is no feature set for the language
     """
-    dirname = os.path.dirname(__file__)
-    feature_set_de = os.path.join(dirname, "features/features_de.json")
-    with open(feature_set_de) as f:
-        return json.load(f)  # type: ignore
+    if language_code not in available_languages():
+        raise LanguageNotAvailableException()
+    return _load_feature_set(language_code)
 
 
-all_features = load_feature_set()
-nominal_features = ["Case", "Number", "Gender"]
-verbal_features = ["Person", "Number", "Tense"]
+@cache
+def _load_feature_set(language_code: str) -> Mapping[str, Mapping[str, str]]:
+    path = os.path.join(FEATURES_DIR, f"features_{language_code}.json")
+    with open(path) as f:
+        features = json.load(f)
+    return MappingProxyType(
+        {feature: MappingProxyType(values) for feature, values in features.items()}
+    )
+
 
+@cache
+def _feature_instances(
+    language_code: str,
+) -> Mapping[str, tuple[str, ...]]:
+    return MappingProxyType(
+        {
+            feature: tuple(values.keys())
+            for feature, values in load_feature_set(language_code).items()
+        }
+    )
 
-def get_all_feature_instances(feature: str) -> list[str]:
+
+def get_all_feature_instances(
+    feature: str, language_code: str = DEFAULT_LANGUAGE
+) -> tuple[str, ...]:
     """
     :param feature: The feature to get all instances for, e.g. "Case"
-    :return: A list of all instances for the given feature, e.g. "Nom", "Acc", "Dat", "Gen"
+    :param language_code: ISO-639-1 language code of the feature set to use
+    :return: All instances for the given feature, e.g. "Nom", "Acc", "Dat", "Gen"
     """
-    return list(all_features.get(feature).keys())  # type: ignore
+    return _feature_instances(language_code)[feature]
 
 
-def convert_to_legible_tags(tags: dict, feature_set: list[str]) -> str:
+def convert_to_legible_tags(
+    tags: Mapping[str, str],
+    feature_set: Sequence[str],
+    language_code: str = DEFAULT_LANGUAGE,
+) -> str:
     """
     Converts the Universal Feature tags to a legible format, e.g. "Case=Nom | Number=Plur | Gender=Masc"
-    to "Nominative Plural Masculine".
+    to "Nominative Plural Masculine". Results are memoised, as the same tags recur for every rendered word.
     :param tags: key-value pairs of Universal Feature tags, e.g. {'Case': 'Nom', 'Number': 'Plur'}
     :param feature_set: The list of features to use, e.g. 'Case', 'Number', 'Gender'
+    :param language_code: ISO-639-1 language code of the feature set to use
     :return:
     """
+    return _convert_to_legible_tags(
+        frozenset(tags.items()), tuple(feature_set), language_code
+    )
+
+
+@lru_cache(maxsize=1024)
+def _convert_to_legible_tags(
+    tags: frozenset[tuple[str, str]], feature_set: tuple[str, ...], language_code: str
+) -> str:
+    all_features = load_feature_set(language_code)
+    tag_values = dict(tags)
     legible_tags = []
     for feature in feature_set:
-        tag_value = tags.get(feature)
+        tag_value = tag_values.get(feature)
         if tag_value:
-            legible_tags.append(all_features.get(feature).get(tag_value))  # type: ignore
+            legible_tag = all_features.get(feature, {}).get(tag_value)
+            if legible_tag is not None:
+                legible_tags.append(legible_tag)
+    return " ".join(legible_tags)
+
 
-    return " ".join(filter(lambda x: x is not None, legible_tags))  # type: ignore
+def __getattr__(name: str) -> Any:
+    # all_features used to be loaded eagerly at import time; it is kept as a lazy alias for the default language
+    if name == "all_features":
+        return load_feature_set(DEFAULT_LANGUAGE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
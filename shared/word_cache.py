@@ -0,0 +1,162 @@
+import re
+from typing import Mapping
+
+from shared.cache import CacheStats, LRUCache
+from shared.model.literal_translation import LiteralTranslation
+
+# words as the backend translates them: punctuation is dropped, hyphenated words and contractions are kept whole
+WORD_PATTERN = re.compile(r"\w+(?:[-'’]\w+)*")
+
+WordKey = tuple[str, str, str | None]
+# the literal translations of one word of a sentence: usually one, several if the backend splits the word,
+# e.g. the contraction "zum" into "zu" and "dem"
+WordTranslations = tuple[LiteralTranslation, ...]
+
+
+def split_words(sentence: str) -> list[str]:
+    return WORD_PATTERN.findall(sentence)
+
+
+class WordTranslationCache:
+    """
+    Caches literal translations per word, so that only the words of a sentence that haven't been translated
+    before need to be sent to the backend.
+    Entries are keyed by (word, language code) and, if by_lemma is set, by the word's lemma, which separates
+    homographs such as "sein" (to be / his) at the cost of a lower hit rate and requiring a syntactical analysis.
+    Words are case-sensitive, as capitalisation carries meaning in German ("Essen" / "essen").
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        default_language_code: str | None = None,
+        by_lemma: bool = False,
+    ):
+        """
+        :param maxsize: Maximum number of cached words
+        :param default_language_code: Language assumed if a request doesn't specify one. If None, sentences of
+        unknown language bypass the cache.
+        :param by_lemma: Whether to include the lemma in the key
+        """
+        self.default_language_code = default_language_code
+        self.by_lemma = by_lemma
+        self._cache = LRUCache[WordKey, WordTranslations](maxsize=maxsize)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _key(
+        self, word: str, language_code: str, lemmas: Mapping[str, str] | None
+    ) -> WordKey:
+        lemma = lemmas.get(word) if self.by_lemma and lemmas else None
+        return word, language_code, lemma
+
+    def lookup(
+        self,
+        words: list[str],
+        language_code: str,
+        lemmas: Mapping[str, str] | None = None,
+    ) -> list[WordTranslations | None]:
+        """
+        :param words: Words of a sentence, see split_words()
+        :param language_code: ISO-639-1 code of the sentence's language
+        :param lemmas: Lemmas by word, e.g. from a syntactical analysis; only used if by_lemma is set
+        :return: The cached translations of each word, or None if it is unknown
+        """
+        return [
+            self._cache.get(self._key(word, language_code, lemmas)) for word in words
+        ]
+
+    def store(
+        self,
+        assigned: list[tuple[str | None, WordTranslations]],
+        language_code: str,
+        lemmas: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        :param assigned: Translations by word of the sentence, see assign(); translations that couldn't be
+        attributed to a word are not stored
+        """
+        for word, translations in assigned:
+            if word is not None and translations:
+                self._cache.put(self._key(word, language_code, lemmas), translations)
+
+
+def assign(
+    words: list[str],
+    known: list[WordTranslations | None],
+    fetched: list[LiteralTranslation],
+) -> list[tuple[str | None, WordTranslations]]:
+    """
+    Attributes freshly fetched literal translations to the words that weren't known, in sentence order.
+    A fetched translation belongs to the next missing word it matches (ignoring case). The backend may split words
+    differently than split_words(), e.g. contractions like "zum" into "zu" and "dem": a translation that matches
+    no word but starts with the same letter as the next missing word starts that word's parts, which continue
+    until the next match. Other translations can't be attributed and are kept after the preceding word.
+    :param words: Words of the sentence
+    :param known: Result of WordTranslationCache.lookup() for the words, or None per word
+    :param fetched: Backend response for the missing words, in order
+    :return: (word, translations) pairs in sentence order; the word is None for translations that couldn't be
+    attributed to one
+    """
+    missing = [
+        index for index, translations in enumerate(known) if translations is None
+    ]
+    parts: dict[int, list[LiteralTranslation]] = {index: [] for index in missing}
+    unattributed: dict[int, list[LiteralTranslation]] = {}  # by preceding word index
+    position = 0  # offset in missing of the next word without translations
+    split: int | None = None  # word whose parts are being collected
+    for translation in fetched:
+        match = next(
+            (
+                offset
+                for offset in range(position, len(missing))
+                if words[missing[offset]].lower() == translation.word.lower()
+            ),
+            None,
+        )
+        if match is not None:
+            parts[missing[match]].append(translation)
+            position, split = match + 1, None
+        elif split is not None:
+            parts[split].append(translation)
+        elif (
+            position < len(missing)
+            and words[missing[position]][:1].lower() == translation.word[:1].lower()
+        ):
+            split = missing[position]
+            parts[split].append(translation)
+            position += 1
+        else:
+            preceding = missing[position - 1] if position else -1
+            unattributed.setdefault(preceding, []).append(translation)
+
+    result: list[tuple[str | None, WordTranslations]] = []
+    if -1 in unattributed:
+        result.append((None, tuple(unattributed[-1])))
+    for index, (word, translations) in enumerate(zip(words, known)):
+        result.append(
+            (word, translations if translations is not None else tuple(parts[index]))
+        )
+        if index in unattributed:
+            result.append((None, tuple(unattributed[index])))
+    return result
+
+
+def merge(
+    words: list[str],
+    known: list[WordTranslations | None],
+    fetched: list[LiteralTranslation],
+) -> list[LiteralTranslation]:
+    """
+    Combines known and freshly fetched literal translations in sentence order, see assign().
+    """
+    return [
+        translation
+        for _, translations in assign(words, known, fetched)
+        for translation in translations
+    ]
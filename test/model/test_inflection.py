@@ -0,0 +1,62 @@
+import pytest
+
+from shared.model.inflection import Inflection, Inflections
+from shared.model.syntactical_analysis import PartOfSpeech
+
+
+@pytest.fixture
+def inflections() -> Inflections:
+    forms = {
+        ("Nom", "Sing"): "Tisch",
+        ("Gen", "Sing"): "Tisches",
+        ("Dat", "Sing"): "Tisch",
+        ("Acc", "Sing"): "Tisch",
+        ("Nom", "Plur"): "Tische",
+        ("Gen", "Plur"): "Tische",
+        ("Dat", "Plur"): "Tischen",
+        ("Acc", "Plur"): "Tische",
+    }
+    return Inflections(
+        pos=PartOfSpeech(value="NOUN", explanation="Noun"),
+        gender="Masc",
+        inflections=[
+            Inflection(word=word, morphology={"Case": case, "Number": number})
+            for (case, number), word in forms.items()
+        ],
+    )
+
+
+def test_find_by_morphology(inflections):
+    assert inflections.get(Case="Dat", Number="Plur").word == "Tischen"
+    # the order of the features does not matter
+    assert inflections.get(Number="Plur", Case="Dat").word == "Tischen"
+    assert inflections.get(Case="Voc", Number="Plur") is None
+
+
+def test_find_by_partial_morphology(inflections):
+    assert [i.word for i in inflections.find(Number="Plur")] == [
+        "Tische",
+        "Tische",
+        "Tischen",
+        "Tische",
+    ]
+    assert inflections.find(Tense="Pres") == []
+
+
+def test_reverse_lookup(inflections):
+    assert [i.morphology["Case"] for i in inflections.forms("Tische")] == [
+        "Nom",
+        "Gen",
+        "Acc",
+    ]
+    assert inflections.forms("Stuhl") == []
+
+
+def test_feature_values_keep_order_of_appearance(inflections):
+    assert inflections.feature_values("Case") == ["Nom", "Gen", "Dat", "Acc"]
+    assert inflections.feature_values("Number") == ["Sing", "Plur"]
+
+
+def test_indices_are_not_serialized(inflections):
+    inflections.get(Case="Nom", Number="Sing")
+    assert set(inflections.model_dump().keys()) == {"pos", "gender", "inflections"}
@@ -0,0 +1,131 @@
+import timeit
+
+import pytest
+
+from shared.model.response_suggestion import (
+    question_confidence,
+    question_confidence_bounds,
+    should_generate_response_suggestions,
+)
+from shared.model.token.feature import (
+    Case,
+    Gender,
+    NounFeatureSet,
+    Number,
+    Person,
+    Tense,
+    VerbFeatureSet,
+)
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+
+FINITE = VerbFeatureSet(person=Person.SECOND, number=Number.SING, tense=Tense.PRES)
+
+
+def tokenize(annotated: str) -> list[Token]:
+    """
+    Builds tokens from a compact notation: "word/UPOS", where a trailing "+" marks a finite verb
+    and ":NOM", ":ACC" or ":DAT" the case of a pronoun, e.g. "Kommst/VERB+ du/PRON:NOM ?/PUNCT".
+    """
+    tokens = []
+    for annotation in annotated.split():
+        text, tag = annotation.rsplit("/", 1)
+        feature_set = None
+        if tag.endswith("+"):
+            tag, feature_set = tag[:-1], FINITE
+        elif ":" in tag:
+            tag, case = tag.split(":")
+            feature_set = NounFeatureSet(
+                case=Case[case], number=Number.SING, gender=Gender.MASC
+            )
+        tokens.append(
+            Token(text=text, lemma=text, upos=UPOS[tag], feature_set=feature_set)
+        )
+    return tokens
+
+
+# (annotated sentence, is_question)
+LABELLED_SENTENCES = [
+    # questions with question mark
+    ("Wo/ADV ist/AUX+ der/DET Bahnhof/NOUN ?/PUNCT", True),
+    ("Wie/ADV viel/ADV kostet/VERB+ ein/DET Bier/NOUN ?/PUNCT", True),
+    ("Kommst/VERB+ du/PRON:NOM morgen/ADV ?/PUNCT", True),
+    ("Mit/ADP wem/PRON:DAT sprichst/VERB+ du/PRON:NOM ?/PUNCT", True),
+    ("Du/PRON:NOM kommst/VERB+ morgen/ADV ?/PUNCT", True),
+    ("Welches/DET Buch/NOUN liest/VERB+ du/PRON:NOM ?/PUNCT", True),
+    ("Hast/AUX+ du/PRON:NOM Hunger/NOUN ?/PUNCT", True),
+    # questions typed without question mark
+    ("Wo/ADV ist/AUX+ der/DET Bahnhof/NOUN", True),
+    ("Kommst/VERB+ du/PRON:NOM morgen/ADV", True),
+    ("Warum/ADV lernst/VERB+ du/PRON:NOM Deutsch/PROPN", True),
+    ("Seit/ADP wann/ADV wohnst/VERB+ du/PRON:NOM hier/ADV", True),
+    ("Hast/AUX+ du/PRON:NOM Zeit/NOUN", True),
+    # statements
+    ("Der/DET Bahnhof/NOUN ist/AUX+ dort/ADV ./PUNCT", False),
+    ("Ich/PRON:NOM trinke/VERB+ ein/DET Bier/NOUN", False),
+    ("Das/PRON:NOM ist/AUX+ gut/ADJ !/PUNCT", False),
+    ("Was/PRON:NOM ich/PRON:NOM meine/VERB+ ,/PUNCT ist/AUX+ klar/ADJ ./PUNCT", False),
+    ("Wie/ADV schön/ADJ das/PRON:NOM ist/AUX+ !/PUNCT", False),
+    (
+        'Er/PRON:NOM fragte/VERB+ :/PUNCT "/PUNCT Kommst/VERB+ du/PRON:NOM ?/PUNCT "/PUNCT',
+        False,
+    ),
+    # imperatives are verb-first, but not questions
+    ("Gib/VERB mir/PRON:DAT das/DET Buch/NOUN !/PUNCT", False),
+    ("Sag/VERB mir/PRON:DAT Bescheid/NOUN", False),
+    ("Gehen/VERB+ wir/PRON:NOM !/PUNCT", False),
+]
+
+
+@pytest.mark.parametrize("annotated, is_question", LABELLED_SENTENCES)
+def test_labelled_sentences(annotated, is_question):
+    tokens = tokenize(annotated)
+    sentence = " ".join(token.text for token in tokens)
+    assert should_generate_response_suggestions(sentence, tokens) is is_question
+
+
+@pytest.mark.parametrize("annotated, is_question", LABELLED_SENTENCES)
+def test_raw_bounds_contain_the_confidence(annotated, is_question):
+    tokens = tokenize(annotated)
+    low, high = question_confidence_bounds(" ".join(token.text for token in tokens))
+    assert low <= question_confidence(tokens) <= high
+
+
+@pytest.mark.parametrize(
+    "sentence, bounds",
+    [
+        ("Wo ist der Bahnhof?", (0.95, 1.0)),
+        ("Der Bahnhof ist dort.", (0.0, 0.35)),
+        ("Wo ist der Bahnhof", (0.45, 0.65)),
+        ('Er fragte: "Kommst du?"', (0.0, 1.0)),
+    ],
+)
+def test_raw_bounds(sentence, bounds):
+    assert question_confidence_bounds(sentence) == pytest.approx(bounds)
+
+
+def test_confidence_is_bounded():
+    assert question_confidence([]) == 0.0
+    assert question_confidence(tokenize("!/PUNCT")) == 0.0
+    assert question_confidence(tokenize("Wo/ADV ist/AUX+ er/PRON:NOM ?/PUNCT")) == 1.0
+
+
+def test_threshold_is_configurable():
+    tokens = tokenize("Du/PRON:NOM kommst/VERB+ morgen/ADV ?/PUNCT")
+    assert should_generate_response_suggestions("", tokens, threshold=0.5)
+    assert not should_generate_response_suggestions("", tokens, threshold=0.8)
+
+
+def test_falls_back_to_question_mark_without_tokens():
+    assert should_generate_response_suggestions("Wie geht's?")
+    assert not should_generate_response_suggestions("Wie geht's")
+
+
+def test_classification_runs_in_microseconds():
+    tokens = tokenize(
+        "Mit/ADP wem/PRON:DAT sprichst/VERB+ du/PRON:NOM heute/ADV ?/PUNCT"
+    )
+    seconds = min(
+        timeit.repeat(lambda: question_confidence(tokens), number=1000, repeat=3)
+    )
+    assert seconds / 1000 < 50e-6
@@ -57,3 +57,9 @@ def test_token_json_serialization(complete_token):
             },
         }.items()
     )
+
+
+def test_token_deserialization_round_trip(complete_token):
+    token = Token(**complete_token.dict())
+    assert token == complete_token
+    assert type(token.feature_set) is NounFeatureSet
@@ -1,5 +1,6 @@
 import pytest
-import spacy
+
+spacy = pytest.importorskip("spacy")
 
 from shared.model.token.feature import (
     Case,
@@ -12,11 +13,16 @@ from shared.model.token.feature import (
 )
 from shared.model.token.mapper import from_spacy_doc, from_spacy_token
 from shared.model.token.token import UPOS
+from shared.nlp import get_model
+
+MODEL = "de_core_news_sm"
 
 
 @pytest.fixture
 def nlp():
-    return spacy.load("de_core_news_sm")
+    if not spacy.util.is_package(MODEL):
+        pytest.skip(f"{MODEL} is not installed")
+    return get_model(MODEL)
 
 
 def test_upos_parsing(nlp):
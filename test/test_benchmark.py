@@ -0,0 +1,23 @@
+from benchmark.runner import Benchmark, Result, compare, measure
+
+
+def result(name: str, median: float) -> Result:
+    return Result(name=name, calls=1, median=median, mean=median, min=median, stdev=0)
+
+
+def test_measure_reports_per_call_timings():
+    outcome = measure(Benchmark("noop", lambda: None), min_time=0.001, repeat=2)
+    assert outcome.name == "noop"
+    assert outcome.calls >= 1
+    assert 0 < outcome.min <= outcome.median
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}}
+    regressions = compare(
+        [result("fast", 1.1), result("slow", 1.5), result("new", 10)],
+        baseline,
+        tolerance=0.25,
+    )
+    assert [r.name for r in regressions] == ["slow"]
+    assert regressions[0].slowdown == 0.5
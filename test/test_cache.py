@@ -0,0 +1,62 @@
+from shared.cache import LRUCache, content_key
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.token.feature import Case, Gender, NounFeatureSet, Number
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache[str, int](maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache[str, int](maxsize=2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_lru_cache_expires_entries():
+    now = [0.0]
+    cache = LRUCache[str, int](maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    now[0] = 9.9
+    assert cache.get("a") == 1
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_content_key_is_stable_and_content_based():
+    first = [LiteralTranslation(word="ein", translation="a")]
+    second = [LiteralTranslation(word="ein", translation="a")]
+    assert content_key(first) == content_key(second)
+    assert content_key(first) != content_key(
+        [LiteralTranslation(word="ein", translation="one")]
+    )
+
+
+def test_content_key_distinguishes_feature_sets():
+    def token(case: Case) -> Token:
+        return Token(
+            text="Tisch",
+            lemma="Tisch",
+            upos=UPOS.NOUN,
+            feature_set=NounFeatureSet(
+                case=case, number=Number.SING, gender=Gender.MASC
+            ),
+        )
+
+    assert content_key([token(Case.NOM)]) != content_key([token(Case.ACC)])
@@ -1,12 +1,22 @@
+import asyncio
 import json
 
+import aiohttp
 import pytest
 from aioresponses import aioresponses
 
+from shared.cache import LRUCache
 from shared.client import Client
-from shared.exception import ApplicationException
-from shared.model.syntactical_analysis import PartOfSpeech, SyntacticalAnalysis
+from shared.exception import (
+    ApplicationException,
+    LanguageNotAvailableException,
+    RequestShedException,
+)
+from shared.model.token.feature import Case, Gender, NounFeatureSet, Number
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
 from shared.model.translation import Translation
+from shared.scheduler import Priority, Scheduler, request_priority
 
 client = Client("")
 
@@ -80,27 +90,22 @@ async def test_syntactical_analysis_happy_path(mocked):
         status=200,
         body=json.dumps(
             [
-                SyntacticalAnalysis(
-                    word="word",
-                    lemma="lemma",
-                    pos=PartOfSpeech(value="DET", explanation="determiner"),
-                    morphology=None,
-                    dependency=None,
-                ).model_dump(),
-                SyntacticalAnalysis(
-                    word="word",
-                    lemma=None,
-                    pos=PartOfSpeech(value="NOUN", explanation="noun"),
-                    morphology=None,
-                    dependency="word",
-                ).model_dump(),
+                Token(text="der", lemma="der", upos=UPOS.DET).dict(),
+                Token(
+                    text="Tisch",
+                    lemma="Tisch",
+                    upos=UPOS.NOUN,
+                    feature_set=NounFeatureSet(
+                        case=Case.NOM, number=Number.SING, gender=Gender.MASC
+                    ),
+                ).dict(),
             ]
         ),
     )
     analyses = await client.fetch_syntactical_analysis("some sentence")
     assert isinstance(analyses, list)
     assert len(analyses) == 2
-    assert isinstance(analyses[1], SyntacticalAnalysis)
+    assert isinstance(analyses[1], Token)
 
 
 @pytest.mark.asyncio
@@ -139,3 +144,212 @@ async def test_syntactical_analysis_expected_error(mocked):
     with pytest.raises(ApplicationException) as e:
         await client.fetch_syntactical_analysis("some sentence")
         assert e.value.error_message == "Language not available"
+
+
+@pytest.mark.asyncio
+async def test_cached_client_serves_repeated_requests_from_cache(mocked):
+    cached_client = Client("", cache=LRUCache(maxsize=4))
+    mocked.post(
+        f"{cached_client.host}/translation",
+        status=200,
+        body=json.dumps(
+            {
+                "translation": "translation",
+                "language_name": "german",
+                "language_code": "de",
+            }
+        ),
+    )
+
+    first = await cached_client.fetch_translation("some sentence")
+    second = await cached_client.fetch_translation("some sentence")
+
+    assert first is second
+    assert cached_client.cache.stats.hits == 1
+    assert sum(len(calls) for calls in mocked.requests.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_client_does_not_cache_errors(mocked):
+    cached_client = Client("", cache=LRUCache(maxsize=4))
+    for _ in range(2):
+        mocked.post(
+            f"{cached_client.host}/translation",
+            status=400,
+            body=json.dumps({"error_message": "error"}),
+        )
+
+    for _ in range(2):
+        with pytest.raises(ApplicationException):
+            await cached_client.fetch_translation("some sentence")
+
+    assert len(cached_client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_non_json_error_body(mocked):
+    mocked.post(f"{client.host}/translation", status=502, body="Bad Gateway")
+
+    with pytest.raises(ApplicationException) as e:
+        await client.fetch_translation("some sentence")
+
+    assert e.value.error_message == "Bad Gateway"
+
+
+@pytest.mark.asyncio
+async def test_error_code_maps_to_exception_type(mocked):
+    mocked.post(
+        f"{client.host}/syntactical-analysis",
+        status=400,
+        body=json.dumps(LanguageNotAvailableException().dict()),
+    )
+
+    with pytest.raises(LanguageNotAvailableException):
+        await client.fetch_syntactical_analysis("Bonjour")
+
+
+@pytest.mark.asyncio
+async def test_error_cache_serves_repeated_errors(mocked):
+    now = [0.0]
+    error_client = Client(
+        "",
+        cache=LRUCache(maxsize=4),
+        error_cache=LRUCache(maxsize=4, ttl=60, clock=lambda: now[0]),
+    )
+    for _ in range(2):
+        mocked.post(
+            f"{error_client.host}/syntactical-analysis",
+            status=400,
+            body=json.dumps(LanguageNotAvailableException().dict()),
+        )
+
+    for _ in range(3):
+        with pytest.raises(LanguageNotAvailableException):
+            await error_client.fetch_syntactical_analysis("Bonjour")
+    assert sum(len(calls) for calls in mocked.requests.values()) == 1
+    assert error_client.error_cache.stats.hits == 2
+    assert len(error_client.cache) == 0
+
+    now[0] = 61.0
+    with pytest.raises(LanguageNotAvailableException):
+        await error_client.fetch_syntactical_analysis("Bonjour")
+    assert sum(len(calls) for calls in mocked.requests.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_error_cache_ignores_unexpected_errors(mocked):
+    error_client = Client("", error_cache=LRUCache(maxsize=4, ttl=60))
+    mocked.post(f"{error_client.host}/translation", status=502, body="Bad Gateway")
+
+    with pytest.raises(ApplicationException):
+        await error_client.fetch_translation("some sentence")
+
+    assert len(error_client.error_cache) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error_data",
+    [
+        RequestShedException().dict(),
+        {"error_code": "unknown_error", "error_message": "Something went wrong."},
+        {"error_message": "Something went wrong."},
+    ],
+)
+async def test_error_cache_ignores_transient_errors(mocked, error_data):
+    error_client = Client("", error_cache=LRUCache(maxsize=4, ttl=60))
+    mocked.post(
+        f"{error_client.host}/translation", status=400, body=json.dumps(error_data)
+    )
+
+    with pytest.raises(ApplicationException):
+        await error_client.fetch_translation("some sentence")
+
+    assert len(error_client.error_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_handle_failure_accepts_aiohttp_responses(mocked):
+    mocked.post(
+        "http://backend/translation",
+        status=400,
+        body=json.dumps(LanguageNotAvailableException().dict()),
+    )
+    async with aiohttp.ClientSession() as session:
+        async with session.post("http://backend/translation") as response:
+            with pytest.raises(LanguageNotAvailableException):
+                await Client.handle_failure("translation", response)
+
+
+class GatedClient(Client):
+    """
+    Holds every backend request until released, counting the requests that reach the backend.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__("", cache=LRUCache(maxsize=4), **kwargs)
+        self.release = asyncio.Event()
+        self.sent = 0
+
+    async def _post(self, endpoint, payload):
+        self.sent += 1
+        await self.release.wait()
+        body = {"translation": "hi", "language_name": "German", "language_code": "de"}
+        return 200, json.dumps(body).encode()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_cancel_joiners():
+    gated = GatedClient()
+    owner = asyncio.create_task(gated.fetch_translation("Hallo"))
+    await asyncio.sleep(0)
+    joiner = asyncio.create_task(gated.fetch_translation("Hallo"))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    await asyncio.sleep(0)
+    gated.release.set()
+
+    assert (await joiner).translation == "hi"
+    assert owner.cancelled()
+    assert gated.sent == 1
+    assert gated.is_cached("translation", {"sentence": "Hallo"})
+
+
+@pytest.mark.asyncio
+async def test_request_is_cancelled_once_all_callers_are_gone():
+    gated = GatedClient()
+    callers = [asyncio.create_task(gated.fetch_translation("Hallo")) for _ in range(2)]
+    await asyncio.sleep(0)
+    (shared,) = gated._in_flight.values()
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert shared.task.cancelled()
+    assert not gated.is_cached("translation", {"sentence": "Hallo"})
+
+
+@pytest.mark.asyncio
+async def test_joining_a_background_request_promotes_it():
+    scheduler = Scheduler(max_in_flight=1, max_queue_times={Priority.BACKGROUND: 0.05})
+    gated = GatedClient(scheduler=scheduler)
+    blocker = asyncio.create_task(gated.fetch_translation("blocker"))
+    await asyncio.sleep(0)
+    with request_priority(Priority.BACKGROUND):
+        owner = asyncio.create_task(gated.fetch_translation("k"))
+    await asyncio.sleep(0)
+    joiners = [asyncio.create_task(gated.fetch_translation("k")) for _ in range(2)]
+    # past the maximum queue time of background requests
+    await asyncio.sleep(0.1)
+
+    gated.release.set()
+    results = await asyncio.gather(blocker, owner, *joiners)
+
+    assert all(result.translation == "hi" for result in results)
+    assert gated.sent == 2
+    assert scheduler.stats[Priority.BACKGROUND].promoted == 1
+    assert scheduler.stats[Priority.BACKGROUND].shed == 0
+    assert not gated._in_flight
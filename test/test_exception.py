@@ -0,0 +1,50 @@
+import pytest
+
+from shared.exception import (
+    ApplicationException,
+    LanguageNotIdentifiedException,
+    SentenceTooLongException,
+)
+
+
+def test_round_trip():
+    exception = ApplicationException.from_dict(SentenceTooLongException().dict())
+    assert isinstance(exception, SentenceTooLongException)
+    assert exception.error_message == SentenceTooLongException().error_message
+
+
+def test_payloads_with_error_code_build_generic_exceptions():
+    # the way clients rebuilt exceptions before error codes were introduced
+    exception = ApplicationException(**SentenceTooLongException().dict())
+    assert exception.error_message == SentenceTooLongException().error_message
+
+
+def test_payload_without_error_code():
+    assert SentenceTooLongException().dict(error_code=False) == {
+        "error_message": SentenceTooLongException().error_message
+    }
+
+
+def test_unknown_error_code():
+    exception = ApplicationException.from_dict(
+        {"error_code": "unknown", "error_message": "Something new went wrong."}
+    )
+    assert type(exception) is ApplicationException
+    assert exception.error_message == "Something new went wrong."
+
+
+def test_missing_error_code():
+    exception = ApplicationException.from_dict({"error_message": "Old backend."})
+    assert type(exception) is ApplicationException
+    assert exception.error_message == "Old backend."
+
+
+def test_non_dict_error_data():
+    assert ApplicationException.from_dict("Bad Gateway").error_message == "Bad Gateway"
+
+
+def test_duplicate_error_code():
+    with pytest.raises(TypeError):
+
+        class DuplicateException(ApplicationException):
+            error_code = LanguageNotIdentifiedException.error_code
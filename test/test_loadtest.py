@@ -0,0 +1,72 @@
+import random
+
+import pytest
+import pytest_asyncio
+
+from shared.client import Client
+from shared.loadtest.driver import percentile, run_load
+from shared.loadtest.stub import Behaviour, Latency, StubBackend, parse_latency, start
+
+
+def test_parse_latency():
+    assert parse_latency("50") == Latency("constant", (50.0,))
+    assert parse_latency("lognormal:120,0.5") == Latency("lognormal", (120.0, 0.5))
+    with pytest.raises(ValueError):
+        parse_latency("normal:50")
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1,2")
+
+
+def test_latency_samples_in_seconds():
+    rng = random.Random(0)
+    assert Latency("constant", (250.0,)).sample(rng) == 0.25
+    samples = [Latency("uniform", (10.0, 20.0)).sample(rng) for _ in range(100)]
+    assert all(0.01 <= sample <= 0.02 for sample in samples)
+    assert Latency("normal", (0.0, 100.0)).sample(random.Random(1)) >= 0
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 95) == 3
+
+
+@pytest_asyncio.fixture
+async def stub_url():
+    backend = StubBackend(
+        {"translation": Behaviour(error_rate=1.0)},
+        seed=0,
+    )
+    runner, url = await start(backend)
+    yield url
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_closed_loop_run_against_stub(stub_url):
+    report = await run_load(
+        Client(stub_url),
+        ["Wo ist der Bahnhof?"],
+        ["translation", "literal-translation", "syntactical-analysis", "inflection"],
+        requests=20,
+        concurrency=4,
+    )
+    assert report.requests == 20
+    # every translation request fails
+    assert sum(report.errors.values()) == 5
+    assert report.to_dict()["p99_ms"] >= report.to_dict()["p50_ms"]
+    assert "req/s" in report.format()
+
+
+@pytest.mark.asyncio
+async def test_open_loop_run_against_stub(stub_url):
+    report = await run_load(
+        Client(stub_url),
+        ["Wo ist der Bahnhof?"],
+        ["response-suggestion"],
+        duration=0.2,
+        rate=50,
+    )
+    assert 8 <= report.requests <= 10
+    assert not report.errors
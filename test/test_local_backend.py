@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from shared.exception import ApplicationException, LanguageNotAvailableException
+from shared.local_backend import LocalAnalysisBackend
+from shared.model.token.upos import UPOS
+
+
+def tagging_pipeline():
+    """
+    A blank German pipeline that tags every token as a noun, so the tests don't depend on a trained model.
+    """
+    nlp = spacy.blank("de")
+    ruler = nlp.add_pipe("attribute_ruler")
+    ruler.add(patterns=[[{}]], attrs={"POS": "NOUN", "MORPH": "Case=Nom"})
+    return nlp
+
+
+def failing_pipeline():
+    raise OSError("model not found")
+
+
+@pytest.fixture
+def backend():
+    backend = LocalAnalysisBackend(
+        tagging_pipeline, max_workers=1, executor_type=ThreadPoolExecutor
+    )
+    yield backend
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_local_backend_analyses_sentence(backend):
+    tokens = await backend.fetch_syntactical_analysis("Tisch und Stuhl")
+    assert [token.text for token in tokens] == ["Tisch", "und", "Stuhl"]
+    assert all(token.upos == UPOS.NOUN for token in tokens)
+
+
+@pytest.mark.asyncio
+async def test_local_backend_batches_concurrent_requests(backend, monkeypatch):
+    batches = []
+    submit = backend._executor.submit
+
+    def recording_submit(function, sentences):
+        batches.append(sentences)
+        return submit(function, sentences)
+
+    monkeypatch.setattr(backend._executor, "submit", recording_submit)
+    backend.max_batch_size = 3
+    sentences = ["Eins", "Zwei", "Drei", "Vier"]
+
+    results = await asyncio.gather(
+        *(backend.fetch_syntactical_analysis(sentence) for sentence in sentences)
+    )
+
+    assert [tokens[0].text for tokens in results] == sentences
+    assert batches == [["Eins", "Zwei", "Drei"], ["Vier"]]
+
+
+@pytest.mark.asyncio
+async def test_local_backend_rejects_other_languages(backend):
+    with pytest.raises(LanguageNotAvailableException):
+        await backend.fetch_syntactical_analysis("Where is it?", language_code="en")
+
+
+@pytest.mark.asyncio
+async def test_local_backend_wraps_worker_errors():
+    backend = LocalAnalysisBackend(
+        failing_pipeline, max_workers=1, executor_type=ThreadPoolExecutor
+    )
+    for _ in range(2):
+        with pytest.raises(ApplicationException):
+            await backend.fetch_syntactical_analysis("Tisch")
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_local_backend_in_process_pool():
+    async with LocalAnalysisBackend(tagging_pipeline, max_workers=1) as backend:
+        tokens = await backend.fetch_syntactical_analysis("Der Tisch")
+    assert [token.text for token in tokens] == ["Der", "Tisch"]
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from shared.nlp import ModelManager, unused_components
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    # a blank pipeline, so the tests don't depend on an installed model package
+    nlp = spacy.blank("de")
+    nlp.add_pipe("attribute_ruler")
+    nlp.add_pipe("ner")
+    nlp.initialize()
+    path = tmp_path_factory.mktemp("model") / "de_test"
+    nlp.to_disk(path)
+    return path
+
+
+def test_unused_components(model_path):
+    assert unused_components(model_path, frozenset({"attribute_ruler"})) == ["ner"]
+    assert unused_components(model_path, frozenset({"attribute_ruler", "ner"})) == []
+
+
+def test_unused_components_unknown_model():
+    assert unused_components("xx_not_installed", frozenset()) == []
+
+
+def test_excludes_unused_components(model_path):
+    nlp = ModelManager().get(model_path)
+    assert nlp.pipe_names == ["attribute_ruler"]
+    assert [token.text for token in nlp("Wo ist der Bahnhof?")] == [
+        "Wo",
+        "ist",
+        "der",
+        "Bahnhof",
+        "?",
+    ]
+
+
+def test_loads_once(model_path, monkeypatch):
+    manager = ModelManager(warm_up=False)
+    loads = []
+    load = manager._load
+    monkeypatch.setattr(manager, "_load", lambda name: loads.append(name) or load(name))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda _: manager.get(model_path), range(16)))
+
+    assert len(loads) == 1
+    assert all(model is models[0] for model in models)
+    assert manager.get(str(model_path)) is models[0]
+
+
+def test_clear(model_path):
+    manager = ModelManager(warm_up=False)
+    model = manager.get(model_path)
+    manager.clear()
+    assert manager.get(model_path) is not model
@@ -0,0 +1,190 @@
+import asyncio
+import re
+
+import aiohttp
+import pytest
+
+from shared.client import Client
+from shared.exception import ApplicationException
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.response_suggestion import ResponseSuggestion
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.model.translation import Translation
+from shared.pipeline import BACKEND_UNREACHABLE_MESSAGE, Section, render_progressively
+from shared.rendering import MarkupLanguage, Stringifier
+
+STUB_UPOS = {"ist": UPOS.AUX, "fragte": UPOS.VERB, "Er": UPOS.PRON}
+
+
+class StubClient(Client):
+    """
+    Serves canned responses after configurable delays, so the order of completion can be controlled.
+    """
+
+    def __init__(
+        self,
+        delays: dict[str, float],
+        failing: set[str] | None = None,
+        unreachable: set[str] | None = None,
+    ):
+        super().__init__("")
+        self.delays = delays
+        self.failing = failing or set()
+        self.unreachable = unreachable or set()
+        self.cancelled: set[str] = set()
+
+    async def respond(self, endpoint: str, response):
+        try:
+            await asyncio.sleep(self.delays.get(endpoint, 0))
+        except asyncio.CancelledError:
+            self.cancelled.add(endpoint)
+            raise
+        if endpoint in self.failing:
+            raise ApplicationException(error_message=f"{endpoint} failed")
+        if endpoint in self.unreachable:
+            raise aiohttp.ClientConnectionError(f"{endpoint} unreachable")
+        return response
+
+    async def fetch_translation(self, sentence):
+        return await self.respond(
+            "translation",
+            Translation(
+                translation="Where is the station?",
+                language_name="German",
+                language_code="de",
+            ),
+        )
+
+    async def fetch_literal_translations(self, sentence):
+        return await self.respond(
+            "literal-translation",
+            [LiteralTranslation(word="Bahnhof", translation="station")],
+        )
+
+    async def fetch_syntactical_analysis(self, sentence, language_code=None):
+        return await self.respond(
+            "syntactical-analysis",
+            [
+                Token(
+                    text=word,
+                    lemma=word,
+                    upos=STUB_UPOS.get(
+                        word, UPOS.NOUN if word.isalpha() else UPOS.PUNCT
+                    ),
+                )
+                for word in re.findall(r"\w+|[^\w\s]", sentence)
+            ],
+        )
+
+    async def fetch_response_suggestions(self, sentence):
+        return await self.respond(
+            "response-suggestion",
+            [ResponseSuggestion(suggestion="Dort drüben.", translation="Over there.")],
+        )
+
+
+stringifier = Stringifier(MarkupLanguage.MARKDOWN)
+
+
+async def collect(client, sentence, **kwargs):
+    return [
+        section
+        async for section in render_progressively(
+            client, stringifier, sentence, **kwargs
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sections_are_yielded_as_they_complete():
+    client = StubClient(
+        {
+            "translation": 0.05,
+            "literal-translation": 0.01,
+            "syntactical-analysis": 0.01,
+            "response-suggestion": 0.03,
+        }
+    )
+    sections = await collect(client, "Wo ist der Bahnhof?")
+    assert [s.section for s in sections] == [
+        Section.BREAKDOWN,
+        Section.SUGGESTIONS,
+        Section.TRANSLATION,
+    ]
+    assert "Where is the station?" in sections[2].text
+    assert "**Bahnhof**: station; Noun" in sections[0].text
+
+
+@pytest.mark.asyncio
+async def test_sections_can_be_yielded_in_order():
+    client = StubClient({"translation": 0.02})
+    sections = await collect(client, "Wo ist der Bahnhof?", ordered=True)
+    assert [s.section for s in sections] == [
+        Section.TRANSLATION,
+        Section.BREAKDOWN,
+        Section.SUGGESTIONS,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_suggestions_are_skipped_for_statements():
+    sections = await collect(StubClient({}), "Der Bahnhof ist dort.")
+    assert Section.SUGGESTIONS not in [s.section for s in sections]
+
+
+@pytest.mark.asyncio
+async def test_suggestions_are_requested_for_questions_without_question_mark():
+    sections = await collect(StubClient({}), "Wo ist der Bahnhof")
+    assert Section.SUGGESTIONS in [s.section for s in sections]
+
+
+@pytest.mark.asyncio
+async def test_clear_questions_do_not_wait_for_the_analysis():
+    client = StubClient({"syntactical-analysis": 0.2})
+    stream = render_progressively(client, stringifier, "Wo ist der Bahnhof?")
+    first = await anext(stream)
+    await stream.aclose()
+    assert first.section == Section.SUGGESTIONS
+
+
+@pytest.mark.asyncio
+async def test_quoted_question_does_not_trigger_suggestions():
+    sections = await collect(StubClient({}), 'Er fragte: "Wo ist der Bahnhof?"')
+    assert Section.SUGGESTIONS not in [s.section for s in sections]
+
+
+@pytest.mark.asyncio
+async def test_failed_sections_carry_the_error():
+    client = StubClient({}, failing={"translation", "syntactical-analysis"})
+    sections = {s.section: s for s in await collect(client, "Der Bahnhof.")}
+    assert sections[Section.TRANSLATION].error is not None
+    assert sections[Section.TRANSLATION].text == "translation failed"
+    # the breakdown degrades to literal translations only
+    assert sections[Section.BREAKDOWN].error is None
+    assert "**Bahnhof**: station" in sections[Section.BREAKDOWN].text
+
+
+@pytest.mark.asyncio
+async def test_pending_calls_are_cancelled_when_consumer_stops():
+    client = StubClient({"literal-translation": 10, "syntactical-analysis": 10})
+    stream = render_progressively(client, stringifier, "Der Bahnhof.")
+    first = await anext(stream)
+    assert first.section == Section.TRANSLATION
+    await stream.aclose()
+    await asyncio.sleep(0)
+    assert client.cancelled == {"literal-translation", "syntactical-analysis"}
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_only_fail_their_sections():
+    client = StubClient(
+        {"literal-translation": 0.01},
+        unreachable={"translation", "syntactical-analysis"},
+    )
+    sections = {s.section: s for s in await collect(client, "Wo ist der Bahnhof?")}
+    assert sections[Section.TRANSLATION].text == BACKEND_UNREACHABLE_MESSAGE
+    assert sections[Section.TRANSLATION].error is not None
+    assert "**Bahnhof**: station" in sections[Section.BREAKDOWN].text
+    # without the analysis, the question mark alone decides
+    assert Section.SUGGESTIONS in sections
@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+
+from shared.cache import LRUCache
+from shared.client import Client
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.prefetch import InflectionPrefetcher
+from shared.scheduler import Priority, Scheduler
+
+INFLECTIONS = {
+    "pos": {"value": "NOUN", "explanation": "noun"},
+    "gender": "Masc",
+    "inflections": [{"word": "Bahnhof", "morphology": {"Case": "Nom"}}],
+}
+
+
+class StubClient(Client):
+    """
+    Serves inflections after a delay, recording the requested words and the peak concurrency.
+    """
+
+    def __init__(self, delay: float = 0.01, failing: set[str] | None = None):
+        super().__init__("", cache=LRUCache(maxsize=16))
+        self.delay = delay
+        self.failing = failing or set()
+        self.requested: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    async def _post(self, endpoint, payload):
+        self.requested.append(payload["word"])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if payload["word"] in self.failing:
+            return 400, json.dumps({"error_message": "unknown word"}).encode()
+        return 200, json.dumps(INFLECTIONS).encode()
+
+
+def tokens(*words: tuple[str, str, UPOS]) -> list[Token]:
+    return [Token(text=text, lemma=lemma, upos=upos) for text, lemma, upos in words]
+
+
+SENTENCE = tokens(
+    ("Die", "der", UPOS.DET),
+    ("Kinder", "Kind", UPOS.NOUN),
+    ("gehen", "gehen", UPOS.VERB),
+    ("zum", "zu", UPOS.ADP),
+    ("Bahnhof", "Bahnhof", UPOS.NOUN),
+    ("und", "und", UPOS.CCONJ),
+    ("gehen", "gehen", UPOS.VERB),
+)
+
+
+def test_prefetcher_requires_cache():
+    with pytest.raises(ValueError):
+        InflectionPrefetcher(Client(""))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_fills_cache_for_nouns_and_verbs():
+    client = StubClient()
+    prefetcher = InflectionPrefetcher(client)
+    assert prefetcher.prefetch(SENTENCE) == ["Kind", "gehen", "Bahnhof"]
+    await prefetcher.wait()
+    assert sorted(client.requested) == ["Bahnhof", "Kind", "gehen"]
+
+    await client.fetch_inflections("Bahnhof")
+    assert client.requested.count("Bahnhof") == 1
+    assert client.cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_respects_concurrency_limit():
+    client = StubClient()
+    prefetcher = InflectionPrefetcher(client, max_concurrency=1)
+    prefetcher.prefetch(SENTENCE)
+    await prefetcher.wait()
+    assert client.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_skips_cached_lemmas():
+    client = StubClient()
+    await client.fetch_inflections("Kind")
+    prefetcher = InflectionPrefetcher(client)
+    assert prefetcher.prefetch(SENTENCE) == ["gehen", "Bahnhof"]
+    await prefetcher.wait()
+    assert client.requested.count("Kind") == 1
+
+
+@pytest.mark.asyncio
+async def test_user_request_joins_pending_prefetch():
+    client = StubClient(delay=0.05)
+    prefetcher = InflectionPrefetcher(client)
+    prefetcher.prefetch(SENTENCE)
+    await asyncio.sleep(0.01)
+    inflections = await client.fetch_inflections("Kind")
+    assert inflections.gender == "Masc"
+    await prefetcher.wait()
+    assert client.requested.count("Kind") == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_failures_are_swallowed():
+    client = StubClient(failing={"Kind"})
+    prefetcher = InflectionPrefetcher(client)
+    prefetcher.prefetch(SENTENCE)
+    await prefetcher.wait()
+    assert not client.is_cached("inflection", {"word": "Kind"})
+    assert client.is_cached("inflection", {"word": "gehen"})
+
+
+@pytest.mark.asyncio
+async def test_leaving_context_cancels_pending_prefetches():
+    client = StubClient(delay=1)
+    async with InflectionPrefetcher(client, max_concurrency=1) as prefetcher:
+        prefetcher.prefetch(SENTENCE)
+        await asyncio.sleep(0.01)
+        assert prefetcher.pending == 3
+    assert prefetcher.pending == 0
+    assert client.requested == ["Kind"]
+    assert len(client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_uses_background_priority():
+    client = StubClient()
+    client.scheduler = Scheduler(max_in_flight=4)
+    prefetcher = InflectionPrefetcher(client)
+    prefetcher.prefetch(SENTENCE)
+    await prefetcher.wait()
+    await client.fetch_inflections("Haus")
+
+    assert client.scheduler.stats[Priority.BACKGROUND].started == 3
+    assert client.scheduler.stats[Priority.INTERACTIVE].started == 1
@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+import pytest
+from aioresponses import aioresponses
+
+from shared import profiling
+from shared.client import Client
+from shared.profiling import InMemorySink, OpenTelemetrySink, Span, span
+
+
+class CollectingSink:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+@pytest.fixture
+def sink():
+    sink = CollectingSink()
+    profiling.add_sink(sink)
+    yield sink
+    profiling.remove_sink(sink)
+
+
+def test_spans_are_disabled_without_sinks():
+    assert not profiling.is_enabled()
+    assert span("a") is span("b")
+
+
+def test_nested_spans_record_their_parent(sink):
+    with span("outer"):
+        with span("inner", size=3):
+            pass
+    inner, outer = sink.spans
+    assert inner.name == "inner"
+    assert inner.parent == "outer"
+    assert inner.attributes == {"size": 3}
+    assert outer.parent is None
+    assert outer.duration_ns >= inner.duration_ns
+
+
+def test_span_records_errors(sink):
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError()
+    assert sink.spans[0].attributes == {"error": "ValueError"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_have_separate_parents(sink):
+    async def task(name: str):
+        with span(name):
+            await asyncio.sleep(0)
+            with span(f"{name}.child"):
+                await asyncio.sleep(0)
+
+    await asyncio.gather(task("a"), task("b"))
+    parents = {s.name: s.parent for s in sink.spans}
+    assert parents["a.child"] == "a"
+    assert parents["b.child"] == "b"
+
+
+def test_in_memory_sink_aggregates_by_name():
+    sink = InMemorySink()
+    for duration in [1_000_000, 3_000_000]:
+        sink.export(Span("render", start_ns=0, duration_ns=duration))
+    assert sink.summary() == {
+        "render": {"count": 2, "total_ms": 4.0, "mean_ms": 2.0, "max_ms": 3.0}
+    }
+
+
+class FakeOtelSpan:
+    def __init__(self, tracer, name, context, start_time, attributes):
+        self.tracer = tracer
+        self.name, self.context = name, context
+        self.start_time, self.attributes = start_time, attributes
+
+    def end(self, end_time):
+        self.tracer.ended.append((self.name, end_time - self.start_time))
+
+
+class FakeTracer:
+    def __init__(self):
+        self.started = {}
+        self.ended = []
+
+    def start_span(self, name, context, start_time, attributes):
+        otel_span = FakeOtelSpan(self, name, context, start_time, attributes)
+        self.started[name] = otel_span
+        return otel_span
+
+
+def fake_set_span_in_context(otel_span):
+    return ("context", otel_span.name)
+
+
+def test_open_telemetry_sink_forwards_spans():
+    tracer = FakeTracer()
+    OpenTelemetrySink(tracer, fake_set_span_in_context).export(
+        Span("client.decode", start_ns=0, duration_ns=42, parent="client.request")
+    )
+    assert tracer.ended == [("client.decode", 42)]
+
+
+def test_open_telemetry_sink_keeps_nesting():
+    tracer = FakeTracer()
+    otel_sink = OpenTelemetrySink(tracer, fake_set_span_in_context)
+    profiling.add_sink(otel_sink)
+    try:
+        with span("outer"):
+            with span("inner"):
+                profiling.record("leaf", 0, 1)
+    finally:
+        profiling.remove_sink(otel_sink)
+
+    assert tracer.started["outer"].context is None
+    assert tracer.started["inner"].context == ("context", "outer")
+    assert tracer.started["leaf"].context == ("context", "inner")
+    # parents are started before, and ended after their children
+    assert list(tracer.started) == ["outer", "inner", "leaf"]
+    assert [name for name, _ in tracer.ended] == ["leaf", "inner", "outer"]
+
+
+def test_open_telemetry_sink_forwards_orphans():
+    tracer = FakeTracer()
+    otel_sink = OpenTelemetrySink(tracer, fake_set_span_in_context)
+    otel_sink.MAX_PENDING_SPANS = 2
+    # the parents 100 and 101 are never exported
+    otel_sink.export(Span("a", 0, 1, span_id=1, parent_id=100))
+    otel_sink.export(Span("b", 0, 1, span_id=2, parent_id=101))
+    assert tracer.started == {}
+
+    otel_sink.export(Span("c", 0, 1, span_id=3, parent_id=1))
+
+    assert tracer.started["a"].context is None
+    assert tracer.started["c"].context == ("context", "a")
+    assert "b" not in tracer.started
+    assert list(otel_sink._pending) == [101]
+
+
+@pytest.mark.asyncio
+async def test_client_phases_are_instrumented(sink):
+    client = Client("")
+    with aioresponses() as mocked:
+        mocked.post(
+            "/translation",
+            status=200,
+            body=json.dumps(
+                {"translation": "hi", "language_name": "German", "language_code": "de"}
+            ),
+        )
+        await client.fetch_translation("Hallo")
+    parents = {s.name: s.parent for s in sink.spans}
+    assert parents["client.decode"] == "client.request"
+    assert parents["client.request"] is None
+    assert "client.validate" in parents
@@ -1,9 +1,21 @@
 import pytest
 
+from shared.cache import LRUCache
 from shared.exception import ApplicationException
+from shared.model.inflection import Inflection, Inflections
 from shared.model.literal_translation import LiteralTranslation
+from shared.model.response_suggestion import ResponseSuggestion
 from shared.model.syntactical_analysis import PartOfSpeech, SyntacticalAnalysis
-from shared.rendering import MarkupLanguage, Stringifier
+from shared.model.token.feature import Case, Gender, NounFeatureSet, Number
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.rendering import (
+    CachingStringifier,
+    MarkupLanguage,
+    SizeUnit,
+    Stringifier,
+    chunk,
+)
 
 
 @pytest.fixture
@@ -67,3 +79,366 @@ def test_find_analysis(stringifier, syntactical_analysis):
         stringifier.find_analysis("one", [syntactical_analysis]) == syntactical_analysis
     )
     assert stringifier.find_analysis("two", [syntactical_analysis]) is None
+
+
+def test_align_analyses_matches_repeated_words_by_position(stringifier, pos):
+    first = SyntacticalAnalysis(
+        word="die", pos=pos, lemma="der", morphology=None, dependency="Katze"
+    )
+    second = SyntacticalAnalysis(
+        word="die", pos=pos, lemma="der", morphology=None, dependency="Maus"
+    )
+    literal_translations = [
+        LiteralTranslation(word="die", translation="the"),
+        LiteralTranslation(word="Katze", translation="cat"),
+        LiteralTranslation(word="die", translation="the"),
+        LiteralTranslation(word="Maus", translation="mouse"),
+    ]
+    aligned = stringifier.align_analyses(literal_translations, [first, second])
+    assert aligned == [first, None, second, None]
+
+
+def test_align_analyses_reuses_last_match_for_surplus_occurrences(
+    stringifier, syntactical_analysis
+):
+    literal_translations = [
+        LiteralTranslation(word="one", translation="uno"),
+        LiteralTranslation(word="one", translation="uno"),
+    ]
+    aligned = stringifier.align_analyses(literal_translations, [syntactical_analysis])
+    assert aligned == [syntactical_analysis, syntactical_analysis]
+
+
+def test_coalesce_analyses_long_input(stringifier, pos):
+    words = [f"word{i}" for i in range(1000)]
+    analyses = [
+        SyntacticalAnalysis(
+            word=word, pos=pos, lemma=None, morphology=None, dependency=None
+        )
+        for word in words
+    ]
+    literal_translations = [
+        LiteralTranslation(word=word, translation=word.upper()) for word in words
+    ]
+    rendered = stringifier.coalesce_analyses(literal_translations, analyses)
+    assert rendered.count("; Verb") == 1000
+    assert rendered.index("**word999**") > rendered.index("**word998**")
+
+
+@pytest.mark.parametrize("markup_language", list(MarkupLanguage))
+def test_constant_blocks_are_rendered_once_per_backend(markup_language):
+    first = Stringifier(markup_language)
+    second = Stringifier(markup_language)
+    assert first.backend is second.backend
+    assert first.disclaimer() is second.disclaimer()
+    assert first.introductory_text() is second.introductory_text()
+
+
+def test_introductory_text_is_escaped():
+    text = Stringifier(MarkupLanguage.MARKDOWN_V2).introductory_text()
+    assert "Hi\\! I'm the Grammr Bot\\." in text
+    assert "Let's get started\\! Text me something" in text
+    assert (
+        "Hi! I'm the Grammr Bot."
+        in Stringifier(MarkupLanguage.HTML).introductory_text()
+    )
+
+
+def test_html_backend():
+    stringifier = Stringifier(MarkupLanguage.HTML)
+    assert stringifier.bold("word") == "<b>word</b>"
+    assert stringifier.headline("Title") == "<b>Title</b>\n"
+    assert stringifier.hyperlink("here", "https://x") == "<a href='https://x'>here</a>"
+
+
+def test_plain_backend_has_no_markup():
+    stringifier = Stringifier(MarkupLanguage.PLAIN)
+    assert stringifier.bold("word") == "word"
+    assert stringifier.italic("word") == "word"
+    assert stringifier.hyperlink("here", "https://x") == "here (https://x)"
+
+
+def test_markdown_v2_backend_escapes_text(syntactical_analysis):
+    stringifier = Stringifier(MarkupLanguage.MARKDOWN_V2)
+    assert stringifier.bold("z.B.") == "*z\\.B\\.*"
+    assert (
+        stringifier.hyperlink("a (b)", "https://x/(y)")
+        == "[a \\(b\\)](https://x/(y\\))"
+    )
+    rendered = stringifier.coalesce_analyses(
+        [LiteralTranslation(word="one", translation="uno")], [syntactical_analysis]
+    )
+    assert "\\(from: uno\\)" in rendered
+    assert "(from" not in rendered.replace("\\(from", "")
+
+
+def test_chunk_respects_budget_without_splitting_pieces():
+    pieces = ["<b>a</b>\n", "<b>bb</b>\n", "<b>ccc</b>\n"]
+    chunks = list(chunk(pieces, max_size=20))
+    assert chunks == ["<b>a</b>\n<b>bb</b>\n", "<b>ccc</b>\n"]
+    assert "".join(chunks) == "".join(pieces)
+
+
+def test_chunk_measures_bytes():
+    pieces = ["ä" * 3, "ö" * 3]
+    assert list(chunk(pieces, max_size=6, unit=SizeUnit.CHARACTERS)) == ["äääööö"]
+    assert list(chunk(pieces, max_size=6, unit=SizeUnit.BYTES)) == ["äää", "ööö"]
+
+
+def test_chunk_splits_oversized_piece():
+    assert list(chunk(["ab", "cdefgh", "ij"], max_size=4)) == ["ab", "cdef", "ghij"]
+
+
+def test_chunk_splits_oversized_piece_at_whitespace():
+    chunks = list(chunk(["one two\nthree"], max_size=10))
+    assert chunks == ["one two\n", "three"]
+    chunks = list(chunk(["ääää öö"], max_size=5, unit=SizeUnit.BYTES))
+    assert chunks == ["ää", "ää ", "öö"]
+    assert all(len(c.encode("utf-8")) <= 5 for c in chunks)
+
+
+def test_chunk_splits_html_outside_tags_and_entities():
+    piece = (
+        "<b>Wo ist der Bahnhof?</b> "
+        "<a href='https://example.com/a b'>mehr zum Thema</a> &amp; <i>noch mehr</i>"
+    )
+    chunks = list(chunk([piece], max_size=48, markup_language=MarkupLanguage.HTML))
+
+    assert chunks == [
+        "<b>Wo ist der Bahnhof?</b> ",
+        "<a href='https://example.com/a b'>mehr zum </a>",
+        "<a href='https://example.com/a b'>Thema</a> ",
+        "&amp; <i>noch mehr</i>",
+    ]
+
+
+def test_chunk_closes_and_reopens_html_tags():
+    chunks = list(
+        chunk(
+            ["<b>eins zwei drei</b>"], max_size=17, markup_language=MarkupLanguage.HTML
+        )
+    )
+    assert chunks == ["<b>eins zwei </b>", "<b>drei</b>"]
+
+
+def test_chunk_splits_markdown_v2_outside_escapes_and_links():
+    backend = Stringifier(MarkupLanguage.MARKDOWN_V2).backend
+    piece = (
+        backend.bold("Wie viel kostet (ein) Bier?!")
+        + " "
+        + backend.hyperlink("Quelle", "https://example.com/(bier)")
+        + backend.escape(" ...!")
+    )
+    chunks = list(
+        chunk([piece], max_size=20, markup_language=MarkupLanguage.MARKDOWN_V2)
+    )
+
+    assert chunks == [
+        "*Wie viel kostet *",
+        "*\\(ein\\) Bier?\\!* ",
+        # links are never split, even if they exceed the budget
+        "[Quelle](https://example.com/(bier\\))",
+        " \\.\\.\\.\\!",
+    ]
+    chunks = list(
+        chunk(["abcd\\.efgh"], max_size=5, markup_language=MarkupLanguage.MARKDOWN_V2)
+    )
+    assert chunks == ["abcd", "\\.efg", "h"]
+
+
+def test_stream_analyses_is_lazy_and_markup_safe(pos):
+    stringifier = Stringifier(MarkupLanguage.HTML)
+    words = [f"word{i}" for i in range(200)]
+    analyses = [
+        SyntacticalAnalysis(
+            word=word, pos=pos, lemma="lemma", morphology=None, dependency="dep"
+        )
+        for word in words
+    ]
+    literal_translations = [
+        LiteralTranslation(word=word, translation="translation") for word in words
+    ]
+    chunks = list(
+        stringifier.stream_analyses(literal_translations, analyses, max_size=500)
+    )
+    assert len(chunks) > 1
+    assert all(len(c) <= 500 for c in chunks)
+    assert all(c.count("<b>") == c.count("</b>") for c in chunks)
+    assert "".join(chunks) == stringifier.coalesce_analyses(
+        literal_translations, analyses
+    )
+
+
+def test_stream_analyses_literal_translation_error(stringifier):
+    with pytest.raises(ApplicationException):
+        stringifier.stream_analyses(
+            ApplicationException(error_message="some error message"), []
+        )
+
+
+def test_stream_suggestions(stringifier):
+    suggestions = [
+        ResponseSuggestion(suggestion=f"Frage {i}", translation=f"Question {i}")
+        for i in range(10)
+    ]
+    chunks = list(stringifier.stream_suggestions(suggestions, max_size=60))
+    assert len(chunks) > 1
+    assert "".join(chunks) == stringifier.stringify_suggestions(suggestions)
+
+
+def test_caching_stringifier_reuses_rendered_output(syntactical_analysis):
+    cache = LRUCache[str, str](maxsize=8)
+    literal_translations = [LiteralTranslation(word="one", translation="uno")]
+    first = CachingStringifier(MarkupLanguage.MARKDOWN, cache)
+    second = CachingStringifier(MarkupLanguage.MARKDOWN, cache)
+
+    rendered = first.coalesce_analyses(literal_translations, [syntactical_analysis])
+    assert (
+        second.coalesce_analyses(
+            [LiteralTranslation(word="one", translation="uno")], [syntactical_analysis]
+        )
+        == rendered
+    )
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_caching_stringifier_keys_on_markup_language(syntactical_analysis):
+    cache = LRUCache[str, str](maxsize=8)
+    literal_translations = [LiteralTranslation(word="one", translation="uno")]
+    markdown = CachingStringifier(MarkupLanguage.MARKDOWN, cache)
+    html = CachingStringifier(MarkupLanguage.HTML, cache)
+    assert markdown.coalesce_analyses(
+        literal_translations, [syntactical_analysis]
+    ) != html.coalesce_analyses(literal_translations, [syntactical_analysis])
+    assert cache.stats.hits == 0
+    assert len(cache) == 2
+
+
+def test_caching_stringifier_does_not_cache_errors():
+    stringifier = CachingStringifier(MarkupLanguage.MARKDOWN)
+    with pytest.raises(ApplicationException):
+        stringifier.coalesce_analyses(
+            ApplicationException(error_message="some error message"), []
+        )
+    assert len(stringifier.cache) == 0
+
+
+@pytest.fixture
+def tokens() -> list[Token]:
+    tisch = Token(
+        text="Tisch",
+        lemma="Tisch",
+        upos=UPOS.NOUN,
+        feature_set=NounFeatureSet(
+            case=Case.NOM, number=Number.SING, gender=Gender.MASC
+        ),
+    )
+    der = Token(
+        text="Der",
+        lemma="der",
+        upos=UPOS.DET,
+        feature_set=NounFeatureSet(
+            case=Case.NOM, number=Number.SING, gender=Gender.MASC
+        ),
+        ancestor=tisch,
+    )
+    return [der, tisch, Token(text="wackelt", lemma="wackeln", upos=UPOS.VERB)]
+
+
+def test_describe_token_matches_token_str(tokens):
+    for token in tokens:
+        assert Stringifier.describe_token(token) == str(token)
+
+
+def test_coalesce_tokens(stringifier, tokens):
+    literal_translations = [
+        LiteralTranslation(word="Der", translation="the"),
+        LiteralTranslation(word="Tisch", translation="table"),
+        LiteralTranslation(word="wackelt", translation="wobbles"),
+        LiteralTranslation(word="sehr", translation="very"),
+    ]
+    rendered = stringifier.coalesce_tokens(literal_translations, tokens)
+    lines = list(filter(lambda x: x != "", rendered.split("\n\n")))
+    assert lines[1] == f"**Der**: the; {tokens[0]}"
+    assert lines[2] == "**Tisch**: table; Noun; Nominative Singular Masculine"
+    assert lines[3] == "**wackelt**: wobbles; (from: wackeln); Verb"
+    assert lines[4] == "**sehr**: very"
+
+
+def test_coalesce_tokens_analysis_error(stringifier):
+    rendered = stringifier.coalesce_tokens(
+        [LiteralTranslation(word="Tisch", translation="table")],
+        ApplicationException(error_message="some error message"),
+    )
+    assert rendered.endswith("**Tisch**: table\n\n")
+
+
+def test_coalesce_tokens_literal_translation_error(stringifier, tokens):
+    with pytest.raises(ApplicationException):
+        stringifier.coalesce_tokens(
+            ApplicationException(error_message="some error message"), tokens
+        )
+
+
+def test_stringify_paradigm(stringifier):
+    inflections = Inflections(
+        pos=PartOfSpeech(value="NOUN", explanation="Noun"),
+        gender="Masc",
+        inflections=[
+            Inflection(word="Tisch", morphology={"Case": "Nom", "Number": "Sing"}),
+            Inflection(word="Tische", morphology={"Case": "Nom", "Number": "Plur"}),
+            Inflection(word="Tisches", morphology={"Case": "Gen", "Number": "Sing"}),
+            Inflection(word="Tischs", morphology={"Case": "Gen", "Number": "Sing"}),
+        ],
+    )
+    lines = list(
+        filter(
+            lambda x: x != "", stringifier.stringify_paradigm(inflections).split("\n\n")
+        )
+    )
+    assert lines == [
+        "### Inflections",
+        "*Singular* | *Plural*",
+        "**Nominative**: Tisch | Tische",
+        "**Genitive**: Tisches/Tischs | –",
+    ]
+
+
+def test_stringify_paradigm_with_fixed_features(stringifier):
+    inflections = Inflections(
+        pos=PartOfSpeech(value="VERB", explanation="Verb"),
+        gender=None,
+        inflections=[
+            Inflection(
+                word=word,
+                morphology={"Person": person, "Number": "Sing", "Tense": tense},
+            )
+            for person, tense, word in [
+                ("1", "Pres", "gehe"),
+                ("2", "Pres", "gehst"),
+                ("1", "Past", "ging"),
+                ("2", "Past", "gingst"),
+            ]
+        ],
+    )
+    rendered = stringifier.stringify_paradigm(
+        inflections, rows="Person", columns="Number", Tense="Past"
+    )
+    assert "**1st person**: ging" in rendered
+    assert "**2nd person**: gingst" in rendered
+    assert "gehe" not in rendered
+
+
+@pytest.mark.parametrize(
+    "rows, columns, fixed",
+    [("Number", "Number", {}), ("Case", "Number", {"Case": "Nom"})],
+)
+def test_stringify_paradigm_rejects_overlapping_features(
+    stringifier, rows, columns, fixed
+):
+    inflections = Inflections(
+        pos=PartOfSpeech(value="NOUN", explanation="Noun"), gender=None, inflections=[]
+    )
+    with pytest.raises(ValueError):
+        stringifier.stringify_paradigm(inflections, rows=rows, columns=columns, **fixed)
@@ -0,0 +1,188 @@
+import asyncio
+import json
+
+import pytest
+
+from shared.client import Client
+from shared.exception import RequestShedException
+from shared.scheduler import Priority, Scheduler, Ticket, request_priority
+
+
+async def hold(
+    scheduler: Scheduler, priority: Priority, log: list, release: asyncio.Event
+):
+    async with scheduler.slot(priority):
+        log.append(priority)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_are_served_by_priority():
+    scheduler = Scheduler(max_in_flight=1)
+    log: list[Priority] = []
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(scheduler, Priority.BULK, log, release))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(hold(scheduler, priority, log, release))
+        for priority in (Priority.BULK, Priority.BACKGROUND, Priority.INTERACTIVE)
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.in_flight == 1
+    assert scheduler.queued() == 3
+
+    release.set()
+    await asyncio.gather(blocker, *waiting)
+
+    assert log == [
+        Priority.BULK,
+        Priority.INTERACTIVE,
+        Priority.BACKGROUND,
+        Priority.BULK,
+    ]
+    assert scheduler.in_flight == 0
+    assert scheduler.stats[Priority.INTERACTIVE].max_queue_time > 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_requests():
+    scheduler = Scheduler(max_in_flight=1, queue_limits={Priority.BULK: 1})
+    release = asyncio.Event()
+    tasks = [
+        asyncio.create_task(hold(scheduler, Priority.BULK, [], release))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+
+    with pytest.raises(RequestShedException):
+        async with scheduler.slot(Priority.BULK):
+            pass
+    # interactive requests still queue
+    interactive = asyncio.create_task(
+        hold(scheduler, Priority.INTERACTIVE, [], release)
+    )
+    await asyncio.sleep(0)
+    assert scheduler.queued(Priority.INTERACTIVE) == 1
+
+    release.set()
+    await asyncio.gather(*tasks, interactive)
+    assert scheduler.stats[Priority.BULK].shed == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_queued_too_long_are_shed():
+    scheduler = Scheduler(max_in_flight=1, max_queue_times={Priority.BACKGROUND: 0.01})
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(scheduler, Priority.BULK, [], release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(RequestShedException):
+        async with scheduler.slot(Priority.BACKGROUND):
+            pass
+
+    release.set()
+    await blocker
+    assert scheduler.queued() == 0
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_do_not_leak_slots():
+    scheduler = Scheduler(max_in_flight=1)
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(scheduler, Priority.BULK, [], release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold(scheduler, Priority.INTERACTIVE, [], release))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    release.set()
+    await blocker
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert scheduler.in_flight == 0
+    async with scheduler.slot():
+        assert scheduler.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_shed_waiters_keeps_slots():
+    scheduler = Scheduler(max_in_flight=1)
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(scheduler, Priority.BULK, [], release))
+    await asyncio.sleep(0)
+    ticket = Ticket(Priority.BACKGROUND)
+    waiter = asyncio.create_task(scheduler.acquire(ticket))
+    await asyncio.sleep(0)
+
+    # shed and cancelled before the waiter gets to run
+    scheduler._expire(ticket)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert scheduler.in_flight == 1
+    release.set()
+    await blocker
+    assert scheduler.in_flight == 0
+
+
+class StubClient(Client):
+    def __init__(self, scheduler: Scheduler):
+        super().__init__("", scheduler=scheduler)
+        self.release = asyncio.Event()
+        self.sent: list[str] = []
+
+    async def _post(self, endpoint, payload):
+        self.sent.append(payload["sentence"])
+        await self.release.wait()
+        body = {"translation": "", "language_name": "German", "language_code": "de"}
+        return 200, json.dumps(body).encode()
+
+
+@pytest.mark.asyncio
+async def test_client_requests_use_context_priority():
+    scheduler = Scheduler(max_in_flight=1)
+    client = StubClient(scheduler)
+    first = asyncio.create_task(client.fetch_translation("first"))
+    await asyncio.sleep(0)
+    with request_priority(Priority.BULK):
+        bulk = asyncio.create_task(client.fetch_translation("bulk"))
+    interactive = asyncio.create_task(client.fetch_translation("interactive"))
+    await asyncio.sleep(0)
+
+    client.release.set()
+    await asyncio.gather(first, bulk, interactive)
+
+    assert client.sent == ["first", "interactive", "bulk"]
+    assert scheduler.stats[Priority.BULK].started == 1
+
+
+@pytest.mark.asyncio
+async def test_promoted_requests_move_to_the_higher_queue():
+    scheduler = Scheduler(max_in_flight=1, max_queue_times={Priority.BULK: 0.05})
+    log: list[Priority] = []
+    release = asyncio.Event()
+    blocker = asyncio.create_task(hold(scheduler, Priority.INTERACTIVE, [], release))
+    await asyncio.sleep(0)
+    background = asyncio.create_task(hold(scheduler, Priority.BACKGROUND, log, release))
+
+    async def hold_ticket(ticket: Ticket) -> None:
+        async with scheduler.slot(ticket=ticket):
+            log.append(Priority.BULK)
+            await release.wait()
+
+    ticket = Ticket(Priority.BULK)
+    bulk = asyncio.create_task(hold_ticket(ticket))
+    await asyncio.sleep(0)
+    scheduler.promote(ticket, Priority.INTERACTIVE)
+    scheduler.promote(ticket, Priority.BULK)  # lowering is ignored
+    # past the maximum queue time of bulk requests
+    await asyncio.sleep(0.1)
+
+    release.set()
+    await asyncio.gather(blocker, background, bulk)
+
+    assert log == [Priority.BULK, Priority.BACKGROUND]
+    assert ticket.priority == Priority.INTERACTIVE
+    assert scheduler.stats[Priority.BULK].promoted == 1
+    assert scheduler.stats[Priority.BULK].shed == 0
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from shared.client import Client
+from shared.exception import ApplicationException, SentenceTooLongException
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.token.token import Token
+from shared.model.token.upos import UPOS
+from shared.model.translation import Translation
+from shared.segmentation import SegmentBudget, analyse_text, check_length, fits, segment
+from shared.transport import BACKEND_UNREACHABLE_MESSAGE
+
+PARAGRAPH = (
+    "Ich wohne seit drei Jahren in Berlin. Die Stadt ist groß, laut und manchmal "
+    "anstrengend, aber ich mag sie sehr! Wohnst du auch hier?"
+)
+
+
+def test_short_text_is_a_single_segment():
+    segments = segment("Wie geht's dir?")
+    assert [(s.text, s.start, s.end) for s in segments] == [("Wie geht's dir?", 0, 15)]
+
+
+def test_segments_respect_budget_and_offsets():
+    budget = SegmentBudget(max_words=8, max_characters=60)
+    segments = segment(PARAGRAPH, budget)
+    assert len(segments) > 1
+    for s in segments:
+        assert fits(s.text, budget)
+        assert PARAGRAPH[s.start : s.end] == s.text
+    # segments are ordered and cover every word of the text
+    assert " ".join(s.text for s in segments).split() == PARAGRAPH.split()
+
+
+def test_sentences_are_split_at_clauses_before_words():
+    budget = SegmentBudget(max_words=8, max_characters=200)
+    texts = [s.text for s in segment(PARAGRAPH, budget)]
+    assert "Ich wohne seit drei Jahren in Berlin." in texts
+    assert "Die Stadt ist groß, laut und manchmal anstrengend," in texts
+
+
+def test_overlong_clause_is_split_at_words():
+    text = " ".join(["Wort"] * 25)
+    segments = segment(text, SegmentBudget(max_words=10))
+    assert [len(s.text.split()) for s in segments] == [10, 10, 5]
+
+
+def test_check_length():
+    check_length("Kurz und knapp.", SegmentBudget(max_words=3))
+    with pytest.raises(SentenceTooLongException):
+        check_length("Nicht mehr ganz so kurz.", SegmentBudget(max_words=3))
+
+
+class EchoClient(Client):
+    """
+    Answers every request locally, echoing the words of the sentence.
+    """
+
+    def __init__(self):
+        super().__init__("")
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def track(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+    async def fetch_translation(self, sentence):
+        await self.track()
+        if "Zeitlimit" in sentence:
+            raise asyncio.TimeoutError()
+        return Translation(
+            translation=sentence.upper(), language_name="German", language_code="de"
+        )
+
+    async def fetch_literal_translations(self, sentence):
+        await self.track()
+        if "Fehler" in sentence:
+            raise ApplicationException(error_message="failed")
+        return [
+            LiteralTranslation(word=word, translation=word.lower())
+            for word in sentence.split()
+        ]
+
+    async def fetch_syntactical_analysis(self, sentence, language_code=None):
+        await self.track()
+        return [Token(text=w, lemma=w, upos=UPOS.X) for w in sentence.split()]
+
+
+@pytest.mark.asyncio
+async def test_analyse_text_stitches_results_in_order():
+    client = EchoClient()
+    budget = SegmentBudget(max_words=8, max_characters=60)
+    analysis = await analyse_text(client, PARAGRAPH, budget, max_concurrency=2)
+
+    assert len(analysis.results) == len(segment(PARAGRAPH, budget))
+    assert client.max_in_flight <= 2
+    assert [t.text for t in analysis.tokens] == PARAGRAPH.split()
+    assert [lt.word for lt in analysis.literal_translations] == PARAGRAPH.split()
+    for token, offset in zip(analysis.tokens, analysis.token_offsets):
+        assert PARAGRAPH[offset : offset + len(token.text)] == token.text
+    assert analysis.translation.translation.split() == PARAGRAPH.upper().split()
+
+
+@pytest.mark.asyncio
+async def test_analyse_text_keeps_partial_results_on_errors():
+    text = "Das klappt gut. Hier kommt ein Fehler."
+    analysis = await analyse_text(EchoClient(), text, SegmentBudget(max_words=4))
+    assert [lt.word for lt in analysis.literal_translations] == text.split()[:3]
+    assert len(analysis.tokens) == len(text.split())
+    assert isinstance(analysis.results[1].literal_translations, ApplicationException)
+
+
+@pytest.mark.asyncio
+async def test_analyse_text_keeps_partial_results_on_transport_errors():
+    text = "Das klappt gut. Hier greift ein Zeitlimit."
+    analysis = await analyse_text(EchoClient(), text, SegmentBudget(max_words=4))
+    assert analysis.results[0].translation.translation == "DAS KLAPPT GUT."
+    error = analysis.results[1].translation
+    assert isinstance(error, ApplicationException)
+    assert error.error_message == BACKEND_UNREACHABLE_MESSAGE
+    assert len(analysis.tokens) == len(text.split())
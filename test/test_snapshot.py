@@ -0,0 +1,126 @@
+import asyncio
+import json
+import logging
+import os
+import stat
+
+import pytest
+
+from shared.cache import LRUCache
+from shared.client import Client
+from shared.model.literal_translation import LiteralTranslation
+from shared.snapshot import Snapshot, collect, write_snapshot
+
+LITERAL_TRANSLATIONS = [{"word": "Hallo", "translation": "hello"}]
+
+
+class RecordingTransport:
+    def __init__(
+        self, failing: set[str] | None = None, unreachable: set[str] | None = None
+    ):
+        self.failing = failing or set()
+        self.unreachable = unreachable or set()
+        self.requests: list[tuple[str, dict]] = []
+
+    async def post(self, endpoint, payload):
+        self.requests.append((endpoint, payload))
+        if endpoint in self.unreachable:
+            raise asyncio.TimeoutError()
+        if endpoint in self.failing:
+            return 500, b'"failure"'
+        return 200, json.dumps(LITERAL_TRANSLATIONS).encode()
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "lexicon.snap")
+    entries = [
+        (
+            "literal-translation",
+            {"sentence": "Hallo"},
+            json.dumps(LITERAL_TRANSLATIONS).encode(),
+        ),
+        ("inflection", {"word": "Haus"}, b'{"word": "Haus"}'),
+    ] + [
+        ("literal-translation", {"sentence": f"Satz {i}"}, f"[{i}]".encode())
+        for i in range(500)
+    ]
+    write_snapshot(path, entries)
+    return path
+
+
+def test_snapshot_lookup(snapshot_path):
+    with Snapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == 502
+        assert snapshot.get("inflection", {"word": "Haus"}) == b'{"word": "Haus"}'
+        assert all(
+            snapshot.get("literal-translation", {"sentence": f"Satz {i}"})
+            == f"[{i}]".encode()
+            for i in range(500)
+        )
+        assert snapshot.get("inflection", {"word": "Hallo"}) is None
+        assert snapshot.get("translation", {"sentence": "Hallo"}) is None
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    write_snapshot(path, [])
+    with Snapshot(path) as snapshot:
+        assert snapshot.get("inflection", {"word": "Haus"}) is None
+
+
+def test_snapshot_is_readable_by_others(snapshot_path):
+    assert stat.S_IMODE(os.stat(snapshot_path).st_mode) == 0o644
+
+
+@pytest.mark.parametrize(
+    "content", [b"", b"LLSNAP01", b"not a snapshot, but long enough for a header"]
+)
+def test_invalid_snapshot_file(tmp_path, content):
+    path = tmp_path / "invalid.snap"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="not a snapshot file"):
+        Snapshot(str(path))
+
+
+def test_truncated_snapshot_file(snapshot_path, tmp_path):
+    path = tmp_path / "truncated.snap"
+    with open(snapshot_path, "rb") as file:
+        path.write_bytes(file.read(100))
+    with pytest.raises(ValueError, match="truncated"):
+        Snapshot(str(path))
+
+
+@pytest.mark.asyncio
+async def test_client_serves_snapshot_before_network(snapshot_path):
+    transport = RecordingTransport()
+    with Snapshot(snapshot_path) as snapshot:
+        client = Client(
+            "", transport=transport, snapshot=snapshot, cache=LRUCache(maxsize=4)
+        )
+        assert await client.fetch_literal_translations("Hallo") == [
+            LiteralTranslation(word="Hallo", translation="hello")
+        ]
+        assert transport.requests == []
+        assert len(client.cache) == 0
+
+        await client.fetch_literal_translations("Tschüss")
+        assert transport.requests == [("literal-translation", {"sentence": "Tschüss"})]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "transport",
+    [
+        RecordingTransport(failing={"syntactical-analysis"}),
+        RecordingTransport(unreachable={"syntactical-analysis"}),
+    ],
+)
+async def test_collect_skips_failed_requests(transport, caplog):
+    with caplog.at_level(logging.WARNING, logger="shared.snapshot"):
+        entries = await collect(transport, ["Hallo"], ["Haus"])
+    assert [(endpoint, payload) for endpoint, payload, _ in entries] == [
+        ("literal-translation", {"sentence": "Hallo"}),
+        ("inflection", {"word": "Haus"}),
+    ]
+    assert len(caplog.records) == 1
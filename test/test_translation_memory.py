@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from shared import translation_memory
+from shared.client import Client
+from shared.model.literal_translation import LiteralTranslation
+from shared.model.translation import Translation
+from shared.translation_memory import TranslationMemory, normalise
+from shared.word_cache import split_words
+
+
+def lt(word: str) -> LiteralTranslation:
+    return LiteralTranslation(word=word, translation=word.upper())
+
+
+class StubClient(Client):
+    def __init__(self, translation_memory: TranslationMemory):
+        super().__init__("", translation_memory=translation_memory)
+        self.requested: list[tuple[str, str]] = []
+
+    async def _post(self, endpoint, payload):
+        self.requested.append((endpoint, payload["sentence"]))
+        if endpoint == "translation":
+            body = {
+                "translation": payload["sentence"].upper(),
+                "language_name": "German",
+                "language_code": "de",
+            }
+        else:
+            body = [lt(word).model_dump() for word in split_words(payload["sentence"])]
+        return 200, json.dumps(body).encode()
+
+
+def test_normalise():
+    assert normalise("  Wie  GEHT's dir?! ") == "wie geht s dir ?"
+    assert normalise("Ich komme.") == normalise("ich komme")
+    assert normalise("Du kommst?") != normalise("Du kommst.")
+
+
+def test_find_near_duplicates():
+    memory = TranslationMemory(literal_translation_threshold=0.6)
+    memory.add(
+        "Ich habe gestern einen alten Freund getroffen.",
+        literal_translations=[lt("Ich")],
+    )
+    memory.add("Der Hund bellt.", literal_translations=[lt("Hund")])
+
+    match = memory.find(
+        "Ich habe gestern einen alten Lehrer getroffen",
+        0.6,
+        "literal_translations",
+    )
+
+    assert match is not None
+    assert match.sentence == "ich habe gestern einen alten freund getroffen"
+    assert 0.6 <= match.similarity < 1
+    assert memory.find("Die Katze schläft.", 0.6, "literal_translations") is None
+    assert memory.stats.fuzzy_hits == 1
+    assert memory.stats.hit_rate == 0.5
+
+
+def test_eviction_removes_sentences_from_index():
+    memory = TranslationMemory(maxsize=1)
+    memory.add("Der Hund bellt.", literal_translations=[])
+    memory.add("Die Katze schläft.", literal_translations=[])
+    assert len(memory) == 1
+    assert memory.find("Der Hund bellt", 0.5, "literal_translations") is None
+
+
+@pytest.mark.asyncio
+async def test_translation_reused_for_equivalent_sentences_only():
+    client = StubClient(TranslationMemory())
+    first = await client.fetch_translation("Wo ist der Bahnhof?")
+    assert await client.fetch_translation("wo ist der  Bahnhof ?") is first
+    await client.fetch_translation("Wo ist der Flughafen?")
+
+    assert [sentence for _, sentence in client.requested] == [
+        "Wo ist der Bahnhof?",
+        "Wo ist der Flughafen?",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_literal_translations_fetch_only_differing_words():
+    client = StubClient(TranslationMemory())
+    await client.fetch_literal_translations(
+        "Ich habe gestern einen alten Freund getroffen."
+    )
+    result = await client.fetch_literal_translations(
+        "Ich habe gestern einen alten Lehrer getroffen!"
+    )
+
+    assert client.requested[-1] == ("literal-translation", "Lehrer")
+    assert [t.word for t in result] == [
+        "Ich",
+        "habe",
+        "gestern",
+        "einen",
+        "alten",
+        "Lehrer",
+        "getroffen",
+    ]
+    assert client.translation_memory.stats.words_reused == 6
+    # all seven words of the first sentence were missing
+    assert client.translation_memory.stats.words_missing == 8
+
+
+@pytest.mark.asyncio
+async def test_signature_computed_once_per_sentence(monkeypatch):
+    calls = []
+    minhash = translation_memory.minhash
+    monkeypatch.setattr(
+        translation_memory,
+        "minhash",
+        lambda shingle_set: calls.append(shingle_set) or minhash(shingle_set),
+    )
+    client = StubClient(TranslationMemory())
+
+    await client.fetch_literal_translations("Der Hund bellt.")
+    await client.fetch_literal_translations("Die Katze schläft.")
+
+    assert len(calls) == 2
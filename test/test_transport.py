@@ -0,0 +1,149 @@
+import io
+import json
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+
+from shared.client import Client
+from shared.exception import ApplicationException
+from shared.model.translation import Translation
+from shared.profiling import Span, add_sink, remove_sink, span
+from shared.transport import LambdaTransport
+
+FUNCTIONS = {"translation": "lingolift-translation"}
+TRANSLATION = {"translation": "Hello", "language_name": "German", "language_code": "de"}
+
+
+def payload(value) -> StreamingBody:
+    raw = json.dumps(value).encode()
+    return StreamingBody(io.BytesIO(raw), len(raw))
+
+
+@pytest.fixture
+def stubbed():
+    lambda_client = boto3.client(
+        "lambda",
+        region_name="eu-central-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    with Stubber(lambda_client) as stubber:
+        transport = LambdaTransport(FUNCTIONS, lambda_client=lambda_client)
+        yield stubber, Client("", transport=transport)
+        transport.close()
+        stubber.assert_no_pending_responses()
+
+
+def expect(stubber: Stubber, response: dict) -> None:
+    stubber.add_response(
+        "invoke",
+        {"StatusCode": 200, **response},
+        {
+            "FunctionName": "lingolift-translation",
+            "InvocationType": "RequestResponse",
+            "Payload": ANY,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_lambda_transport_parses_proxy_response(stubbed):
+    stubber, client = stubbed
+    body = {"translation": "Hello", "language_name": "German", "language_code": "de"}
+    expect(stubber, {"Payload": payload({"statusCode": 200, "body": json.dumps(body)})})
+
+    translation = await client.fetch_translation("Hallo")
+
+    assert translation == Translation(**body)
+
+
+@pytest.mark.asyncio
+async def test_lambda_transport_keeps_span_context(stubbed):
+    stubber, client = stubbed
+    expect(stubber, {"Payload": payload({"statusCode": 200, "body": TRANSLATION})})
+    spans: dict[str, Span] = {}
+
+    class RecordingSink:
+        def export(self, span: Span) -> None:
+            spans[span.name] = span
+
+    sink = RecordingSink()
+    add_sink(sink)
+    try:
+        with span("request"):
+            await client.fetch_translation("Hallo")
+    finally:
+        remove_sink(sink)
+
+    by_id = {s.span_id: s for s in spans.values()}
+    ancestor = spans["client.decode"]
+    while ancestor.parent_id is not None:
+        ancestor = by_id[ancestor.parent_id]
+    assert ancestor is spans["request"]
+
+
+@pytest.mark.asyncio
+async def test_lambda_transport_sends_proxy_event(stubbed):
+    stubber, client = stubbed
+    events = []
+    invoke = client.transport.lambda_client.invoke
+
+    def recording_invoke(**kwargs):
+        events.append(json.loads(kwargs["Payload"]))
+        return invoke(**kwargs)
+
+    client.transport.lambda_client.invoke = recording_invoke
+    expect(stubber, {"Payload": payload(TRANSLATION)})
+
+    # functions may also return the body directly instead of a proxy response
+    assert await client.fetch_translation("Hallo") == Translation(**TRANSLATION)
+
+    assert events[0]["path"] == "/translation"
+    assert json.loads(events[0]["body"]) == {"sentence": "Hallo"}
+
+
+@pytest.mark.asyncio
+async def test_lambda_transport_maps_application_errors(stubbed):
+    stubber, client = stubbed
+    expect(
+        stubber,
+        {
+            "Payload": payload(
+                {
+                    "statusCode": 400,
+                    "body": json.dumps({"error_message": "Sentence too long."}),
+                }
+            )
+        },
+    )
+
+    with pytest.raises(ApplicationException) as e:
+        await client.fetch_translation("Hallo")
+    assert e.value.error_message == "Sentence too long."
+
+
+@pytest.mark.asyncio
+async def test_lambda_transport_maps_function_errors(stubbed):
+    stubber, client = stubbed
+    expect(
+        stubber,
+        {
+            "FunctionError": "Unhandled",
+            "Payload": payload(
+                {"errorMessage": "Task timed out", "errorType": "TimeoutError"}
+            ),
+        },
+    )
+
+    with pytest.raises(ApplicationException) as e:
+        await client.fetch_translation("Hallo")
+    assert e.value.error_message == "Task timed out"
+
+
+@pytest.mark.asyncio
+async def test_lambda_transport_rejects_unknown_endpoints(stubbed):
+    _, client = stubbed
+    with pytest.raises(ValueError):
+        await client.fetch_inflections("Haus")
@@ -1,4 +1,7 @@
+import pytest
+
 from shared import universal_features
+from shared.exception import LanguageNotAvailableException
 
 
 def test_tags_for_noun():
@@ -29,3 +32,54 @@ def test_tags_for_verb():
         )
         == "3rd person Singular Present tense"
     )
+
+
+def test_convert_to_legible_tags_is_memoised():
+    universal_features._convert_to_legible_tags.cache_clear()
+    tags = {"Case": "Dat", "Number": "Plur", "Gender": "Fem"}
+    first = universal_features.convert_to_legible_tags(
+        tags, universal_features.nominal_features
+    )
+    # insertion order of the tags must not affect the cache key
+    second = universal_features.convert_to_legible_tags(
+        {"Gender": "Fem", "Number": "Plur", "Case": "Dat"},
+        list(universal_features.nominal_features),
+    )
+    assert first == second == "Dative Plural Feminine"
+    assert universal_features._convert_to_legible_tags.cache_info().hits == 1
+
+
+def test_unknown_tag_values_are_skipped():
+    tags = {"Case": "Voc", "Number": "Sing"}
+    assert (
+        universal_features.convert_to_legible_tags(
+            tags, universal_features.nominal_features
+        )
+        == "Singular"
+    )
+
+
+def test_get_all_feature_instances_is_precomputed():
+    instances = universal_features.get_all_feature_instances("Case")
+    assert instances == ("Nom", "Gen", "Dat", "Acc")
+    assert instances is universal_features.get_all_feature_instances("Case")
+
+
+def test_feature_set_is_loaded_once_and_immutable():
+    feature_set = universal_features.load_feature_set("de")
+    assert feature_set is universal_features.load_feature_set("de")
+    assert universal_features.all_features is feature_set
+    with pytest.raises(TypeError):
+        feature_set["Case"]["Nom"] = "something else"  # type: ignore
+
+
+def test_default_language_shares_the_instance():
+    assert universal_features.load_feature_set() is (
+        universal_features.load_feature_set("de")
+    )
+
+
+@pytest.mark.parametrize("language_code", ["xx", "../features/features_de", "DE"])
+def test_unknown_language_raises(language_code):
+    with pytest.raises(LanguageNotAvailableException):
+        universal_features.load_feature_set(language_code)
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from shared.client import Client
+from shared.model.literal_translation import LiteralTranslation
+from shared.word_cache import WordTranslationCache, assign, merge, split_words
+
+DICTIONARY = {
+    "Ich": "I",
+    "gehe": "go",
+    "zu": "to",
+    "dem": "the",
+    "Bahnhof": "station",
+    "sein": "his",
+    "Hund": "dog",
+    "ist": "is",
+    "hier": "here",
+}
+
+
+def lt(word: str) -> LiteralTranslation:
+    return LiteralTranslation(word=word, translation=DICTIONARY.get(word, "?"))
+
+
+class StubClient(Client):
+    """
+    Translates word by word, splitting "zum" like the backend does, and records the requested sentences.
+    """
+
+    def __init__(self, word_cache: WordTranslationCache):
+        super().__init__("", word_cache=word_cache)
+        self.requested: list[str] = []
+
+    async def _post(self, endpoint, payload):
+        self.requested.append(payload["sentence"])
+        words = split_words(payload["sentence"].replace("zum", "zu dem"))
+        return 200, json.dumps([lt(word).model_dump() for word in words]).encode()
+
+
+def test_split_words_drops_punctuation():
+    assert split_words("Wie geht's, Hans-Peter?") == ["Wie", "geht's", "Hans-Peter"]
+
+
+def test_merge_keeps_sentence_order():
+    words = ["Ich", "gehe", "zum", "Bahnhof"]
+    cached = [(lt("Ich"),), None, None, (lt("Bahnhof"),)]
+    fetched = [lt("gehe"), lt("zu"), lt("dem")]
+    assert [t.word for t in merge(words, cached, fetched)] == [
+        "Ich",
+        "gehe",
+        "zu",
+        "dem",
+        "Bahnhof",
+    ]
+
+
+def test_assign_attributes_split_words_to_the_original_word():
+    words = ["Ich", "gehe", "zum", "Bahnhof"]
+    known = [(lt("Ich"),), None, None, None]
+    fetched = [lt(word) for word in ["gehe", "zu", "dem", "Bahnhof"]]
+    assigned = assign(words, known, fetched)
+    assert [(word, [t.word for t in ts]) for word, ts in assigned] == [
+        ("Ich", ["Ich"]),
+        ("gehe", ["gehe"]),
+        ("zum", ["zu", "dem"]),
+        ("Bahnhof", ["Bahnhof"]),
+    ]
+
+
+def test_assign_keeps_unattributable_translations():
+    assigned = assign(["Hund", "hier"], [None, None], [lt("Hund"), lt("ist")])
+    assert [(word, [t.word for t in ts]) for word, ts in assigned] == [
+        ("Hund", ["Hund"]),
+        (None, ["ist"]),
+        ("hier", []),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_split_words_are_cached_under_the_original_word():
+    client = StubClient(WordTranslationCache(default_language_code="de"))
+    await client.fetch_literal_translations("Ich gehe zum Bahnhof.")
+    result = await client.fetch_literal_translations("zum Bahnhof")
+
+    assert client.requested == ["Ich gehe zum Bahnhof."]
+    assert [t.word for t in result] == ["zu", "dem", "Bahnhof"]
+
+
+@pytest.mark.asyncio
+async def test_only_unknown_words_are_requested():
+    client = StubClient(WordTranslationCache(default_language_code="de"))
+    await client.fetch_literal_translations("Ich gehe zum Bahnhof.")
+    result = await client.fetch_literal_translations("Ich bin hier.")
+
+    assert client.requested == ["Ich gehe zum Bahnhof.", "bin hier"]
+    assert [t.word for t in result] == ["Ich", "bin", "hier"]
+    assert client.word_cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_fully_cached_sentence_skips_backend():
+    client = StubClient(WordTranslationCache(default_language_code="de"))
+    await client.fetch_literal_translations("Ich gehe hier")
+    result = await client.fetch_literal_translations("hier gehe Ich")
+
+    assert len(client.requested) == 1
+    assert [t.translation for t in result] == ["here", "go", "I"]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_separated_by_language():
+    client = StubClient(WordTranslationCache())
+    await client.fetch_literal_translations("Hund ist hier", language_code="de")
+    await client.fetch_literal_translations("Hund ist hier", language_code="nl")
+    # without a language, the cache is bypassed
+    await client.fetch_literal_translations("Hund ist hier")
+
+    assert len(client.requested) == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_is_separated_by_lemma():
+    client = StubClient(WordTranslationCache(default_language_code="de", by_lemma=True))
+    await client.fetch_literal_translations("sein Hund", lemmas={"sein": "sein"})
+    await client.fetch_literal_translations("hier sein", lemmas={"sein": "sein"})
+    await client.fetch_literal_translations("sein Hund", lemmas={"sein": "seine"})
+
+    assert client.requested == ["sein Hund", "hier", "sein"]